@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class EscritorAgrupado:
+    def __init__(self, pool, intervalo=0.005, maximo=256):
+        """Escritor único que agrupa as escritas de vários chamadores em uma só transação."""
+        self.pool = pool
+        self.intervalo = intervalo
+        self.maximo = maximo
+        self.__fila = queue.Queue()
+        self.__thread = None
+        self.__trava = threading.Lock()
+        self.__lotes = 0
+        self.__escritas = 0
+        self.__maior_lote = 0
+        self.__commit_total = 0.0
+        self.__commit_maximo = 0.0
+        self.__maior_fila = 0
+
+    def iniciar(self):
+        """Inicia a thread do escritor e passa a receber as escritas do pool."""
+        if self.__thread is not None:
+            return
+        self.__thread = threading.Thread(target=self.__executar, name="EscritorAgrupado", daemon=True)
+        self.__thread.start()
+        self.pool.escritor = self
+
+    def parar(self):
+        """Grava as escritas pendentes e encerra a thread do escritor."""
+        if self.__thread is None:
+            return
+        self.pool.escritor = None
+        self.__fila.put(None)
+        self.__thread.join()
+        self.__thread = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, tipo, valor, rastreio):
+        self.parar()
+
+    def enviar(self, funcao):
+        """Enfileira funcao(conexao) e retorna um Future resolvido após o commit do lote."""
+        futuro = Future()
+        self.__fila.put((funcao, futuro))
+        with self.__trava:
+            self.__maior_fila = max(self.__maior_fila, self.__fila.qsize())
+        return futuro
+
+    def estatisticas(self):
+        """Retorna as métricas de tamanho de lote, latência de commit e profundidade da fila."""
+        with self.__trava:
+            return {
+                "lotes": self.__lotes,
+                "escritas": self.__escritas,
+                "lote_medio": self.__escritas / self.__lotes if self.__lotes else 0.0,
+                "maior_lote": self.__maior_lote,
+                "commit_medio": self.__commit_total / self.__lotes if self.__lotes else 0.0,
+                "commit_maximo": self.__commit_maximo,
+                "fila_atual": self.__fila.qsize(),
+                "maior_fila": self.__maior_fila,
+            }
+
+    def __coletar(self):
+        """Espera a primeira escrita e junta as que chegarem até o intervalo ou o máximo."""
+        primeiro = self.__fila.get()
+        if primeiro is None:
+            return None, True
+        lote = [primeiro]
+        prazo = time.perf_counter() + self.intervalo
+        while len(lote) < self.maximo:
+            restante = prazo - time.perf_counter()
+            try:
+                item = self.__fila.get(timeout=restante) if restante > 0 else self.__fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return lote, True
+            lote.append(item)
+        return lote, False
+
+    def __gravar(self, conexao, lote):
+        """Executa o lote em uma transação, isolando cada escrita em um SAVEPOINT."""
+        resultados = []
+
+        def executar(conexao):
+            resultados.clear()
+            for funcao, _ in lote:
+                conexao.execute("SAVEPOINT ESCRITA")
+                try:
+                    resultados.append((True, funcao(conexao)))
+                except Exception as erro:
+                    conexao.execute("ROLLBACK TO ESCRITA")
+                    resultados.append((False, erro))
+                conexao.execute("RELEASE ESCRITA")
+
+        def tentar():
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                executar(conexao)
+                inicio = time.perf_counter()
+                conexao.commit()
+                return time.perf_counter() - inicio
+            except BaseException:
+                conexao.rollback()
+                raise
+
+        try:
+            duracao = self.pool.repetir_se_ocupado(tentar)
+        except Exception as erro:
+            for _, futuro in lote:
+                futuro.set_exception(erro)
+            return
+        with self.__trava:
+            self.__lotes += 1
+            self.__escritas += len(lote)
+            self.__maior_lote = max(self.__maior_lote, len(lote))
+            self.__commit_total += duracao
+            self.__commit_maximo = max(self.__commit_maximo, duracao)
+        for (_, futuro), (sucesso, valor) in zip(lote, resultados):
+            if sucesso:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+
+    def __executar(self):
+        conexao = self.pool.adquirir()
+        try:
+            encerrar = False
+            while not encerrar:
+                lote, encerrar = self.__coletar()
+                if lote:
+                    self.__gravar(conexao, lote)
+        finally:
+            self.pool.liberar(conexao)
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3 as sql
+import tempfile
+import time
+import conexoes
+import gerador
+import resumos
+from carga import percentil
+from classes import Aeronaves, Aeroportos, Empresas, Voos
+
+
+def _resumir(latencias, unidades=None):
+    """Resume latências em segundos como operações, vazão e percentis em milissegundos."""
+    total = sum(latencias)
+    unidades = unidades or len(latencias)
+    latencias = sorted(latencias)
+    return {
+        "operacoes": unidades,
+        "segundos": total,
+        "por_segundo": unidades / total if total else 0.0,
+        "p50_ms": percentil(latencias, 0.50) * 1000,
+        "p99_ms": percentil(latencias, 0.99) * 1000,
+    }
+
+
+def _medir(repeticoes, operacao):
+    latencias = []
+    for indice in range(repeticoes):
+        inicio = time.perf_counter()
+        operacao(indice)
+        latencias.append(time.perf_counter() - inicio)
+    return _resumir(latencias)
+
+
+def _volumes(conexao):
+    return {
+        classe.TABELA: conexao.execute(f'SELECT COUNT(*) FROM "{classe.TABELA}"').fetchone()[0]
+        for classe in (Aeronaves, Aeroportos, Empresas, Voos)
+    }
+
+
+def executar(caminho, repeticoes=1000, semente=1, perfil="padrao"):
+    """Mede os caminhos de CRUD e de relatório em uma cópia do banco e retorna os resultados."""
+    sorteio = random.Random(semente)
+    pasta = tempfile.mkdtemp()
+    copia = os.path.join(pasta, "benchmark.db")
+    with sql.connect(caminho) as origem, sql.connect(copia) as destino:
+        # As escritas do teste não alteram o banco informado.
+        origem.backup(destino)
+    pool = conexoes.PoolConexoes(copia, perfil=perfil)
+    try:
+        with Voos(pool) as voos, Aeronaves(pool) as aeronaves:
+            conexao = voos.conexao
+            volumes = _volumes(conexao)
+            aeroportos = [codigo for codigo, in conexao.execute("SELECT COD_AEROPORTO FROM Aeroportos")]
+            empresa = conexao.execute(f'SELECT MIN(COD_EMPRESA) FROM "{Empresas.TABELA}"').fetchone()[0]
+            codigos = [codigo for codigo, in conexao.execute("SELECT COD_VOO FROM Voos")]
+            datas = conexao.execute("SELECT MIN(DATA_SAIDA), MAX(DATA_SAIDA) FROM Voos").fetchone()
+            sorteio.shuffle(codigos)
+            resultados = {}
+
+            aeronave = aeronaves.criar("Benchmark", 180, 23)
+            novos = gerador.voos_encadeados(sorteio, aeronave, empresa, aeroportos, "2100-01-01")
+            resultados["insercao_unitaria"] = _medir(repeticoes, lambda _: voos.criar(*next(novos)))
+
+            aeronave = aeronaves.criar("Benchmark em lote", 180, 23)
+            novos = gerador.voos_encadeados(sorteio, aeronave, empresa, aeroportos, "2100-01-01")
+            lotes = [[next(novos) for _ in range(1000)] for _ in range(max(1, repeticoes // 100))]
+            latencias = []
+            for lote in lotes:
+                inicio = time.perf_counter()
+                gerador.inserir(pool, conexao, Voos, lote)
+                latencias.append(time.perf_counter() - inicio)
+            resultados["insercao_lote"] = _resumir(latencias, sum(map(len, lotes)))
+
+            linhas = [voos.obter(codigo) for codigo in codigos[:repeticoes]]
+            resultados["validacao_fk"] = _medir(len(linhas), lambda indice: voos.preparar(
+                dict(zip(Voos.CAMPOS, linhas[indice][1:]))
+            ))
+            resultados["atualizacao"] = _medir(len(linhas), lambda indice: voos.alterar(
+                codigos[indice], NUMERO_PASSAGEIROS=sorteio.randint(0, linhas[indice][6])
+            ))
+            removidos = codigos[repeticoes:2 * repeticoes]
+            resultados["remocao"] = _medir(len(removidos), lambda indice: voos.remover(removidos[indice]))
+
+            resultados["listagem_primeira_pagina"] = _medir(repeticoes, lambda _: voos.listar())
+            resultados["listagem_por_chave"] = _medir(
+                repeticoes, lambda indice: voos.listar(apos=codigos[indice % len(codigos)])
+            )
+            resultados["listagem_por_prefixo"] = _medir(
+                repeticoes, lambda indice: voos.listar(prefixo=datas[0][:7])
+            )
+            consultas = max(1, repeticoes // 10)
+            resultados["relatorio_aeroporto"] = _medir(consultas, lambda _: voos.relatorio(
+                sorteio.choice(aeroportos), datas[0], datas[1], "mes"
+            ))
+            resultados["resumo_aeroporto"] = _medir(consultas, lambda _: resumos.consultar(
+                ("DATA",), datas[0], datas[1], str(sorteio.choice(aeroportos)), pool=pool
+            ))
+    finally:
+        pool.fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+    return {
+        "banco": os.path.abspath(caminho),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sql.sqlite_version,
+        "perfil": perfil,
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "volumes": volumes,
+        "resultados": resultados,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mede inserção, alteração, remoção, listagem e relatórios.")
+    parser.add_argument("banco", help="banco usado como base; o teste roda em uma cópia")
+    parser.add_argument("--repeticoes", type=int, default=1000)
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--perfil", choices=conexoes.PERFIS, default="padrao")
+    parser.add_argument("--saida", help="arquivo JSON de resultados; sem ele, imprime na tela")
+    argumentos = parser.parse_args()
+    resultado = json.dumps(
+        executar(argumentos.banco, argumentos.repeticoes, argumentos.semente, argumentos.perfil), indent=4
+    )
+    if argumentos.saida:
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(resultado + "\n")
+    else:
+        print(resultado)
@@ -0,0 +1,62 @@
+import re
+
+PREFIXO_TABELA = "Busca_"
+LIMITE = 10
+
+
+def tabela_indice(tabela):
+    """Retorna o nome da tabela FTS5 que indexa a tabela informada."""
+    return PREFIXO_TABELA + tabela.replace(" ", "_")
+
+
+def expressao(texto):
+    """Converte o texto digitado em uma consulta FTS5 em que cada palavra é um prefixo."""
+    # Cada palavra vira uma string entre aspas, para que operadores do FTS5 sejam tratados como texto.
+    palavras = re.findall(r"\w+", texto)
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+def consulta(tabela, chave, colunas, texto, limite=LIMITE, selecao=None):
+    """Monta o SELECT que busca o texto no índice e ordena as linhas da tabela por relevância."""
+    indice = tabela_indice(tabela)
+    pesos = ", ".join(str(peso) for _, peso in colunas)
+    selecao = "t.*" if selecao is None else ", ".join(f"t.{coluna}" for coluna in selecao)
+    return (
+        f'SELECT {selecao} FROM "{indice}" JOIN "{tabela}" AS t ON t.{chave} = "{indice}".rowid '
+        f'WHERE "{indice}" MATCH ? ORDER BY bm25("{indice}", {pesos}), t.{chave} LIMIT ?',
+        (expressao(texto), limite)
+    )
+
+
+def criar(cursor, tabela, chave, colunas):
+    """Cria o índice FTS5 da tabela, se ela existir, com os gatilhos que o mantêm em dia, e o preenche."""
+    existe = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()
+    if existe is None:
+        return False
+    indice = tabela_indice(tabela)
+    nomes = [coluna for coluna, _ in colunas]
+    lista = ", ".join(nomes)
+    novos = ", ".join(f"new.{coluna}" for coluna in nomes)
+    antigos = ", ".join(f"old.{coluna}" for coluna in nomes)
+    base = f"TRG_{indice.upper()}"
+    for evento in ("INSERIR", "DELETAR", "ATUALIZAR"):
+        cursor.execute(f'DROP TRIGGER IF EXISTS "{base}_{evento}"')
+    cursor.execute(f'DROP TABLE IF EXISTS "{indice}"')
+    # O índice usa a própria tabela como conteúdo e só guarda os termos; remove_diacritics
+    # faz "sao" achar "São", e os prefixos de 2 e 3 letras aceleram a busca enquanto se digita.
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE "{indice}" USING fts5({lista}, content=\'{tabela}\', '
+        f"content_rowid='{chave}', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    cursor.execute(f'INSERT INTO "{indice}"("{indice}") VALUES(\'rebuild\')')
+    inserir = f'INSERT INTO "{indice}"(rowid, {lista}) VALUES(new.{chave}, {novos});'
+    deletar = f'INSERT INTO "{indice}"("{indice}", rowid, {lista}) VALUES(\'delete\', old.{chave}, {antigos});'
+    cursor.execute(f'CREATE TRIGGER "{base}_INSERIR" AFTER INSERT ON "{tabela}" BEGIN {inserir} END')
+    cursor.execute(f'CREATE TRIGGER "{base}_DELETAR" AFTER DELETE ON "{tabela}" BEGIN {deletar} END')
+    cursor.execute(
+        f'CREATE TRIGGER "{base}_ATUALIZAR" AFTER UPDATE OF {chave}, {lista} ON "{tabela}" '
+        f"BEGIN {deletar} {inserir} END"
+    )
+    return True
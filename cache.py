@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+from classes import Aeronaves, Aeroportos, Empresas
+
+TABELAS_CACHE = (Aeronaves.TABELA, Aeroportos.TABELA, Empresas.TABELA)
+CHAVES_CACHE = {classe.TABELA: classe.CHAVE for classe in (Aeronaves, Aeroportos, Empresas)}
+AUSENTE = object()
+
+
+class CacheConsultas:
+    def __init__(self, tabelas=TABELAS_CACHE, capacidade=4096, validade=300.0, distribuido=False,
+                 relogio=time.monotonic):
+        """Cache de leitura de linhas e listagens das tabelas que mudam pouco, com LRU e validade."""
+        self.tabelas = set(tabelas)
+        self.capacidade = capacidade
+        self.validade = validade
+        self.distribuido = distribuido
+        self.relogio = relogio
+        self.__entradas = OrderedDict()
+        self.__por_tabela = {tabela: set() for tabela in self.tabelas}
+        self.__trava = threading.Lock()
+        self.__versoes = {}
+        self.__versoes_dados = {}
+        self.__geracoes = dict.fromkeys(self.tabelas, 0)
+        self.__contadores = dict.fromkeys(("acertos", "falhas", "despejos", "expiradas", "invalidacoes"), 0)
+
+    def guarda(self, tabela):
+        """Indica se as leituras da tabela passam pelo cache."""
+        return tabela in self.tabelas
+
+    def obter(self, conexao, chave, carregar):
+        """Retorna o valor guardado para chave ou o carrega com carregar() e o guarda."""
+        if self.distribuido:
+            self.sincronizar(conexao, chave[0])
+        agora = self.relogio()
+        with self.__trava:
+            valor, expira = self.__entradas.get(chave, (AUSENTE, None))
+            if valor is not AUSENTE:
+                if expira is None or expira > agora:
+                    self.__entradas.move_to_end(chave)
+                    self.__contadores["acertos"] += 1
+                    return valor
+                self.__remover(chave)
+                self.__contadores["expiradas"] += 1
+            self.__contadores["falhas"] += 1
+            geracao = self.__geracoes[chave[0]]
+        valor = carregar()
+        with self.__trava:
+            # Uma invalidação durante a carga pode ter tornado o valor lido obsoleto.
+            if self.__geracoes[chave[0]] != geracao:
+                return valor
+            self.__entradas[chave] = (valor, None if self.validade is None else agora + self.validade)
+            self.__entradas.move_to_end(chave)
+            self.__por_tabela[chave[0]].add(chave)
+            while len(self.__entradas) > self.capacidade:
+                self.__remover(next(iter(self.__entradas)))
+                self.__contadores["despejos"] += 1
+        return valor
+
+    def __remover(self, chave):
+        del self.__entradas[chave]
+        self.__por_tabela[chave[0]].discard(chave)
+
+    def invalidar(self, tabela, codigos=None):
+        """Descarta as linhas informadas (ou todas) e as listagens guardadas da tabela."""
+        if tabela not in self.tabelas:
+            return
+        with self.__trava:
+            if codigos is None:
+                chaves = list(self.__por_tabela[tabela])
+            else:
+                # Uma escrita pode mudar qualquer listagem, mas só as linhas dos códigos afetados;
+                # nas chaves de linha e de existência o código é o último elemento.
+                codigos = set(codigos)
+                chaves = [
+                    chave for chave in self.__por_tabela[tabela]
+                    if chave[1] == "consulta" or chave[-1] in codigos
+                ]
+            for chave in chaves:
+                self.__remover(chave)
+            self.__geracoes[tabela] += 1
+            self.__contadores["invalidacoes"] += len(chaves)
+
+    def limpar(self):
+        """Descarta todas as entradas do cache."""
+        for tabela in self.tabelas:
+            self.invalidar(tabela)
+
+    def sincronizar(self, conexao, tabela):
+        """Invalida as linhas da tabela alteradas por outros processos, segundo VersoesTabelas e VersoesLinhas."""
+        # data_version só muda quando outra conexão confirma uma escrita no banco.
+        versao_dados = conexao.execute("PRAGMA data_version").fetchone()[0]
+        if self.__versoes_dados.get((id(conexao), tabela)) == versao_dados:
+            return
+        self.__versoes_dados[(id(conexao), tabela)] = versao_dados
+        linha = conexao.execute("SELECT VERSAO FROM VersoesTabelas WHERE TABELA = ?", (tabela,)).fetchone()
+        if linha is None:
+            return
+        versao, anterior = linha[0], self.__versoes.get(tabela)
+        if versao == anterior:
+            return
+        if anterior is not None and versao > anterior:
+            self.invalidar(tabela, [codigo for codigo, in conexao.execute(
+                "SELECT CODIGO FROM VersoesLinhas WHERE TABELA = ? AND VERSAO > ?", (tabela, anterior)
+            )])
+        elif anterior is not None:
+            # A versão voltou atrás: as tabelas de versões foram recriadas e não dá para saber o que mudou.
+            self.invalidar(tabela)
+        self.__versoes[tabela] = versao
+
+    def estatisticas(self):
+        """Retorna os contadores de acertos, falhas, despejos, expirações e invalidações."""
+        with self.__trava:
+            return {**self.__contadores, "entradas": len(self.__entradas)}
+
+
+def criar_gatilhos(cursor, tabelas=TABELAS_CACHE):
+    """Cria as tabelas de versões e os gatilhos que as atualizam a cada escrita nas tabelas existentes.
+
+    VersoesTabelas guarda a versão de cada tabela, e VersoesLinhas a versão em que cada código
+    mudou pela última vez, para que os outros processos invalidem só as linhas alteradas.
+    """
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS VersoesTabelas(TABELA TEXT PRIMARY KEY, VERSAO INTEGER NOT NULL)"
+    )
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS VersoesLinhas(TABELA TEXT, CODIGO INTEGER, VERSAO INTEGER NOT NULL, "
+        "PRIMARY KEY(TABELA, CODIGO)) WITHOUT ROWID"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_VERSOES_LINHAS ON VersoesLinhas(TABELA, VERSAO)")
+    existentes = {nome for nome, in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for tabela in tabelas:
+        if tabela not in existentes:
+            continue
+        cursor.execute("INSERT OR IGNORE INTO VersoesTabelas(TABELA, VERSAO) VALUES(?, 0)", (tabela,))
+        chave = CHAVES_CACHE[tabela]
+        for evento, linhas in (("INSERT", ("NEW",)), ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+            nome = f"TRG_VERSAO_{tabela.upper().replace(' ', '_')}_{evento}"
+            registros = "".join(
+                "INSERT OR REPLACE INTO VersoesLinhas(TABELA, CODIGO, VERSAO) "
+                f"SELECT TABELA, {linha}.{chave}, VERSAO FROM VersoesTabelas WHERE TABELA = '{tabela}'; "
+                for linha in linhas
+            )
+            cursor.execute(f'DROP TRIGGER IF EXISTS "{nome}"')
+            cursor.execute(
+                f'CREATE TRIGGER "{nome}" AFTER {evento} ON "{tabela}" BEGIN '
+                f"UPDATE VersoesTabelas SET VERSAO = VERSAO + 1 WHERE TABELA = '{tabela}'; {registros}END"
+            )
+
+
+def ativar(pool, **opcoes):
+    """Liga o cache de leitura no pool; as classes de tabela passam a usá-lo."""
+    pool.cache = CacheConsultas(**opcoes)
+    return pool.cache
+
+
+def desativar(pool):
+    """Desliga o cache de leitura do pool."""
+    pool.cache = None
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import json
+import time
+
+
+def percentil(valores, fracao):
+    """Retorna o percentil de uma lista já ordenada."""
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(fracao * len(valores)))]
+
+
+async def _ler_resposta(leitor):
+    cabecalho = await leitor.readuntil(b"\r\n\r\n")
+    linhas = cabecalho.decode("latin-1").split("\r\n")
+    status = int(linhas[0].split(" ")[1])
+    tamanho = 0
+    for linha in linhas[1:]:
+        if linha.lower().startswith("content-length:"):
+            tamanho = int(linha.split(":", 1)[1])
+    await leitor.readexactly(tamanho)
+    return status
+
+
+async def _cliente(endereco, porta, requisicoes, profundidade, latencias, erros):
+    """Envia requisições por uma conexão keep-alive, com até profundidade delas em pipeline."""
+    leitor, escritor = await asyncio.open_connection(endereco, porta)
+    enviadas = asyncio.Queue()
+    pendentes = asyncio.Semaphore(profundidade)
+
+    async def receber():
+        for _ in range(len(requisicoes)):
+            inicio = await enviadas.get()
+            status = await _ler_resposta(leitor)
+            latencias.append(time.perf_counter() - inicio)
+            if status >= 400:
+                erros.append(status)
+            pendentes.release()
+
+    recepcao = asyncio.create_task(receber())
+    for requisicao in requisicoes:
+        await pendentes.acquire()
+        await enviadas.put(time.perf_counter())
+        escritor.write(requisicao)
+        await escritor.drain()
+    await recepcao
+    escritor.close()
+
+
+def _requisicao(metodo, caminho, corpo=None):
+    dados = b"" if corpo is None else json.dumps(corpo).encode("utf-8")
+    return (
+        f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(dados)}\r\n\r\n"
+    ).encode("latin-1") + dados
+
+
+CENARIOS = {
+    "listar": lambda indice: _requisicao("GET", "/aeronaves?tamanho=20"),
+    "obter": lambda indice: _requisicao("GET", f"/aeronaves/{indice % 100 + 1}"),
+    "criar": lambda indice: _requisicao(
+        "POST", "/aeronaves",
+        {"MODELO_AERONAVE": f"Carga {indice}", "ASSENTOS_DISPONIVEIS": 180, "LIMITE_BAGAGEM": 23}
+    ),
+    "relatorio": lambda indice: _requisicao("GET", f"/relatorios/aeroportos?aeroporto={indice % 10 + 1}"),
+}
+
+
+async def executar(endereco, porta, cenario, conexoes, total, profundidade):
+    """Executa o teste de carga e retorna as estatísticas de latência e vazão."""
+    latencias, erros = [], []
+    por_conexao = total // conexoes
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _cliente(
+            endereco, porta,
+            [CENARIOS[cenario](cliente * por_conexao + indice) for indice in range(por_conexao)],
+            profundidade, latencias, erros
+        )
+        for cliente in range(conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "cenario": cenario,
+        "requisicoes": len(latencias),
+        "erros": len(erros),
+        "segundos": duracao,
+        "requisicoes_por_segundo": len(latencias) / duracao if duracao else 0.0,
+        "p50_ms": percentil(latencias, 0.50) * 1000,
+        "p99_ms": percentil(latencias, 0.99) * 1000,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Teste de carga local do servidor HTTP.")
+    parser.add_argument("--endereco", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--cenario", choices=CENARIOS, default="obter")
+    parser.add_argument("--conexoes", type=int, default=16)
+    parser.add_argument("--requisicoes", type=int, default=10000)
+    parser.add_argument("--pipeline", type=int, default=1, help="requisições pendentes por conexão")
+    argumentos = parser.parse_args()
+    resultado = asyncio.run(executar(
+        argumentos.endereco, argumentos.porta, argumentos.cenario,
+        argumentos.conexoes, argumentos.requisicoes, argumentos.pipeline
+    ))
+    print(json.dumps(resultado, indent=4))
@@ -1,12 +1,43 @@
 from abc import ABC, abstractmethod
 import sqlite3 as sql
+import busca
+import comandos
+import conexoes
+import conflitos
+import esquema
 import funcoes
+import horarios
+import registros
+import resumos
+
+# Menor valor de uma chave INTEGER do SQLite, ponto de partida das leituras em ordem de chave.
+MENOR_CHAVE = -2 ** 63
+CAMPO_REFERENCIA = (
+    int, lambda valor: valor > 0,
+    "ID deve ser um número inteiro positivo...", "ID deve ser um número inteiro positivo..."
+)
 
 
 class BancoDados(ABC):
-    def __init__(self):
-        """Realiza a conexão com o banco de dados."""
-        self.conexao = sql.connect("bancodados.db")
+    TAMANHO_PAGINA = 20
+    # Acima deste número de linhas, as ações em lote do menu usam uma transação por parte.
+    TAMANHO_PARTE = 5000
+    REFERENCIAS = {}
+    # Nomes que a tabela já teve em bancos antigos; as migrações os renomeiam ou incorporam à tabela.
+    NOMES_ANTIGOS = ()
+    # Ação ao deletar a linha referenciada por uma coluna de REFERENCIAS: RESTRICT, CASCADE ou SET NULL.
+    POLITICAS = {}
+    # Colunas do índice de busca textual e seus pesos na ordenação por relevância.
+    BUSCA = ()
+    # Colunas pelas quais a importação ordena um lote antes de passar cada linha por verificar.
+    ORDEM_VERIFICACAO = ()
+    # Funções ouvinte(tabela, operacao, codigos) chamadas após cada escrita bem-sucedida.
+    OUVINTES = []
+
+    def __init__(self, pool=None):
+        """Obtém a conexão com o banco de dados a partir do pool compartilhado."""
+        self.pool = pool or conexoes.pool
+        self.conexao = self.pool.adquirir()
         self.cursor = self.conexao.cursor()
 
     @abstractmethod
@@ -24,10 +55,475 @@ class BancoDados(ABC):
         """Deleta uma linha no banco de dados."""
         pass
 
+    @classmethod
+    def validar(cls, coluna, valor):
+        """Converte e valida o valor de uma coluna segundo as regras da tabela."""
+        tipo, condicao, mensagem, mensagem_tipo = cls.CAMPOS[coluna]
+        if tipo is str:
+            if valor is None or valor == "":
+                raise cls.ValorNuloErro(mensagem)
+            return str(valor)
+        try:
+            valor = tipo(valor)
+        except (TypeError, ValueError):
+            raise ValueError(mensagem_tipo)
+        if not condicao(valor):
+            raise cls.ValorInvalidoErro(mensagem)
+        return valor
+
+    def preparar(self, valores):
+        """Valida um conjunto de colunas e as chaves estrangeiras entre elas."""
+        linha = {}
+        for coluna, valor in valores.items():
+            if coluna not in self.CAMPOS:
+                raise self.ValorInvalidoErro(f"A coluna {coluna} não existe na tabela {self.TABELA}.")
+            linha[coluna] = self.validar(coluna, valor)
+        for coluna, (classe, erro) in self.REFERENCIAS.items():
+            if coluna in linha and not self.existe(classe.TABELA, classe.CHAVE, linha[coluna]):
+                raise self.ValorInvalidoErro(erro)
+        return linha
+
+    def criar(self, *valores, **nomeados):
+        """Valida e insere uma linha, recebendo os valores na ordem de CAMPOS ou por nome."""
+        if len(valores) > len(self.CAMPOS):
+            raise self.ValorInvalidoErro(f"A tabela {self.TABELA} tem apenas {len(self.CAMPOS)} colunas.")
+        valores = {**dict(zip(self.CAMPOS, valores)), **nomeados}
+        linha = self.preparar({coluna: valores.get(coluna) for coluna in self.CAMPOS} | valores)
+
+        def inserir(conexao):
+            self.verificar(conexao, linha)
+            return conexao.execute(comandos.inserir(self, linha), tuple(linha.values()))
+        codigo = self.transacao(inserir).lastrowid
+        self.notificar("criar", [codigo])
+        return codigo
+
+    def verificar(self, conexao, linha, codigo=None):
+        """Verifica regras entre linhas antes de gravar; executada dentro da transação de escrita."""
+        pass
+
+    def obter(self, codigo):
+        """Retorna a linha com o código informado ou None."""
+        return self.__ler(self.TABELA, ("linha", codigo), lambda: self.conexao.execute(
+            comandos.obter(self, self.colunas()), (codigo,)
+        ).fetchone())
+
+    def colunas(self):
+        """Retorna CHAVE e CAMPOS, as colunas lidas pelas consultas, conferidas contra os metadados do esquema."""
+        return esquema.colunas(self.pool, self.conexao, self)
+
+    def __ler(self, tabela, chave, carregar):
+        """Lê pelo cache do pool, se ele estiver ativo e guardar a tabela."""
+        cache = self.pool.cache
+        if cache is None or not cache.guarda(tabela):
+            return carregar()
+        return cache.obter(self.conexao, (tabela, *chave), carregar)
+
+    def listar_registros(self, apos=None, tamanho=None, prefixo=""):
+        """Retorna uma página de linhas como registros tipados da tabela."""
+        return [self.REGISTRO(*linha) for linha in self.pagina(
+            None if apos is None else (">", apos), prefixo=prefixo, tamanho=tamanho
+        )]
+
+    def cursor_registros(self):
+        """Retorna um cursor que entrega as linhas como registros tipados da tabela."""
+        cursor = self.conexao.cursor()
+        cursor.row_factory = registros.fabrica(self.REGISTRO)
+        return cursor
+
+    def buscar(self, texto, limite=None):
+        """Retorna as linhas mais relevantes para o texto, por prefixo e sem diferenciar acentos."""
+        if not self.BUSCA or not busca.expressao(texto):
+            return []
+        comando, parametros = busca.consulta(
+            self.TABELA, self.CHAVE, self.BUSCA, texto, limite or self.TAMANHO_PAGINA, self.colunas()
+        )
+        return self.__ler(self.TABELA, ("consulta", comando, parametros), lambda: self.conexao.execute(
+            comando, parametros
+        ).fetchall())
+
+    def listar(self, apos=None, tamanho=None, prefixo=""):
+        """Retorna uma página de linhas com código maior que apos."""
+        limite = None if apos is None else (">", apos)
+        return list(self.pagina(limite, prefixo=prefixo, tamanho=tamanho))
+
+    def alterar(self, codigo, **valores):
+        """Valida e altera uma ou mais colunas de uma linha em um único comando."""
+        if not valores:
+            raise self.ValorNuloErro("Nenhuma coluna foi informada.")
+        linha = self.preparar(valores)
+        # Na ordem de CAMPOS, o mesmo conjunto de colunas gera sempre o mesmo comando.
+        colunas = [coluna for coluna in self.CAMPOS if coluna in linha]
+
+        def atualizar(conexao):
+            self.verificar(conexao, linha, codigo)
+            return conexao.execute(
+                comandos.atualizar(self, colunas), (*(linha[coluna] for coluna in colunas), codigo)
+            )
+        alteradas = self.transacao(atualizar).rowcount
+        if alteradas:
+            self.notificar("alterar", [codigo])
+        return alteradas
+
+    def remover(self, codigo):
+        """Deleta a linha com o código informado."""
+        return self.remover_varios([codigo])
+
+    def remover_varios(self, codigos):
+        """Deleta várias linhas em uma única transação e retorna quantas foram deletadas."""
+        codigos = list(codigos)
+
+        def deletar(conexao):
+            removidas, afetadas = 0, []
+            for parte in comandos.partes(codigos):
+                afetadas.extend(self.__dependentes_afetados(conexao, parte))
+                removidas += conexao.execute(*comandos.deletar(self, parte)).rowcount
+            return removidas, afetadas
+        removidas, afetadas = self.__transacao_integra(deletar)
+        if removidas:
+            self.notificar("remover", codigos)
+        for classe, operacao, dependentes in afetadas:
+            self.notificar(operacao, dependentes, classe.TABELA)
+        return removidas
+
+    @classmethod
+    def dependentes(cls):
+        """Retorna (classe, coluna, ação) de cada relação de REFERENCIAS que aponta para esta tabela."""
+        return [
+            (classe, coluna, classe.POLITICAS.get(coluna, "RESTRICT"))
+            for classe in BancoDados.__subclasses__()
+            for coluna, (referenciada, _) in classe.REFERENCIAS.items()
+            if referenciada.TABELA == cls.TABELA
+        ]
+
+    def impacto(self, codigos):
+        """Conta, por buscas indexadas, as linhas de cada relação que dependem dos códigos."""
+        codigos = list(codigos)
+        return [
+            (classe, coluna, acao, sum(
+                self.conexao.execute(*comandos.contar_lista(classe, coluna, parte)).fetchone()[0]
+                for parte in comandos.partes(codigos)
+            ))
+            for classe, coluna, acao in self.dependentes()
+        ]
+
+    def mostrar_impacto(self, codigos):
+        """Exibe as linhas dependentes que a remoção dos códigos afetaria."""
+        efeitos = {
+            "RESTRICT": "a remoção será bloqueada", "CASCADE": "serão deletadas junto",
+            "SET NULL": f"ficarão sem {self.TABELA.lower()}"
+        }
+        for classe, coluna, acao, total in self.impacto(codigos):
+            if total:
+                print(f"{total} linha(s) de {classe.TABELA} dependem por {coluna} ({acao}): {efeitos[acao]}.")
+
+    def __dependentes_afetados(self, conexao, codigos):
+        """Aplica a política de cada relação antes de deletar os códigos e retorna as linhas afetadas."""
+        afetadas = []
+        for classe, coluna, acao in self.dependentes():
+            if acao == "RESTRICT":
+                total = conexao.execute(*comandos.contar_lista(classe, coluna, codigos)).fetchone()[0]
+                if total:
+                    raise self.ValorInvalidoErro(
+                        f"{total} linha(s) de {classe.TABELA} dependem por {coluna}; a remoção foi bloqueada."
+                    )
+            else:
+                # CASCADE e SET NULL são feitos pelo banco; aqui só se anota o que será afetado.
+                dependentes = [codigo for codigo, in conexao.execute(*comandos.chaves_lista(classe, coluna, codigos))]
+                if dependentes:
+                    afetadas.append((classe, "remover" if acao == "CASCADE" else "alterar", dependentes))
+        return afetadas
+
+    def __transacao_integra(self, funcao):
+        """Executa funcao em uma transação, trocando violações de chave estrangeira por ValorInvalidoErro."""
+        try:
+            return self.transacao(funcao)
+        except sql.IntegrityError as erro:
+            # Outras restrições (NOT NULL, UNIQUE) seguem como IntegrityError.
+            if "FOREIGN KEY" not in str(erro):
+                raise
+            raise self.ValorInvalidoErro(f"A operação violaria uma chave estrangeira: {erro}")
+
+    def filtrar(self, filtro):
+        """Valida os valores de um filtro {coluna: valor | (início, fim) | [valores]} e monta a sua condição."""
+        validado = {}
+        for coluna, condicao in filtro.items():
+            if coluna not in self.CAMPOS and coluna != self.CHAVE:
+                raise self.ValorInvalidoErro(f"A coluna {coluna} não existe na tabela {self.TABELA}.")
+            converter = (lambda valor: self.validar(coluna, valor)) if coluna in self.CAMPOS else int
+            if isinstance(condicao, tuple):
+                validado[coluna] = tuple(None if valor is None else converter(valor) for valor in condicao)
+            elif isinstance(condicao, (list, set, frozenset)):
+                validado[coluna] = [converter(valor) for valor in condicao]
+            else:
+                validado[coluna] = converter(condicao)
+        return comandos.filtro(self, validado)
+
+    def contar(self, filtro):
+        """Conta as linhas que atendem ao filtro, sem alterá-las."""
+        onde, parametros = self.filtrar(filtro)
+        return self.conexao.execute(comandos.contar(self, onde), parametros).fetchone()[0]
+
+    def alterar_filtradas(self, filtro, parte=None, **valores):
+        """Altera as colunas de todas as linhas que atendem ao filtro e retorna quantas foram alteradas.
+
+        Sem parte, tudo é feito em uma única transação; com parte, em transações de até parte
+        linhas, para que o bloqueio de escrita nunca fique retido por muito tempo.
+        """
+        if not valores:
+            raise self.ValorNuloErro("Nenhuma coluna foi informada.")
+        linha = self.preparar(valores)
+        colunas = [coluna for coluna in self.CAMPOS if coluna in linha]
+
+        def atualizar(conexao, onde, parametros, codigos):
+            conexao.execute(
+                comandos.atualizar_faixa(self, colunas, onde),
+                (*(linha[coluna] for coluna in colunas), *parametros, codigos[0], codigos[-1])
+            )
+            # As linhas já alteradas são conferidas entre si e contra as demais.
+            for codigo in codigos:
+                self.verificar(conexao, linha, codigo)
+        return self.__em_partes(filtro, parte, atualizar, "alterar")
+
+    def remover_filtradas(self, filtro, parte=None):
+        """Deleta todas as linhas que atendem ao filtro e retorna quantas foram deletadas."""
+        def deletar(conexao, onde, parametros, codigos):
+            afetadas = []
+            for trecho in comandos.partes(codigos):
+                afetadas.extend(self.__dependentes_afetados(conexao, trecho))
+            conexao.execute(comandos.deletar_faixa(self, onde), (*parametros, codigos[0], codigos[-1]))
+            return afetadas
+        return self.__em_partes(filtro, parte, deletar, "remover")
+
+    def __em_partes(self, filtro, parte, executar, operacao):
+        """Aplica executar às linhas filtradas, em ordem de chave, uma transação por parte."""
+        onde, parametros = self.filtrar(filtro)
+        selecao = comandos.chaves(self, onde)
+        total, ultimo = 0, MENOR_CHAVE
+
+        def lote(conexao):
+            # As chaves são lidas na mesma transação da escrita; a faixa entre a primeira e a
+            # última, com o mesmo filtro, cobre exatamente essas linhas.
+            codigos = [codigo for codigo, in conexao.execute(selecao, (*parametros, ultimo, parte or -1))]
+            if not codigos:
+                return codigos, []
+            return codigos, executar(conexao, onde, parametros, codigos) or []
+        while True:
+            codigos, afetadas = self.__transacao_integra(lote)
+            if not codigos:
+                return total
+            total += len(codigos)
+            self.notificar(operacao, codigos)
+            for classe, operacao_dependente, dependentes in afetadas:
+                self.notificar(operacao_dependente, dependentes, classe.TABELA)
+            if parte is None:
+                return total
+            ultimo = codigos[-1]
+
+    def notificar(self, operacao, codigos, tabela=None):
+        """Invalida o cache e avisa os ouvintes registrados em BancoDados.OUVINTES de uma escrita na tabela."""
+        tabela = tabela or self.TABELA
+        if self.pool.cache is not None:
+            self.pool.cache.invalidar(tabela, codigos)
+        for ouvinte in list(BancoDados.OUVINTES):
+            ouvinte(tabela, operacao, codigos)
+
+    def transacao(self, funcao):
+        """Executa funcao(conexao) em uma transação de escrita e retorna o seu resultado."""
+        return self.pool.transacao(self.conexao, funcao)
+
+    def existe(self, tabela, coluna, codigo):
+        """Verifica, por uma busca indexada, se um código existe na tabela."""
+        if tabela not in esquema.metadados(self.pool, self.conexao):
+            raise esquema.EsquemaErro(f"A tabela {tabela} não existe no banco {self.pool.caminho}.")
+        return bool(self.__ler(tabela, ("existe", coluna, codigo), lambda: self.conexao.execute(
+            f'SELECT EXISTS(SELECT 1 FROM "{tabela}" WHERE {coluna}=?)', (codigo,)
+        ).fetchone()[0]))
+
+    def pagina(self, limite=None, anterior=False, prefixo="", tamanho=None):
+        """Gera, a partir do cursor, as linhas de uma página ordenada pela chave primária."""
+        condicoes, parametros = [], []
+        if limite is not None:
+            condicoes.append(f"{self.CHAVE} {limite[0]} ?")
+            parametros.append(limite[1])
+        if prefixo:
+            condicoes.append(f"{self.COLUNA_FILTRO} LIKE ? ESCAPE '\\'")
+            parametros.append(
+                prefixo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            )
+        filtro = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        ordem = "DESC" if anterior else "ASC"
+        comando = (
+            f'SELECT {", ".join(self.colunas())} FROM "{self.TABELA}"{filtro} '
+            f"ORDER BY {self.CHAVE} {ordem} LIMIT ?"
+        )
+        parametros = (*parametros, tamanho or self.TAMANHO_PAGINA)
+        cache = self.pool.cache
+        if cache is not None and cache.guarda(self.TABELA):
+            linhas = cache.obter(
+                self.conexao, (self.TABELA, "consulta", comando, parametros),
+                lambda: self.conexao.execute(comando, parametros).fetchall()
+            )
+        else:
+            linhas = self.conexao.execute(comando, parametros)
+        if anterior:
+            yield from reversed(list(linhas))
+        else:
+            yield from linhas
+
+    def listar_paginado(self, nome):
+        """Lista a tabela página por página e escolhe um ID da página exibida ou de uma busca."""
+        limite, anterior, prefixo, atual, termo = None, False, "", None, None
+        while True:
+            ids = []
+            if termo is None:
+                linhas = self.pagina(limite, anterior, prefixo)
+            else:
+                linhas = self.buscar(termo)
+            for linha in linhas:
+                print(*linha, sep=" - ")
+                ids.append(linha[0])
+            if termo is None and ids:
+                atual = ids[0]
+            elif termo is None and atual is not None:
+                print("Não há mais registros nesta direção.")
+                limite, anterior = (">=", atual), False
+                continue
+            if not ids:
+                print("Nenhum registro encontrado.")
+            opcoes = "[>] Próxima página | [<] Página anterior | [/texto] Filtrar | [/] Limpar filtro"
+            if self.BUSCA:
+                opcoes += " | [?texto] Buscar"
+            print(opcoes)
+            escolha = input(f"Escolha um ID de {nome} ou pressione ENTER para cancelar: ")
+            if escolha == "":
+                raise self.CancelarErro
+            elif escolha in (">", "<"):
+                if termo is not None:
+                    limite, anterior, termo = (None if atual is None else (">=", atual)), False, None
+                elif ids:
+                    anterior = escolha == "<"
+                    limite = ("<", ids[0]) if anterior else (">", ids[-1])
+                continue
+            elif escolha.startswith("/"):
+                limite, anterior, prefixo, atual, termo = None, False, escolha[1:], None, None
+                continue
+            elif escolha.startswith("?") and self.BUSCA:
+                termo = escolha[1:] or None
+                continue
+            try:
+                escolha = int(escolha)
+            except ValueError:
+                raise self.ValorInvalidoErro("\nID deve ser um número inteiro positivo...")
+            if escolha not in ids:
+                print("\nID inexistente nesta página...")
+                funcoes.continuar()
+                if termo is None:
+                    limite, anterior = (None if atual is None else (">=", atual)), False
+                continue
+            return escolha
+
+    def atualizar_lote(self):
+        """Altera de uma só vez as linhas que atendem a um filtro."""
+        filtro = self.__filtro()
+        total = self.__contar_filtradas(filtro)
+        valores = self.__valores()
+        novos = ", ".join(f"{coluna}={valor}" for coluna, valor in valores.items())
+        self.confirmar(f"Você está prestes a alterar {total} linha(s) para {novos}, tem certeza desta ação?")
+        alteradas = self.alterar_filtradas(filtro, self.__parte(total), **valores)
+        print(f"\n{alteradas} linha(s) alterada(s).")
+        funcoes.continuar()
+
+    def deletar_lote(self):
+        """Deleta de uma só vez as linhas que atendem a um filtro."""
+        filtro = self.__filtro()
+        total = self.__contar_filtradas(filtro)
+        if self.dependentes():
+            onde, parametros = self.filtrar(filtro)
+            self.mostrar_impacto(
+                codigo for codigo, in self.conexao.execute(comandos.chaves(self, onde), (*parametros, MENOR_CHAVE, -1))
+            )
+        self.confirmar(f"Você está prestes a deletar {total} linha(s), tem certeza desta ação?")
+        removidas = self.remover_filtradas(filtro, self.__parte(total))
+        print(f"\n{removidas} linha(s) deletada(s).")
+        funcoes.continuar()
+
+    def confirmar(self, mensagem):
+        """Pede uma confirmação [ S / N ] e cancela a ação se a resposta for não."""
+        while True:
+            confirmacao = input(f"{mensagem} [ S / N ]")
+            if confirmacao.lower() == "s":
+                return
+            elif confirmacao.lower() == "n":
+                raise self.CancelarErro
+            print("\nEscolha inválida.\n")
+
+    def __contar_filtradas(self, filtro):
+        """Mostra quantas linhas atendem ao filtro e cancela se não houver nenhuma."""
+        total = self.contar(filtro)
+        print(f"\n{total} linha(s) atendem ao filtro.")
+        if not total:
+            funcoes.continuar()
+            raise self.CancelarErro
+        return total
+
+    def __parte(self, total):
+        """Divide em transações menores as ações sobre muitas linhas."""
+        return self.TAMANHO_PARTE if total > self.TAMANHO_PARTE else None
+
+    def __escolher_coluna(self, colunas, titulo):
+        """Escolhe uma coluna da lista ou retorna None com ENTER."""
+        while True:
+            print(f"{titulo}:", *(f"[{numero}] - {coluna}" for numero, coluna in enumerate(colunas, 1)), sep="\n")
+            escolha = input("Escolha uma coluna ou pressione ENTER para concluir: ")
+            if escolha == "":
+                return None
+            if escolha.isdigit() and 1 <= int(escolha) <= len(colunas):
+                return colunas[int(escolha) - 1]
+            print("\nEscolha inválida.\n")
+
+    def __filtro(self):
+        """Entrada das condições do filtro, uma coluna por vez."""
+        filtro = {}
+        while coluna := self.__escolher_coluna([self.CHAVE, *self.CAMPOS], "Colunas do filtro"):
+            valor = input(f"{coluna} (valor, ou início..fim para um intervalo): ")
+            if ".." in valor:
+                inicio, fim = valor.split("..", 1)
+                filtro[coluna] = (inicio or None, fim or None)
+            else:
+                filtro[coluna] = valor
+        if not filtro:
+            raise self.CancelarErro
+        return filtro
+
+    def __valores(self):
+        """Entrada dos novos valores, uma coluna por vez."""
+        valores = {}
+        while coluna := self.__escolher_coluna(list(self.CAMPOS), "Colunas a alterar"):
+            valores[coluna] = self.validar(coluna, input(f"Novo valor de {coluna}: "))
+        if not valores:
+            raise self.CancelarErro
+        return valores
+
+    def fechar(self):
+        """Devolve a conexão com o banco de dados ao pool."""
+        if getattr(self, "conexao", None) is None:
+            return
+        try:
+            self.cursor.close()
+        except sql.ProgrammingError:
+            pass
+        self.pool.liberar(self.conexao)
+        self.conexao = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreio):
+        self.fechar()
+
     def __del__(self):
         """Finaliza a conexão com o banco de dados."""
-        self.cursor.close()
-        self.conexao.close()
+        self.fechar()
 
     class ValorNuloErro(Exception):
         """Erro indicando uma entrada de valor nulo."""
@@ -43,29 +539,42 @@ class BancoDados(ABC):
 
 
 class Aeronaves(BancoDados):
-    def __init__(self):
-        super().__init__()
+    TABELA = "Aeronaves"
+    CHAVE = "COD_AERONAVE"
+    REGISTRO = registros.Aeronave
+    COLUNA_FILTRO = "MODELO_AERONAVE"
+    BUSCA = (("MODELO_AERONAVE", 1.0),)
+    CAMPOS = {
+        "MODELO_AERONAVE": (str, None, "O modelo da aeronave não foi preenchido.", None),
+        "ASSENTOS_DISPONIVEIS": (
+            int, lambda valor: valor > 0,
+            "O número de assentos disponíveis deve ser um número positivo.",
+            "O número de assentos disponíveis deve ser um número inteiro."
+        ),
+        "LIMITE_BAGAGEM": (
+            float, lambda valor: valor > 0,
+            "O limite de bagagem deve ser um número positivo.",
+            "O limite de bagagem deve ser um número real."
+        )
+    }
+
+    def __init__(self, pool=None):
+        super().__init__(pool)
 
     def registrar(self):
         """Registra uma aeronave no banco de dados."""
-        self.cursor.execute(
-            "INSERT INTO Aeronaves(MODELO_AERONAVE, ASSENTOS_DISPONIVEIS, LIMITE_BAGAGEM)"
-            "VALUES(?, ?, ?)", (self.__modelo(), self.__assentos(), self.__limite())
-        )
-        self.conexao.commit()
+        self.criar(self.__modelo(), self.__assentos(), self.__limite())
 
     def atualizar(self):
         """Atualiza uma aeronave do banco de dados."""
         codigo = self.__listar()
         coluna = self.__colunas()
-        self.cursor.execute(
-            f"UPDATE Aeronaves SET {coluna[0]}=? WHERE COD_AERONAVE=?", (coluna[1](), codigo)
-        )
-        self.conexao.commit()
+        self.alterar(codigo, **{coluna[0]: coluna[1]()})
 
     def deletar(self):
         """Deleta uma aeronave do banco de dados."""
         codigo = self.__listar()
+        self.mostrar_impacto([codigo])
         while True:
             confirmacao = input(
                 f"Você está prester a deleter a aeronave Código-{codigo}, "
@@ -77,37 +586,19 @@ class Aeronaves(BancoDados):
                 raise self.CancelarErro
             else:
                 print("\nEscolha inválida.\n")
-        self.cursor.execute(
-            f"DELETE FROM Aeronaves WHERE COD_AERONAVE={codigo}"
-        )
-        self.conexao.commit()
+        self.remover(codigo)
 
     def __modelo(self):
         """Entrada do modelo da aeronave."""
-        modelo_aeronave = input("Modelo da Aeronave: ")
-        if modelo_aeronave == "":
-            raise self.ValorNuloErro("O modelo da aeronave não foi preenchido.")
-        return modelo_aeronave
+        return self.validar("MODELO_AERONAVE", input("Modelo da Aeronave: "))
 
     def __assentos(self):
         """Entrada dos assentos disponíveis."""
-        try:
-            assentos_disponiveis = int(input("Assentos Disponíveis: "))
-            if assentos_disponiveis <= 0:
-                raise self.ValorInvalidoErro("O número de assentos disponíveis deve ser um número positivo.")
-            return assentos_disponiveis
-        except ValueError:
-            raise ValueError("O número de assentos disponíveis deve ser um número inteiro.")
+        return self.validar("ASSENTOS_DISPONIVEIS", input("Assentos Disponíveis: "))
 
     def __limite(self):
         """Entrada do limite de bagagem."""
-        try:
-            limite_bagagem = float(input("Limite de Bagagem: "))
-            if limite_bagagem <= 0:
-                raise self.ValorInvalidoErro("O limite de bagagem deve ser um número positivo.")
-            return limite_bagagem
-        except ValueError:
-            raise ValueError("O limite de bagagem deve ser um número real.")
+        return self.validar("LIMITE_BAGAGEM", input("Limite de Bagagem: "))
 
     def __colunas(self):
         """Seleção de colunas e as suas respetivas entradas."""
@@ -128,60 +619,51 @@ class Aeronaves(BancoDados):
                 escolha = int(input(">> "))
                 if escolha == 4:
                     raise self.CancelarErro
-                else:
-                    return colunas.get(escolha)
+                elif escolha in colunas:
+                    return colunas[escolha]
+                print("\nEscolha inválida.\n")
             except ValueError:
                 print("\nEscolha inválida.\n")
 
     def __listar(self):
         """Lista e escolhe um ID da tabela de aeronaves"""
-        self.cursor.execute(
-            "SELECT * FROM Aeronaves"
-        )
-        lista_ids = []
-        while True:
-            for linha in self.cursor.fetchall():
-                print(*linha, sep=" - ")
-            escolha = input("Escolha um ID de aeronave ou pressione ENTER para cancelar: ")
-            if escolha == "":
-                raise self.CancelarErro
-            try:
-                escolha = int(escolha)
-                if escolha not in lista_ids:
-                    print("\nID inexistente...")
-                    funcoes.continuar()
-                    continue
-                return escolha
-            except ValueError:
-                raise self.ValorInvalidoErro("\nID deve ser um número inteiro positivo...")
+        return self.listar_paginado("aeronave")
 
 
 class Aeroportos(BancoDados):
-    def __init__(self):
-        super().__init__()
+    TABELA = "Aeroportos"
+    CHAVE = "COD_AEROPORTO"
+    REGISTRO = registros.Aeroporto
+    COLUNA_FILTRO = "NOME_AEROPORTO"
+    BUSCA = (("SIGLA_AEROPORTO", 10.0), ("NOME_AEROPORTO", 5.0), ("CIDADE", 3.0), ("PAIS", 1.0))
+    CAMPOS = {
+        "NOME_AEROPORTO": (str, None, "O nome do aeroporto não foi preenchido.", None),
+        "SIGLA_AEROPORTO": (str, None, "A sigla do aeroporto não foi preenchida.", None),
+        "CIDADE": (str, None, "Cidade não foi preenchida.", None),
+        "ESTADO": (str, None, "Estado não foi preenchido.", None),
+        "PAIS": (str, None, "País não foi preenchido.", None),
+        "CONTINENTE": (str, None, "Continente não foi preenchido.", None)
+    }
+
+    def __init__(self, pool=None):
+        super().__init__(pool)
 
     def registrar(self):
         """Registra um aeroporto no banco de dados."""
-        self.cursor.execute(
-            "INSERT INTO Aeroportos(NOME_AEROPORTO, SIGLA_AEROPORTO, CIDADE, ESTADO, PAIS, CONTINENTE)"
-            "VALUES(?, ?, ?, ?, ?, ?)", (
-                self.__nome(), self.__sigla(), self.__cidade(), self.__estado(), self.__pais(), self.__continente()
-            )
+        self.criar(
+            self.__nome(), self.__sigla(), self.__cidade(), self.__estado(), self.__pais(), self.__continente()
         )
-        self.conexao.commit()
 
     def atualizar(self):
         """Atualiza um aeroporto do banco de dados."""
         codigo = self.__listar()
         coluna = self.__colunas()
-        self.cursor.execute(
-            f"UPDATE Aeroportos SET {coluna[0]}=? WHERE COD_AEROPORTO=?", (coluna[1](), codigo)
-        )
-        self.conexao.commit()
+        self.alterar(codigo, **{coluna[0]: coluna[1]()})
 
     def deletar(self):
         """Deleta um aeroporto do banco de dados."""
         codigo = self.__listar()
+        self.mostrar_impacto([codigo])
         while True:
             confirmacao = input(
                 f"Você está prester a deleter o aeroporto Código-{codigo}, "
@@ -193,52 +675,31 @@ class Aeroportos(BancoDados):
                 raise self.CancelarErro
             else:
                 print("\nEscolha inválida.\n")
-        self.cursor.execute(
-            f"DELETE FROM Aeroportos WHERE COD_AEROPORTO={codigo}"
-        )
-        self.conexao.commit()
+        self.remover(codigo)
 
     def __nome(self):
         """Entrada do nome do aeroporto."""
-        nome_aeroporto = input("Nome do Aeroporto: ")
-        if nome_aeroporto == "":
-            raise self.ValorNuloErro("O nome do aeroporto não foi preenchido.")
-        return nome_aeroporto
+        return self.validar("NOME_AEROPORTO", input("Nome do Aeroporto: "))
 
     def __sigla(self):
         """Entrada da sigla do aeroporto."""
-        sigla_aeroporto = input("Sigla do Aeroporto: ")
-        if sigla_aeroporto == "":
-            raise self.ValorNuloErro("A sigla do aeroporto não foi preenchida.")
-        return sigla_aeroporto
+        return self.validar("SIGLA_AEROPORTO", input("Sigla do Aeroporto: "))
 
     def __cidade(self):
         """Entrada da cidade do aeroporto."""
-        cidade = input("Cidade: ")
-        if cidade == "":
-            raise self.ValorNuloErro("Cidade não foi preenchida.")
-        return cidade
+        return self.validar("CIDADE", input("Cidade: "))
 
     def __estado(self):
         """Entrada do estado do aeroporto."""
-        estado = input("Estado: ")
-        if estado == "":
-            raise self.ValorNuloErro("Estado não foi preenchido.")
-        return estado
+        return self.validar("ESTADO", input("Estado: "))
 
     def __pais(self):
         """Entrada do país do aeroporto."""
-        pais = input("País: ")
-        if pais == "":
-            raise self.ValorNuloErro("País não foi preenchido.")
-        return pais
+        return self.validar("PAIS", input("País: "))
 
     def __continente(self):
         """Entrada da cidade do aeroporto."""
-        continente = input("Continente: ")
-        if continente == "":
-            raise self.ValorNuloErro("Continente não foi preenchido.")
-        return continente
+        return self.validar("CONTINENTE", input("Continente: "))
 
     def __colunas(self):
         """Seleção de colunas e as suas respetivas entradas."""
@@ -263,60 +724,49 @@ class Aeroportos(BancoDados):
             )
             try:
                 escolha = int(input(">> "))
-                if escolha == 4:
+                if escolha == 7:
                     raise self.CancelarErro
-                else:
-                    return colunas.get(escolha)
+                elif escolha in colunas:
+                    return colunas[escolha]
+                print("\nEscolha inválida.\n")
             except ValueError:
                 print("\nEscolha inválida.\n")
 
     def __listar(self):
         """Lista e escolhe um ID da tabela de aeroportos"""
-        self.cursor.execute(
-            "SELECT * FROM Aeroportos"
-        )
-        lista_ids = []
-        while True:
-            for linha in self.cursor.fetchall():
-                print(*linha, sep=" - ")
-            escolha = input("Escolha um ID de aeroporto ou pressione ENTER para cancelar: ")
-            if escolha == "":
-                raise self.CancelarErro
-            try:
-                escolha = int(escolha)
-                if escolha not in lista_ids:
-                    print("\nID inexistente...")
-                    funcoes.continuar()
-                    continue
-                return escolha
-            except ValueError:
-                raise self.ValorInvalidoErro("\nID deve ser um número inteiro positivo...")
+        return self.listar_paginado("aeroporto")
 
 
 class Empresas(BancoDados):
-    def __init__(self):
-        super().__init__()
+    TABELA = "Empresas"
+    CHAVE = "COD_EMPRESA"
+    REGISTRO = registros.Empresa
+    COLUNA_FILTRO = "NOME_EMPRESA"
+    NOMES_ANTIGOS = ("Empresas Aéreas",)
+    BUSCA = (("SIGLA_DA_EMPRESA", 10.0), ("NOME_EMPRESA", 5.0))
+    CAMPOS = {
+        "NOME_EMPRESA": (str, None, "O nome da empresa não foi preenchido.", None),
+        "NACIONALIDADE_DA_EMPRESA": (str, None, "A nacionalidade da empresa não foi preenchida.", None),
+        "SIGLA_DA_EMPRESA": (str, None, "A sigla da empresa não foi preenchida.", None)
+    }
+
+    def __init__(self, pool=None):
+        super().__init__(pool)
 
     def registrar(self):
         """Registra uma empresa no banco de dados."""
-        self.cursor.execute(
-            "INSERT INTO Empresas(NOME_EMPRESA, NACIONALIDADE_DA_EMPRESA, SIGLA_DA_EMPRESA)"
-            "VALUES(?, ?, ?)", (self.__nome(), self.__nacionalidade(), self.__sigla())
-        )
-        self.conexao.commit()
+        self.criar(self.__nome(), self.__nacionalidade(), self.__sigla())
 
     def atualizar(self):
         """Atualiza uma empresa do banco de dados."""
         codigo = self.__listar()
         coluna = self.__colunas()
-        self.cursor.execute(
-            f"UPDATE Empresas SET {coluna[0]}=? WHERE COD_EMPRESA=?", (coluna[1](), codigo)
-        )
-        self.conexao.commit()
+        self.alterar(codigo, **{coluna[0]: coluna[1]()})
 
     def deletar(self):
         """Deleta uma empresa do banco de dados."""
         codigo = self.__listar()
+        self.mostrar_impacto([codigo])
         while True:
             confirmacao = input(
                 f"Você está prester a deleter a empresa Código-{codigo}, "
@@ -328,31 +778,19 @@ class Empresas(BancoDados):
                 raise self.CancelarErro
             else:
                 print("\nEscolha inválida.\n")
-        self.cursor.execute(
-            f"DELETE FROM Empresas WHERE COD_EMPRESA={codigo}"
-        )
-        self.conexao.commit()
+        self.remover(codigo)
 
     def __nome(self):
         """Entrada do nome da empresa."""
-        nome_empresa = input("Nome da Empresa: ")
-        if nome_empresa == "":
-            raise self.ValorNuloErro("O nome da empresa não foi preenchido.")
-        return nome_empresa
+        return self.validar("NOME_EMPRESA", input("Nome da Empresa: "))
 
     def __nacionalidade(self):
         """Entrada da nacionalidade da empresa."""
-        nacionalidade_empresa = input("Nacionalidade da Empresa: ")
-        if nacionalidade_empresa == "":
-            raise self.ValorNuloErro("A nacionalidade da empresa não foi preenchida.")
-        return nacionalidade_empresa
+        return self.validar("NACIONALIDADE_DA_EMPRESA", input("Nacionalidade da Empresa: "))
 
     def __sigla(self):
         """Entrada da sigla da empresa."""
-        sigla_empresa = input("Sigla da Empresa: ")
-        if sigla_empresa == "":
-            raise self.ValorNuloErro("A sigla da empresa não foi preenchida.")
-        return sigla_empresa
+        return self.validar("SIGLA_DA_EMPRESA", input("Sigla da Empresa: "))
 
     def __colunas(self):
         """Seleção de colunas e as suas respetivas entradas."""
@@ -373,60 +811,108 @@ class Empresas(BancoDados):
                 escolha = int(input(">> "))
                 if escolha == 4:
                     raise self.CancelarErro
-                else:
-                    return colunas.get(escolha)
+                elif escolha in colunas:
+                    return colunas[escolha]
+                print("\nEscolha inválida.\n")
             except ValueError:
                 print("\nEscolha inválida.\n")
 
     def __listar(self):
         """Lista e escolhe um ID da tabela de empresas"""
-        self.cursor.execute(
-            "SELECT * FROM Empresas"
-        )
-        lista_ids = []
-        while True:
-            for linha in self.cursor.fetchall():
-                print(*linha, sep=" - ")
-            escolha = input("Escolha um ID de empresa ou pressione ENTER para cancelar: ")
-            if escolha == "":
-                raise self.CancelarErro
-            try:
-                escolha = int(escolha)
-                if escolha not in lista_ids:
-                    print("\nID inexistente...")
-                    funcoes.continuar()
-                    continue
-                return escolha
-            except ValueError:
-                raise self.ValorInvalidoErro("\nID deve ser um número inteiro positivo...")
+        return self.listar_paginado("empresa")
 
 
 class Voos(BancoDados):
-    def __init__(self):
-        super().__init__()
+    TABELA = "Voos"
+    CHAVE = "COD_VOO"
+    REGISTRO = registros.Voo
+    COLUNA_FILTRO = "DATA_SAIDA"
+    PERIODOS_RELATORIO = {
+        "dia": "substr(M.DATA, 1, 10)",
+        "mes": "substr(M.DATA, 1, 7)",
+        "ano": "substr(M.DATA, 1, 4)",
+        "total": "'total'"
+    }
+    ORDEM_VERIFICACAO = ("COD_AERONAVE", "DATA_SAIDA", "HORA_SAIDA")
+    COLUNAS_AGENDA = {
+        "DATA_SAIDA", "HORA_SAIDA", "DATA_CHEGADA", "HORA_CHEGADA",
+        "COD_AEROPORTO_DECOLAGEM", "COD_AEROPORTO_DESTINO", "COD_AERONAVE"
+    }
+    MOVIMENTOS = {
+        "partidas": ("COD_AEROPORTO_DECOLAGEM", "DATA_SAIDA", "HORA_SAIDA"),
+        "chegadas": ("COD_AEROPORTO_DESTINO", "DATA_CHEGADA", "HORA_CHEGADA")
+    }
+    CAMPOS = {
+        "DATA_SAIDA": (
+            horarios.data, lambda valor: True,
+            "A data de saída deve ser preenchida no formato AAAA-MM-DD ou DD/MM/AAAA.",
+            "A data de saída deve ser preenchida no formato AAAA-MM-DD ou DD/MM/AAAA."
+        ),
+        "HORA_SAIDA": (
+            horarios.hora, lambda valor: True,
+            "A hora de saída deve ser preenchida no formato HH:MM.",
+            "A hora de saída deve ser preenchida no formato HH:MM."
+        ),
+        "COD_AEROPORTO_DECOLAGEM": CAMPO_REFERENCIA,
+        "COD_AEROPORTO_DESTINO": CAMPO_REFERENCIA,
+        "NUMERO_PASSAGEIROS": (
+            int, lambda valor: valor >= 0,
+            "O número de passageiros deve ser um número positivo.",
+            "O número de passageiros deve ser um número inteiro."
+        ),
+        "ASSENTOS_DISPONIVEIS": (
+            int, lambda valor: valor >= 0,
+            "O número de assentos disponíveis deve ser um número positivo.",
+            "O número de assentos disponíveis deve ser um número inteiro."
+        ),
+        "CARGA_CARREGADA": (
+            float, lambda valor: valor >= 0,
+            "A carga carregada deve ser um número positivo.",
+            "A carga carregada deve ser um número real."
+        ),
+        "COD_AERONAVE": CAMPO_REFERENCIA,
+        "DATA_CHEGADA": (
+            horarios.data, lambda valor: True,
+            "A data de chegada deve ser preenchida no formato AAAA-MM-DD ou DD/MM/AAAA.",
+            "A data de chegada deve ser preenchida no formato AAAA-MM-DD ou DD/MM/AAAA."
+        ),
+        "HORA_CHEGADA": (
+            horarios.hora, lambda valor: True,
+            "A hora de chegada deve ser preenchida no formato HH:MM.",
+            "A hora de chegada deve ser preenchida no formato HH:MM."
+        ),
+        "NATUREZA_DO_VOO": (str, None, "Natureza do voo não foi preenchida.", None),
+        "COD_EMPRESA": CAMPO_REFERENCIA
+    }
+    POLITICAS = {
+        "COD_AEROPORTO_DECOLAGEM": "RESTRICT",
+        "COD_AEROPORTO_DESTINO": "RESTRICT",
+        "COD_AERONAVE": "RESTRICT",
+        "COD_EMPRESA": "RESTRICT"
+    }
+    REFERENCIAS = {
+        "COD_AEROPORTO_DECOLAGEM": (Aeroportos, "O aeroporto em questão não existe..."),
+        "COD_AEROPORTO_DESTINO": (Aeroportos, "O aeroporto em questão não existe..."),
+        "COD_AERONAVE": (Aeronaves, "A aeronave em questão não existe..."),
+        "COD_EMPRESA": (Empresas, "A empresa em questão não existe...")
+    }
+
+    def __init__(self, pool=None):
+        super().__init__(pool)
 
     def registrar(self):
         """Registra um voo no banco de dados."""
-        self.cursor.execute(
-            "INSERT INTO Voos(DATA_SAIDA, HORA_SAIDA, COD_AEROPORTO_DECOLAGEM, COD_AEROPORTO_DESTINO,"
-            "NUMERO_PASSAGEIROS, ASSENTOS_DISPONIVEIS, CARGA_CARREGADA, COD_AERONAVE, DATA_CHEGADA,"
-            "HORA_CHEGADA, NATUREZA_DO_VOO, COD_EMPRESA)"
-            "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
-                self.__data_saida(), self.__data_saida(), self.__aeroporto_decolagem(), self.__aeroporto_destino(),
-                self.__passageiros(), self.__assentos(), self.__carga(), self.__aeronave(), self.__data_chegada(),
-                self.__hora_chegada(), self.__natureza(), self.__empresa()
-            )
+        self.criar(
+            self.__data_saida(), self.__hora_saida(), self.__aeroporto_decolagem(), self.__aeroporto_destino(),
+            self.__passageiros(), self.__assentos(), self.__carga(), self.__aeronave(), self.__data_chegada(),
+            self.__hora_chegada(), self.__natureza(), self.__empresa()
         )
-        self.conexao.commit()
 
     def atualizar(self):
         """Atualiza um voo do banco de dados."""
         codigo = self.__listar()
         coluna = self.__colunas()
-        self.cursor.execute(
-            f"UPDATE Voos SET {coluna[0]}=? WHERE COD_VOO=?", (coluna[1](), codigo)
-        )
-        self.conexao.commit()
+        self.alterar(codigo, **{coluna[0]: coluna[1]()})
 
     def deletar(self):
         """Deleta um voo do banco de dados."""
@@ -442,144 +928,207 @@ class Voos(BancoDados):
                 raise self.CancelarErro
             else:
                 print("\nEscolha inválida.\n")
-        self.cursor.execute(
-            f"DELETE FROM Voos WHERE COD_VOO={codigo}"
+        self.remover(codigo)
+
+    def verificar(self, conexao, linha, codigo=None):
+        """Impede que a aeronave tenha voos sobrepostos ou parta de onde não pousou."""
+        if codigo is not None:
+            if not self.COLUNAS_AGENDA.intersection(linha):
+                return
+            atual = conexao.execute(comandos.obter(self, self.colunas()), (codigo,)).fetchone()
+            if atual is None:
+                return
+            linha = dict(zip(self.CAMPOS, atual[1:])) | linha
+        encontrados = conflitos.verificar(conexao, linha, codigo)
+        if encontrados:
+            raise self.ValorInvalidoErro("\n".join(str(conflito) for conflito in encontrados))
+
+    @staticmethod
+    def consulta_relatorio(aeroporto=None, data_inicio=None, data_fim=None, periodo="dia"):
+        """Monta a consulta agregada de movimento por aeroporto e período sobre ResumoMovimentos."""
+        condicoes, parametros = [], []
+        for condicao, valor in (
+            ("M.COD_AEROPORTO = ?", aeroporto), ("M.DATA >= ?", data_inicio), ("M.DATA <= ?", data_fim)
+        ):
+            if valor is not None:
+                condicoes.append(condicao)
+                parametros.append(valor)
+        filtro = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        agrupamento = Voos.PERIODOS_RELATORIO[periodo]
+        # Movimentos de voos com o aeroporto anulado aparecem sem aeroporto, como na agregação de Voos.
+        consulta = (
+            f"SELECT NULLIF(M.COD_AEROPORTO, '{resumos.SEM_REFERENCIA}') AS AEROPORTO, {agrupamento} AS PERIODO, "
+            "SUM(M.PARTIDAS), SUM(M.CHEGADAS), SUM(M.PASSAGEIROS), SUM(M.CARGA), "
+            "SUM(M.SOMA_OCUPACAO) / NULLIF(SUM(M.MOVIMENTOS_COM_OCUPACAO), 0) "
+            f"FROM ResumoMovimentos M{filtro} "
+            "GROUP BY M.COD_AEROPORTO, PERIODO ORDER BY M.COD_AEROPORTO, PERIODO"
+        )
+        return consulta, tuple(parametros)
+
+    @staticmethod
+    def consulta_relatorio_voos(aeroporto=None, data_inicio=None, data_fim=None, periodo="dia"):
+        """Monta a mesma consulta agregando Voos diretamente, para bancos ainda sem o resumo."""
+        partidas, chegadas, parametros_partidas, parametros_chegadas = [], [], [], []
+        for condicoes, parametros, aeroporto_coluna, data_coluna in (
+            (partidas, parametros_partidas, "COD_AEROPORTO_DECOLAGEM", "DATA_SAIDA"),
+            (chegadas, parametros_chegadas, "COD_AEROPORTO_DESTINO", "DATA_CHEGADA")
+        ):
+            if aeroporto is not None:
+                condicoes.append(f"{aeroporto_coluna} = ?")
+                parametros.append(aeroporto)
+            if data_inicio is not None:
+                condicoes.append(f"{data_coluna} >= ?")
+                parametros.append(data_inicio)
+            if data_fim is not None:
+                condicoes.append(f"{data_coluna} <= ?")
+                parametros.append(data_fim)
+        filtro_partidas = f" WHERE {' AND '.join(partidas)}" if partidas else ""
+        filtro_chegadas = f" WHERE {' AND '.join(chegadas)}" if chegadas else ""
+        agrupamento = Voos.PERIODOS_RELATORIO[periodo]
+        consulta = (
+            "WITH MOVIMENTOS AS ("
+            "SELECT COD_AEROPORTO_DECOLAGEM AS AEROPORTO, DATA_SAIDA AS DATA, 1 AS PARTIDA, 0 AS CHEGADA, "
+            f"NUMERO_PASSAGEIROS, CARGA_CARREGADA, COD_AERONAVE FROM Voos{filtro_partidas} "
+            "UNION ALL "
+            "SELECT COD_AEROPORTO_DESTINO, DATA_CHEGADA, 0, 1, "
+            f"NUMERO_PASSAGEIROS, CARGA_CARREGADA, COD_AERONAVE FROM Voos{filtro_chegadas}) "
+            f"SELECT M.AEROPORTO, {agrupamento} AS PERIODO, SUM(M.PARTIDA), SUM(M.CHEGADA), "
+            "SUM(M.NUMERO_PASSAGEIROS), SUM(M.CARGA_CARREGADA), "
+            "AVG(CAST(M.NUMERO_PASSAGEIROS AS REAL) / NULLIF(A.ASSENTOS_DISPONIVEIS, 0)) "
+            "FROM MOVIMENTOS M LEFT JOIN Aeronaves A ON A.COD_AERONAVE = M.COD_AERONAVE "
+            "GROUP BY M.AEROPORTO, PERIODO ORDER BY M.AEROPORTO, PERIODO"
         )
-        self.conexao.commit()
+        return consulta, (*parametros_partidas, *parametros_chegadas)
+
+    def relatorio(self, aeroporto=None, data_inicio=None, data_fim=None, periodo="dia"):
+        """Retorna partidas, chegadas, passageiros, carga e ocupação média por aeroporto e período."""
+        if periodo not in self.PERIODOS_RELATORIO:
+            raise self.ValorInvalidoErro(
+                f"Período deve ser um destes: {', '.join(self.PERIODOS_RELATORIO)}."
+            )
+        if "ResumoMovimentos" in esquema.metadados(self.pool, self.conexao):
+            consulta = self.consulta_relatorio(aeroporto, data_inicio, data_fim, periodo)
+        else:
+            consulta = self.consulta_relatorio_voos(aeroporto, data_inicio, data_fim, periodo)
+        return self.conexao.execute(*consulta).fetchall()
+
+    @staticmethod
+    def consulta_janela(movimento, aeroporto, inicio, fim, colunas=None):
+        """Monta a consulta dos voos de um aeroporto que partem ou chegam dentro de uma janela."""
+        colunas = colunas or (Voos.CHAVE, *Voos.CAMPOS)
+        aeroporto_coluna, data_coluna, hora_coluna = Voos.MOVIMENTOS[movimento]
+        data_inicio, hora_inicio = horarios.separar(inicio)
+        data_fim, hora_fim = horarios.separar(fim, fim_do_dia=True)
+        condicoes, parametros = [], []
+        if aeroporto is not None:
+            condicoes.append(f"{aeroporto_coluna} = ?")
+            parametros.append(aeroporto)
+        # O intervalo de datas usa o índice; a hora só é comparada nos dias das extremidades.
+        condicoes += [
+            f"{data_coluna} BETWEEN ? AND ?",
+            f"({data_coluna} > ? OR {hora_coluna} >= ?)",
+            f"({data_coluna} < ? OR {hora_coluna} <= ?)",
+        ]
+        parametros += [data_inicio, data_fim, data_inicio, hora_inicio, data_fim, hora_fim]
+        return (
+            f"SELECT {', '.join(colunas)} FROM Voos WHERE {' AND '.join(condicoes)} "
+            f"ORDER BY {data_coluna}, {hora_coluna}",
+            tuple(parametros)
+        )
+
+    def janela(self, movimento, aeroporto, inicio, fim):
+        """Retorna as partidas ou chegadas de um aeroporto entre dois instantes, em ordem de horário.
+
+        Os dois extremos são inclusivos; um fim dado só pela data inclui o dia inteiro.
+        """
+        if movimento not in self.MOVIMENTOS:
+            raise self.ValorInvalidoErro(f"Movimento deve ser um destes: {', '.join(self.MOVIMENTOS)}.")
+        try:
+            consulta = self.consulta_janela(movimento, aeroporto, inicio, fim, self.colunas())
+        except ValueError:
+            raise ValueError("Os instantes devem estar no formato AAAA-MM-DD HH:MM.")
+        return self.conexao.execute(*consulta).fetchall()
+
+    def partidas(self, aeroporto, inicio, fim):
+        """Retorna os voos que decolam do aeroporto entre inicio e fim."""
+        return self.janela("partidas", aeroporto, inicio, fim)
+
+    def chegadas(self, aeroporto, inicio, fim):
+        """Retorna os voos que pousam no aeroporto entre inicio e fim."""
+        return self.janela("chegadas", aeroporto, inicio, fim)
 
     def relatorio_aeroporto(self):
-        self.cursor.execute(
-            "SELECT * FROM Voos WHERE COD_AEROPORTO_DECOLAGEM=?"
+        """Exibe o relatório de movimento de um aeroporto."""
+        aeroporto = self.__referencia("ID do aeroporto: ", "COD_AEROPORTO_DECOLAGEM")
+        data_inicio = input("Data inicial (AAAA-MM-DD) ou ENTER para todas: ") or None
+        data_fim = input("Data final (AAAA-MM-DD) ou ENTER para todas: ") or None
+        periodo = input(f"Agrupar por [{' / '.join(self.PERIODOS_RELATORIO)}]: ") or "dia"
+        linhas = self.relatorio(aeroporto, data_inicio, data_fim, periodo)
+        print(
+            "\nAeroporto - Período - Partidas - Chegadas - Passageiros - Carga - Ocupação Média"
         )
+        for linha in linhas:
+            ocupacao = "-" if linha[6] is None else f"{linha[6]:.1%}"
+            print(*linha[:6], ocupacao, sep=" - ")
+        if not linhas:
+            print("Nenhum voo no período.")
+        funcoes.continuar()
 
     def __data_saida(self):
         """Entrada da data de saída do voo."""
-        data_saida = input("Data de Saída: ")
-        if data_saida == "":
-            raise self.ValorNuloErro("A data de saída não foi preenchida.")
-        return data_saida
+        return self.validar("DATA_SAIDA", input("Data de Saída (AAAA-MM-DD): "))
 
     def __hora_saida(self):
         """Entrada da hora de saída do voo."""
-        hora_saida = input("Hora de Saída: ")
-        if hora_saida == "":
-            raise self.ValorNuloErro("A hora de saída não foi preenchida.")
-        return hora_saida
+        return self.validar("HORA_SAIDA", input("Hora de Saída (HH:MM): "))
 
     def __aeroporto_decolagem(self):
         """Entrada do aeroporto de decolagem do voo."""
-        try:
-            aeroporto_decolagem = int(input("ID do aeroporto de decolagem: "))
-            lista_ids = [
-                codigo[0] for codigo in self.cursor.execute(
-                    "SELECT COD_AEROPORTO FROM Aeroportos"
-                ).fetchall()
-            ]
-            if aeroporto_decolagem not in lista_ids:
-                raise self.ValorInvalidoErro("O aeroporto em questão não existe...")
-            else:
-                return aeroporto_decolagem
-        except ValueError:
-            raise self.ValorInvalidoErro("ID deve ser um número inteiro positivo...")
+        return self.__referencia("ID do aeroporto de decolagem: ", "COD_AEROPORTO_DECOLAGEM")
 
     def __aeroporto_destino(self):
         """Entrada do aeroporto de destino do voo."""
-        try:
-            aeroporto_destino = int(input("ID do aeroporto de destino: "))
-            lista_ids = [
-                codigo[0] for codigo in self.cursor.execute(
-                    "SELECT COD_AEROPORTO FROM Aeroportos"
-                ).fetchall()
-            ]
-            if aeroporto_destino not in lista_ids:
-                raise self.ValorInvalidoErro("O aeroporto em questão não existe...")
-            else:
-                return aeroporto_destino
-        except ValueError:
-            raise self.ValorInvalidoErro("ID deve ser um número inteiro positivo...")
+        return self.__referencia("ID do aeroporto de destino: ", "COD_AEROPORTO_DESTINO")
 
     def __passageiros(self):
         """Entrada do número de passageiros no voo."""
-        try:
-            numero_passageiros = int(input("Número de Passageiros: "))
-            if numero_passageiros < 0:
-                raise self.ValorInvalidoErro("O número de passageiros deve ser um número positivo.")
-            return numero_passageiros
-        except ValueError:
-            raise ValueError("O número de passageiros deve ser um número inteiro.")
+        return self.validar("NUMERO_PASSAGEIROS", input("Número de Passageiros: "))
 
     def __assentos(self):
         """Entrada dos assentos disponíveis no voo."""
-        try:
-            assentos_disponiveis = int(input("Assentos Disponíveis: "))
-            if assentos_disponiveis < 0:
-                raise self.ValorInvalidoErro("O número de assentos disponíveis deve ser um número positivo.")
-            return assentos_disponiveis
-        except ValueError:
-            raise ValueError("O número de assentos disponíveis deve ser um número inteiro.")
+        return self.validar("ASSENTOS_DISPONIVEIS", input("Assentos Disponíveis: "))
 
     def __carga(self):
         """Entrada da carga carregada no voo."""
-        try:
-            carga = float(input("Carga Carregada: "))
-            if carga < 0:
-                raise self.ValorInvalidoErro("A carga carregada deve ser um número positivo.")
-            return carga
-        except ValueError:
-            raise ValueError("A carga carregada deve ser um número real.")
+        return self.validar("CARGA_CARREGADA", input("Carga Carregada: "))
 
     def __aeronave(self):
         """Entrada da aeronave do voo."""
-        try:
-            aeronave = int(input("ID da aeronave do voo: "))
-            lista_ids = [
-                codigo[0] for codigo in self.cursor.execute(
-                    "SELECT COD_AERONAVE FROM Aeronaves"
-                ).fetchall()
-            ]
-            if aeronave not in lista_ids:
-                raise self.ValorInvalidoErro("A aeronave em questão não existe...")
-            else:
-                return aeronave
-        except ValueError:
-            raise self.ValorInvalidoErro("ID deve ser um número inteiro positivo...")
+        return self.__referencia("ID da aeronave do voo: ", "COD_AERONAVE")
 
     def __data_chegada(self):
         """Entrada da data de chegada do voo."""
-        data_chegada = input("Data de Chegada: ")
-        if data_chegada == "":
-            raise self.ValorNuloErro("A data de chegada não foi preenchida.")
-        return data_chegada
+        return self.validar("DATA_CHEGADA", input("Data de Chegada (AAAA-MM-DD): "))
 
     def __hora_chegada(self):
         """Entrada da hora de chegada do voo."""
-        hora_chegada = input("Hora de Chegada: ")
-        if hora_chegada == "":
-            raise self.ValorNuloErro("A hora de chegada não foi preenchida.")
-        return hora_chegada
+        return self.validar("HORA_CHEGADA", input("Hora de Chegada (HH:MM): "))
 
     def __natureza(self):
         """Entrada da natureza do voo."""
-        natureza = input("Natureza do voo: ")
-        if natureza == "":
-            raise self.ValorNuloErro("Natureza do voo não foi preenchida.")
-        return natureza
+        return self.validar("NATUREZA_DO_VOO", input("Natureza do voo: "))
 
     def __empresa(self):
         """Entrada da empresa do voo."""
-        try:
-            empresa = int(input("ID da empresa do voo: "))
-            lista_ids = [
-                codigo[0] for codigo in self.cursor.execute(
-                    "SELECT COD_EMPRESA FROM Empresas"
-                ).fetchall()
-            ]
-            if empresa not in lista_ids:
-                raise self.ValorInvalidoErro("A empresa em questão não existe...")
-            else:
-                return empresa
-        except ValueError:
-            raise self.ValorInvalidoErro("ID deve ser um número inteiro positivo...")
+        return self.__referencia("ID da empresa do voo: ", "COD_EMPRESA")
+
+    def __referencia(self, mensagem, coluna):
+        """Entrada de um ID que deve existir na tabela referenciada."""
+        codigo = self.validar(coluna, input(mensagem))
+        classe, erro = self.REFERENCIAS[coluna]
+        if not self.existe(classe.TABELA, classe.CHAVE, codigo):
+            raise self.ValorInvalidoErro(erro)
+        return codigo
 
     def __colunas(self):
         """Seleção de colunas e as suas respetivas entradas."""
@@ -616,31 +1165,14 @@ class Voos(BancoDados):
             )
             try:
                 escolha = int(input(">> "))
-                if escolha == 4:
+                if escolha == 13:
                     raise self.CancelarErro
-                else:
-                    return colunas.get(escolha)
+                elif escolha in colunas:
+                    return colunas[escolha]
+                print("\nEscolha inválida.\n")
             except ValueError:
                 print("\nEscolha inválida.\n")
 
     def __listar(self):
         """Lista e escolhe um ID da tabela de voos"""
-        self.cursor.execute(
-            "SELECT * FROM Voos"
-        )
-        lista_ids = []
-        while True:
-            for linha in self.cursor.fetchall():
-                print(*linha, sep=" - ")
-            escolha = input("Escolha um ID de voo ou pressione ENTER para cancelar: ")
-            if escolha == "":
-                raise self.CancelarErro
-            try:
-                escolha = int(escolha)
-                if escolha not in lista_ids:
-                    print("\nID inexistente...")
-                    funcoes.continuar()
-                    continue
-                return escolha
-            except ValueError:
-                raise self.ValorInvalidoErro("\nID deve ser um número inteiro positivo...")
+        return self.listar_paginado("voo")
@@ -0,0 +1,173 @@
+from functools import lru_cache
+
+# Tamanhos fixos das listas de IN; listas menores são completadas repetindo o último código.
+TAMANHOS_LISTA = (1, 4, 16, 64, 256, 500)
+TAMANHO_CACHE = 512
+
+
+def permitidas(classe, colunas):
+    """Confere as colunas contra CAMPOS da classe e as retorna como tupla, na ordem recebida."""
+    colunas = tuple(colunas)
+    for coluna in colunas:
+        if coluna not in classe.CAMPOS and coluna != classe.CHAVE:
+            raise ValueError(f"A coluna {coluna} não existe na tabela {classe.TABELA}.")
+    if not colunas:
+        raise ValueError("Nenhuma coluna foi informada.")
+    return colunas
+
+
+def inserir(classe, colunas):
+    """Retorna o INSERT das colunas informadas."""
+    return _inserir(classe.TABELA, permitidas(classe, colunas))
+
+
+def atualizar(classe, colunas):
+    """Retorna o UPDATE das colunas informadas, de uma só vez, na linha com a chave dada."""
+    return _atualizar(classe.TABELA, classe.CHAVE, permitidas(classe, colunas))
+
+
+def obter(classe, colunas):
+    """Retorna o SELECT das colunas da linha com a chave dada."""
+    return _obter(classe.TABELA, classe.CHAVE, tuple(colunas))
+
+
+def deletar(classe, codigos):
+    """Retorna o DELETE e os parâmetros de uma parte dos códigos, com a lista de IN em um tamanho fixo."""
+    codigos = list(codigos)
+    tamanho = next((tamanho for tamanho in TAMANHOS_LISTA if tamanho >= len(codigos)), None)
+    if tamanho is None:
+        raise ValueError(f"No máximo {TAMANHOS_LISTA[-1]} códigos por comando.")
+    # Códigos repetidos no IN não mudam as linhas deletadas.
+    return _deletar(classe.TABELA, classe.CHAVE, tamanho), codigos + codigos[-1:] * (tamanho - len(codigos))
+
+
+def partes(codigos):
+    """Divide os códigos em partes que cabem em um DELETE de deletar."""
+    codigos = list(codigos)
+    for inicio in range(0, len(codigos), TAMANHOS_LISTA[-1]):
+        yield codigos[inicio:inicio + TAMANHOS_LISTA[-1]]
+
+
+def contar_lista(classe, coluna, codigos):
+    """Retorna o SELECT que conta as linhas cuja coluna está entre os códigos e os seus parâmetros."""
+    return _lista(classe, "COUNT(*)", coluna, codigos)
+
+
+def chaves_lista(classe, coluna, codigos):
+    """Retorna o SELECT das chaves das linhas cuja coluna está entre os códigos e os seus parâmetros."""
+    return _lista(classe, classe.CHAVE, coluna, codigos)
+
+
+def _lista(classe, selecao, coluna, codigos):
+    codigos = list(codigos)
+    permitidas(classe, [coluna])
+    tamanho = next(tamanho for tamanho in TAMANHOS_LISTA if tamanho >= len(codigos))
+    return (
+        _selecionar_lista(classe.TABELA, selecao, coluna, tamanho),
+        codigos + codigos[-1:] * (tamanho - len(codigos))
+    )
+
+
+def filtro(classe, condicoes):
+    """Monta a condição WHERE de um filtro e os seus parâmetros.
+
+    Cada condição é coluna: valor para igualdade, coluna: (início, fim) para um intervalo
+    fechado, em que None deixa o lado aberto, ou coluna: [valores] para uma lista.
+    """
+    if not condicoes:
+        raise ValueError("Informe ao menos uma condição no filtro.")
+    trechos, parametros = [], []
+    for coluna in permitidas(classe, condicoes):
+        condicao = condicoes[coluna]
+        if isinstance(condicao, tuple):
+            inicio, fim = condicao
+            if inicio is not None:
+                trechos.append(f"{coluna} >= ?")
+                parametros.append(inicio)
+            if fim is not None:
+                trechos.append(f"{coluna} <= ?")
+                parametros.append(fim)
+        elif isinstance(condicao, (list, set, frozenset)):
+            condicao = list(condicao)
+            trechos.append(f"{coluna} IN ({', '.join('?' * len(condicao))})")
+            parametros.extend(condicao)
+        else:
+            trechos.append(f"{coluna} = ?")
+            parametros.append(condicao)
+    return " AND ".join(trechos) or "1", tuple(parametros)
+
+
+def contar(classe, onde):
+    """Retorna o SELECT que conta as linhas que atendem à condição."""
+    return f'SELECT COUNT(*) FROM "{classe.TABELA}" WHERE {onde}'
+
+
+def chaves(classe, onde):
+    """Retorna o SELECT das próximas chaves, em ordem, que atendem à condição; recebe a última chave e o limite."""
+    return _chaves(classe.TABELA, classe.CHAVE, onde)
+
+
+def atualizar_faixa(classe, colunas, onde):
+    """Retorna o UPDATE das colunas nas linhas que atendem à condição dentro de uma faixa de chaves."""
+    return _atualizar_faixa(classe.TABELA, classe.CHAVE, permitidas(classe, colunas), onde)
+
+
+def deletar_faixa(classe, onde):
+    """Retorna o DELETE das linhas que atendem à condição dentro de uma faixa de chaves."""
+    return _deletar_faixa(classe.TABELA, classe.CHAVE, onde)
+
+
+# Os textos ficam guardados para que o mesmo comando chegue sempre igual ao cache de
+# comandos compilados de cada conexão (cached_statements do sqlite3).
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _inserir(tabela, colunas):
+    return f'INSERT INTO "{tabela}"({", ".join(colunas)}) VALUES({", ".join("?" * len(colunas))})'
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _atualizar(tabela, chave, colunas):
+    return f'UPDATE "{tabela}" SET {", ".join(f"{coluna}=?" for coluna in colunas)} WHERE {chave}=?'
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _obter(tabela, chave, colunas):
+    return f'SELECT {", ".join(colunas)} FROM "{tabela}" WHERE {chave}=?'
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _deletar(tabela, chave, tamanho):
+    return f'DELETE FROM "{tabela}" WHERE {chave} IN ({", ".join("?" * tamanho)})'
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _selecionar_lista(tabela, selecao, coluna, tamanho):
+    return f'SELECT {selecao} FROM "{tabela}" WHERE {coluna} IN ({", ".join("?" * tamanho)})'
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _chaves(tabela, chave, onde):
+    return f'SELECT {chave} FROM "{tabela}" WHERE ({onde}) AND {chave} > ? ORDER BY {chave} LIMIT ?'
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _atualizar_faixa(tabela, chave, colunas, onde):
+    return (
+        f'UPDATE "{tabela}" SET {", ".join(f"{coluna}=?" for coluna in colunas)} '
+        f"WHERE ({onde}) AND {chave} BETWEEN ? AND ?"
+    )
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _deletar_faixa(tabela, chave, onde):
+    return f'DELETE FROM "{tabela}" WHERE ({onde}) AND {chave} BETWEEN ? AND ?'
+
+
+def estatisticas():
+    """Retorna os acertos e o tamanho do cache de textos de comandos."""
+    return {
+        nome: funcao.cache_info()._asdict()
+        for nome, funcao in (
+            ("inserir", _inserir), ("atualizar", _atualizar), ("obter", _obter), ("deletar", _deletar),
+            ("selecionar_lista", _selecionar_lista), ("chaves", _chaves), ("atualizar_faixa", _atualizar_faixa), ("deletar_faixa", _deletar_faixa),
+        )
+    }
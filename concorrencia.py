@@ -0,0 +1,103 @@
+import argparse
+import json
+import random
+import sqlite3 as sql
+import threading
+import time
+import conexoes
+import gerador
+import migracoes
+from carga import percentil
+from classes import Aeronaves, Aeroportos, Empresas, Voos
+
+
+def preparar(pool, escritores):
+    """Garante aeroportos, uma aeronave por escritor e uma empresa para os voos do teste."""
+    with Aeroportos(pool) as aeroportos, Aeronaves(pool) as aeronaves, Empresas(pool) as empresas:
+        codigos_aeroportos = [
+            aeroportos.criar(f"Aeroporto {indice}", f"A{indice:02}", "Cidade", "Estado", "País", "Continente")
+            for indice in range(10)
+        ]
+        codigos_aeronaves = [aeronaves.criar("Teste", 180, 23) for _ in range(escritores)]
+        empresa = empresas.criar("Empresa Teste", "Brasileira", "ET")
+    return codigos_aeroportos, codigos_aeronaves, empresa
+
+
+def _escritor(pool, largada, segundos, referencias, resultado, numero):
+    aeroportos, aeronaves, empresa = referencias
+    # Cada escritor encadeia os voos da sua aeronave, que assim não entram em conflito.
+    voos = gerador.voos_encadeados(random.Random(numero), aeronaves[numero], empresa, aeroportos, "2100-01-01")
+    with Voos(pool) as tabela:
+        largada.wait()
+        fim = time.perf_counter() + segundos
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                tabela.criar(*next(voos))
+                resultado["latencias"].append(time.perf_counter() - inicio)
+            except sql.OperationalError as erro:
+                resultado["erros"].append(str(erro))
+
+
+def _leitor(pool, largada, segundos, referencias, resultado):
+    aeroportos = referencias[0]
+    with Voos(pool) as tabela:
+        largada.wait()
+        fim = time.perf_counter() + segundos
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                tabela.relatorio(random.choice(aeroportos), periodo="total")
+                resultado["latencias"].append(time.perf_counter() - inicio)
+            except sql.OperationalError as erro:
+                resultado["erros"].append(str(erro))
+
+
+def executar(caminho, perfil, escritores, leitores, segundos):
+    """Executa escritores e leitores em paralelo sobre Voos e retorna vazão e latências."""
+    pool = conexoes.PoolConexoes(caminho, tamanho_maximo=escritores + leitores + 1, perfil=perfil)
+    migracoes.sincronizar(pool)
+    referencias = preparar(pool, escritores)
+    resultados = {"escrita": {"latencias": [], "erros": []}, "leitura": {"latencias": [], "erros": []}}
+    # As conexões são abertas antes da largada, para que só o teste em si seja medido.
+    largada = threading.Barrier(escritores + leitores)
+    threads = [
+        threading.Thread(
+            target=_escritor, args=(pool, largada, segundos, referencias, resultados["escrita"], numero)
+        )
+        for numero in range(escritores)
+    ] + [
+        threading.Thread(target=_leitor, args=(pool, largada, segundos, referencias, resultados["leitura"]))
+        for _ in range(leitores)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    relatorio = {"perfil": perfil, "escritores": escritores, "leitores": leitores, "segundos": segundos}
+    for tipo, resultado in resultados.items():
+        latencias = sorted(resultado["latencias"])
+        relatorio[tipo] = {
+            "operacoes": len(latencias),
+            "operacoes_por_segundo": len(latencias) / segundos,
+            "p50_ms": percentil(latencias, 0.50) * 1000,
+            "p99_ms": percentil(latencias, 0.99) * 1000,
+            "erros": len(resultado["erros"]),
+            "exemplo_erro": resultado["erros"][0] if resultado["erros"] else None,
+        }
+    relatorio["repeticoes_ocupado"] = pool.estatisticas()["repeticoes_ocupado"]
+    pool.fechar()
+    return relatorio
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Teste de concorrência de escritores e leitores em Voos.")
+    parser.add_argument("banco", help="cópia do banco de dados usada no teste")
+    parser.add_argument("--perfil", choices=conexoes.PERFIS, default="padrao")
+    parser.add_argument("--escritores", type=int, default=4)
+    parser.add_argument("--leitores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    argumentos = parser.parse_args()
+    print(json.dumps(executar(
+        argumentos.banco, argumentos.perfil, argumentos.escritores, argumentos.leitores, argumentos.segundos
+    ), indent=4))
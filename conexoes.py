@@ -0,0 +1,191 @@
+import atexit
+import random
+import sqlite3 as sql
+import threading
+import time
+
+CAMINHO_BANCO = "bancodados.db"
+
+# Perfis de armazenamento: PRAGMAs aplicados a cada conexão aberta pelo pool.
+PERFIS = {
+    "padrao": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    "seguro": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -32000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 10000,
+        "foreign_keys": "ON",
+    },
+    "legado": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 0,
+        "foreign_keys": "ON",
+    },
+}
+
+
+class PoolEsgotadoErro(Exception):
+    """Erro indicando que nenhuma conexão ficou livre dentro do tempo limite."""
+    pass
+
+
+class PoolConexoes:
+    def __init__(self, caminho=CAMINHO_BANCO, tamanho_maximo=4, tempo_limite=None, perfil="padrao",
+                 tentativas=6, espera_inicial=0.02, comandos_em_cache=256):
+        """Cria um pool de conexões SQLite com um limite de conexões abertas."""
+        self.caminho = caminho
+        self.tamanho_maximo = tamanho_maximo
+        self.tempo_limite = tempo_limite
+        self.perfil = PERFIS[perfil] if isinstance(perfil, str) else perfil
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.comandos_em_cache = comandos_em_cache
+        self.__repeticoes = 0
+        self.escritor = None
+        self.cache = None
+        self.medidor = None
+        self.esquema = None
+        self.__livres = []
+        self.__todas = set()
+        self.__local = threading.local()
+        self.__condicao = threading.Condition()
+        self.__aquisicoes = 0
+        self.__espera_total = 0.0
+        self.__espera_maxima = 0.0
+
+    def adquirir(self):
+        """Retorna a conexão da thread atual, abrindo ou esperando por uma se preciso."""
+        local = self.__local
+        if getattr(local, "conexao", None) is not None:
+            local.referencias += 1
+            return local.conexao
+        inicio = time.perf_counter()
+        with self.__condicao:
+            while not self.__livres and len(self.__todas) >= self.tamanho_maximo:
+                if not self.__condicao.wait(self.tempo_limite):
+                    raise PoolEsgotadoErro(
+                        f"Nenhuma conexão livre após {self.tempo_limite} segundos."
+                    )
+            if self.__livres:
+                conexao = self.__livres.pop()
+            else:
+                conexao = self._abrir()
+                self.__todas.add(conexao)
+            espera = time.perf_counter() - inicio
+            self.__aquisicoes += 1
+            self.__espera_total += espera
+            self.__espera_maxima = max(self.__espera_maxima, espera)
+        local.conexao = conexao
+        local.referencias = 1
+        return conexao
+
+    def liberar(self, conexao):
+        """Devolve a conexão da thread atual ao pool quando não houver mais usuários."""
+        local = self.__local
+        if getattr(local, "conexao", None) is not conexao:
+            return
+        local.referencias -= 1
+        if local.referencias > 0:
+            return
+        local.conexao = None
+        if conexao.in_transaction:
+            conexao.rollback()
+        with self.__condicao:
+            if conexao in self.__todas:
+                self.__livres.append(conexao)
+            self.__condicao.notify()
+
+    def fechar(self):
+        """Fecha todas as conexões abertas pelo pool."""
+        with self.__condicao:
+            for conexao in self.__todas:
+                conexao.close()
+            self.__todas.clear()
+            self.__livres.clear()
+            self.__condicao.notify_all()
+        self.__local = threading.local()
+
+    def estatisticas(self):
+        """Retorna os contadores de conexões e de tempo de espera do pool."""
+        with self.__condicao:
+            return {
+                "abertas": len(self.__todas),
+                "livres": len(self.__livres),
+                "em_uso": len(self.__todas) - len(self.__livres),
+                "aquisicoes": self.__aquisicoes,
+                "espera_total": self.__espera_total,
+                "espera_maxima": self.__espera_maxima,
+                "repeticoes_ocupado": self.__repeticoes,
+            }
+
+    def repetir_se_ocupado(self, funcao):
+        """Executa funcao, repetindo-a com espera exponencial enquanto o banco estiver ocupado."""
+        for tentativa in range(self.tentativas):
+            try:
+                return funcao()
+            except sql.OperationalError as erro:
+                if not ocupado(erro) or tentativa == self.tentativas - 1:
+                    raise
+            with self.__condicao:
+                self.__repeticoes += 1
+            time.sleep(self.espera_inicial * 2 ** tentativa * random.uniform(0.5, 1.5))
+
+    def transacao(self, conexao, funcao):
+        """Executa funcao(conexao) em uma transação de escrita, repetindo-a se o banco estiver ocupado."""
+        if conexao.in_transaction:
+            return funcao(conexao)
+        if self.escritor is not None:
+            # Com o commit agrupado ativo, a escrita é feita pela thread do escritor.
+            return self.escritor.enviar(funcao).result()
+
+        def tentar():
+            # BEGIN IMMEDIATE reserva a escrita logo no início, onde o busy_timeout ainda vale.
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                resultado = funcao(conexao)
+                conexao.commit()
+            except BaseException:
+                conexao.rollback()
+                raise
+            return resultado
+        return self.repetir_se_ocupado(tentar)
+
+    def _abrir(self):
+        """Abre uma nova conexão com o banco de dados e aplica o perfil de armazenamento."""
+        conectar = sql.connect if self.medidor is None else self.medidor.conectar
+        # cached_statements guarda os comandos já compilados, reaproveitados quando o texto se repete.
+        conexao = conectar(
+            self.caminho, timeout=self.perfil["busy_timeout"] / 1000, check_same_thread=False,
+            cached_statements=self.comandos_em_cache
+        )
+        # journal_mode precisa de um bloqueio exclusivo e pode encontrar o banco ocupado.
+        for pragma, valor in self.perfil.items():
+            self.repetir_se_ocupado(lambda: conexao.execute(f"PRAGMA {pragma}={valor}"))
+        return conexao
+
+
+def ocupado(erro):
+    """Indica se um erro do SQLite corresponde a SQLITE_BUSY ou SQLITE_LOCKED."""
+    codigo = getattr(erro, "sqlite_errorcode", None)
+    if codigo is not None:
+        return codigo & 0xFF in (sql.SQLITE_BUSY, sql.SQLITE_LOCKED)
+    mensagem = str(erro)
+    return "locked" in mensagem or "busy" in mensagem
+
+
+pool = PoolConexoes()
+atexit.register(pool.fechar)
@@ -0,0 +1,118 @@
+import argparse
+import heapq
+from dataclasses import dataclass
+import conexoes
+
+# Colunas lidas de cada voo: código, aeronave, saída, chegada, origem e destino.
+SELECAO = (
+    "SELECT COD_VOO, COD_AERONAVE, DATA_SAIDA || 'T' || HORA_SAIDA, DATA_CHEGADA || 'T' || HORA_CHEGADA, "
+    "CAST(COD_AEROPORTO_DECOLAGEM AS INTEGER), CAST(COD_AEROPORTO_DESTINO AS INTEGER) FROM Voos"
+)
+
+
+@dataclass(slots=True)
+class Conflito:
+    tipo: str
+    aeronave: int
+    voo: int
+    outro: int
+    detalhe: str
+
+    def __str__(self):
+        return f"[{self.tipo}] Aeronave {self.aeronave}: {_nome(self.voo)} x {_nome(self.outro)} - {self.detalhe}"
+
+
+def _nome(codigo):
+    return "novo voo" if codigo is None else f"voo {codigo}"
+
+
+def _sobreposicao(aeronave, anterior, posterior):
+    return Conflito(
+        "sobreposicao", aeronave, anterior[0], posterior[0],
+        f"o {_nome(anterior[0])} chega às {anterior[2]} e o {_nome(posterior[0])} parte às {posterior[1]}"
+    )
+
+
+def _continuidade(aeronave, anterior, posterior):
+    return Conflito(
+        "continuidade", aeronave, anterior[0], posterior[0],
+        f"o {_nome(anterior[0])} pousa no aeroporto {anterior[4]} "
+        f"e o {_nome(posterior[0])} decola do aeroporto {posterior[3]}"
+    )
+
+
+def vizinhos(conexao, aeronave, saida, ignorar=None):
+    """Retorna o voo da aeronave que parte antes de saida e o que parte depois, por buscas no índice."""
+    data, hora = saida.split("T")
+    resultado = []
+    for comparacao, ordem in (("<=", "DESC"), (">", "ASC")):
+        linha = conexao.execute(
+            f"{SELECAO} WHERE COD_AERONAVE = ? AND COD_VOO IS NOT ? "
+            f"AND (DATA_SAIDA, HORA_SAIDA) {comparacao} (?, ?) "
+            f"ORDER BY DATA_SAIDA {ordem}, HORA_SAIDA {ordem} LIMIT 1",
+            (aeronave, ignorar, data, hora)
+        ).fetchone()
+        resultado.append(None if linha is None else (linha[0], *linha[2:]))
+    return resultado
+
+
+def verificar(conexao, voo, codigo=None):
+    """Retorna os conflitos de um voo novo ou alterado com os voos vizinhos da mesma aeronave."""
+    aeronave = voo["COD_AERONAVE"]
+    saida = f"{voo['DATA_SAIDA']}T{voo['HORA_SAIDA']}"
+    atual = (
+        codigo, saida, f"{voo['DATA_CHEGADA']}T{voo['HORA_CHEGADA']}",
+        int(voo["COD_AEROPORTO_DECOLAGEM"]), int(voo["COD_AEROPORTO_DESTINO"])
+    )
+    if atual[2] <= atual[1]:
+        return [Conflito("horario", aeronave, codigo, codigo, "a chegada deve ser posterior à saída")]
+    anterior, posterior = vizinhos(conexao, aeronave, saida, codigo)
+    conflitos = []
+    # Com os voos da aeronave já sem sobreposições, basta comparar com os dois vizinhos.
+    if anterior is not None:
+        if anterior[2] > atual[1]:
+            conflitos.append(_sobreposicao(aeronave, anterior, atual))
+        elif anterior[4] != atual[3]:
+            conflitos.append(_continuidade(aeronave, anterior, atual))
+    if posterior is not None:
+        if atual[2] > posterior[1]:
+            conflitos.append(_sobreposicao(aeronave, atual, posterior))
+        elif atual[4] != posterior[3]:
+            conflitos.append(_continuidade(aeronave, atual, posterior))
+    return conflitos
+
+
+def auditar(pool=None, tamanho_lote=10000):
+    """Percorre Voos por aeronave e horário e gera todas as sobreposições e quebras de continuidade."""
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    try:
+        cursor = conexao.execute(f"{SELECAO} ORDER BY COD_AERONAVE, DATA_SAIDA, HORA_SAIDA")
+        aeronave, anterior, ativos = None, None, []
+        while linhas := cursor.fetchmany(tamanho_lote):
+            for codigo, dono, saida, chegada, origem, destino in linhas:
+                atual = (codigo, saida, chegada, origem, destino)
+                if dono != aeronave:
+                    aeronave, anterior, ativos = dono, None, []
+                # ativos guarda, por ordem de chegada, os voos que ainda estão no ar na saída deste.
+                while ativos and ativos[0][0] <= saida:
+                    heapq.heappop(ativos)
+                for _, voo in ativos:
+                    yield _sobreposicao(aeronave, voo, atual)
+                if anterior is not None and not ativos and anterior[4] != origem:
+                    yield _continuidade(aeronave, anterior, atual)
+                heapq.heappush(ativos, (chegada, atual))
+                anterior = atual
+    finally:
+        pool.liberar(conexao)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Auditoria de conflitos de aeronaves na tabela Voos.")
+    parser.add_argument("--banco", default=conexoes.CAMINHO_BANCO)
+    argumentos = parser.parse_args()
+    total = 0
+    for conflito in auditar(conexoes.PoolConexoes(argumentos.banco)):
+        print(conflito)
+        total += 1
+    print(f"{total} conflito(s) encontrado(s).")
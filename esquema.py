@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+
+
+class EsquemaErro(Exception):
+    """Erro indicando que o banco não tem uma tabela ou coluna do modelo das classes."""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Tabela:
+    nome: str
+    colunas: tuple
+    tipos: tuple
+    obrigatorias: frozenset
+    chave: str
+
+    def falta(self, colunas):
+        """Retorna, na ordem recebida, as colunas que a tabela não tem."""
+        return [coluna for coluna in colunas if coluna not in self.colunas]
+
+
+def inspecionar(conexao):
+    """Lê sqlite_master uma vez e retorna os metadados de colunas de cada tabela do banco."""
+    tabelas = {}
+    nomes = [
+        nome for nome, in conexao.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    for nome in nomes:
+        colunas = conexao.execute(f'PRAGMA table_info("{nome}")').fetchall()
+        tabelas[nome] = Tabela(
+            nome,
+            tuple(coluna for _, coluna, _, _, _, _ in colunas),
+            tuple(tipo for _, _, tipo, _, _, _ in colunas),
+            frozenset(coluna for _, coluna, _, obrigatoria, _, _ in colunas if obrigatoria),
+            next((coluna for _, coluna, _, _, _, chave in colunas if chave), None),
+        )
+    return tabelas
+
+
+def metadados(pool, conexao):
+    """Retorna os metadados guardados no pool, inspecionando o banco só na primeira chamada."""
+    if pool.esquema is None:
+        pool.esquema = inspecionar(conexao)
+    return pool.esquema
+
+
+def invalidar(pool):
+    """Descarta os metadados guardados; a próxima chamada de metadados inspeciona o banco de novo."""
+    pool.esquema = None
+
+
+def colunas(pool, conexao, classe):
+    """Retorna CHAVE e CAMPOS da classe depois de conferir que todas existem na tabela."""
+    tabela = metadados(pool, conexao).get(classe.TABELA)
+    if tabela is None:
+        raise EsquemaErro(f"A tabela {classe.TABELA} não existe no banco {pool.caminho}.")
+    modelo = (classe.CHAVE, *classe.CAMPOS)
+    faltando = tabela.falta(modelo)
+    if faltando:
+        raise EsquemaErro(f"A tabela {classe.TABELA} não tem as colunas {', '.join(faltando)}.")
+    return modelo
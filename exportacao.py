@@ -0,0 +1,215 @@
+import argparse
+import csv
+import json
+import os
+import struct
+from array import array
+import conexoes
+import esquema
+from classes import Aeronaves, Aeroportos, Empresas, Voos
+
+TABELAS = {"aeronaves": Aeronaves, "aeroportos": Aeroportos, "empresas": Empresas, "voos": Voos}
+FORMATOS = ("csv", "jsonl", "col")
+ASSINATURA_COLUNAR = b"CRUDCOL1"
+
+
+def consulta_voos(data_inicio=None, data_fim=None, aeroporto=None, empresa=None, colunas=None):
+    """Monta a consulta de voos filtrada por período de saída, aeroporto e empresa."""
+    colunas = colunas or (Voos.CHAVE, *Voos.CAMPOS)
+    condicoes, parametros = [], []
+    if data_inicio is not None:
+        condicoes.append("DATA_SAIDA >= ?")
+        parametros.append(data_inicio)
+    if data_fim is not None:
+        condicoes.append("DATA_SAIDA <= ?")
+        parametros.append(data_fim)
+    if aeroporto is not None:
+        condicoes.append("(COD_AEROPORTO_DECOLAGEM = ? OR COD_AEROPORTO_DESTINO = ?)")
+        parametros += [aeroporto, aeroporto]
+    if empresa is not None:
+        condicoes.append("COD_EMPRESA = ?")
+        parametros.append(empresa)
+    filtro = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return f"SELECT {', '.join(colunas)} FROM Voos{filtro} ORDER BY COD_VOO", tuple(parametros)
+
+
+def _lotes(cursor, tamanho_lote):
+    """Gera os resultados do cursor em lotes de no máximo tamanho_lote linhas."""
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas:
+            return
+        yield linhas
+
+
+def _escrever_csv(arquivo, colunas, lotes):
+    escritor = csv.writer(arquivo)
+    escritor.writerow(colunas)
+    for linhas in lotes:
+        escritor.writerows(linhas)
+
+
+def _escrever_jsonl(arquivo, colunas, lotes):
+    for linhas in lotes:
+        arquivo.writelines(
+            json.dumps(dict(zip(colunas, linha)), ensure_ascii=False) + "\n" for linha in linhas
+        )
+
+
+def _tipo_inteiro(valores):
+    """Escolhe o menor tipo de array capaz de armazenar os inteiros informados."""
+    menor, maior = min(valores, default=0), max(valores, default=0)
+    for tipo, limite in (("b", 1 << 7), ("h", 1 << 15), ("i", 1 << 31)):
+        if -limite <= menor and maior < limite:
+            return tipo
+    return "q"
+
+
+def _codificar_textos(textos):
+    """Codifica textos como deslocamentos seguidos dos bytes concatenados."""
+    deslocamentos = array("I", [0])
+    for texto in textos:
+        deslocamentos.append(deslocamentos[-1] + len(texto))
+    return deslocamentos.tobytes() + b"".join(textos)
+
+
+def _codificar_coluna(valores):
+    """Codifica uma coluna de um grupo de linhas como tipo, mapa de nulos e dados."""
+    nulos = bytearray((len(valores) + 7) // 8)
+    for posicao, valor in enumerate(valores):
+        if valor is None:
+            nulos[posicao // 8] |= 1 << (posicao % 8)
+    presentes = [valor for valor in valores if valor is not None]
+    if all(type(valor) is int for valor in presentes):
+        tipo = _tipo_inteiro(presentes)
+        dados = array(tipo, (0 if valor is None else valor for valor in valores)).tobytes()
+        return tipo.encode() + bytes(nulos) + dados
+    if all(type(valor) in (int, float) for valor in presentes):
+        dados = array("d", (0.0 if valor is None else valor for valor in valores)).tobytes()
+        return b"d" + bytes(nulos) + dados
+    textos = [b"" if valor is None else str(valor).encode("utf-8") for valor in valores]
+    dicionario = {}
+    for texto in textos:
+        dicionario.setdefault(texto, len(dicionario))
+    if len(dicionario) <= len(textos) // 2 and len(dicionario) < 1 << 15:
+        # Colunas com poucos valores distintos guardam cada texto uma única vez.
+        indices = array("h", (dicionario[texto] for texto in textos)).tobytes()
+        return (
+            b"D" + bytes(nulos) + struct.pack("<I", len(dicionario))
+            + _codificar_textos(list(dicionario)) + indices
+        )
+    return b"s" + bytes(nulos) + _codificar_textos(textos)
+
+
+def _escrever_colunar(arquivo, colunas, lotes):
+    cabecalho = json.dumps({"colunas": colunas}).encode("utf-8")
+    arquivo.write(ASSINATURA_COLUNAR + struct.pack("<I", len(cabecalho)) + cabecalho)
+    for linhas in lotes:
+        arquivo.write(struct.pack("<I", len(linhas)))
+        for valores in zip(*linhas):
+            arquivo.write(_codificar_coluna(valores))
+    arquivo.write(struct.pack("<I", 0))
+
+
+def _ler_textos(arquivo, quantidade):
+    """Lê uma sequência de textos codificada por _codificar_textos."""
+    deslocamentos = array("I")
+    deslocamentos.frombytes(arquivo.read((quantidade + 1) * deslocamentos.itemsize))
+    dados = arquivo.read(deslocamentos[-1])
+    return [
+        dados[deslocamentos[posicao]:deslocamentos[posicao + 1]].decode("utf-8")
+        for posicao in range(quantidade)
+    ]
+
+
+def ler_colunar(caminho):
+    """Gera as linhas de um arquivo colunar, um grupo de linhas por vez."""
+    with open(caminho, "rb") as arquivo:
+        if arquivo.read(len(ASSINATURA_COLUNAR)) != ASSINATURA_COLUNAR:
+            raise ValueError("O arquivo não está no formato colunar.")
+        tamanho, = struct.unpack("<I", arquivo.read(4))
+        colunas = json.loads(arquivo.read(tamanho))["colunas"]
+        while True:
+            quantidade, = struct.unpack("<I", arquivo.read(4))
+            if quantidade == 0:
+                return
+            valores_colunas = []
+            for _ in colunas:
+                tipo = arquivo.read(1)
+                nulos = arquivo.read((quantidade + 7) // 8)
+                if tipo == b"D":
+                    distintos, = struct.unpack("<I", arquivo.read(4))
+                    dicionario = _ler_textos(arquivo, distintos)
+                    indices = array("h")
+                    indices.frombytes(arquivo.read(quantidade * indices.itemsize))
+                    valores = [dicionario[indice] for indice in indices]
+                elif tipo == b"s":
+                    valores = _ler_textos(arquivo, quantidade)
+                else:
+                    valores = array(tipo.decode())
+                    valores.frombytes(arquivo.read(quantidade * valores.itemsize))
+                    valores = valores.tolist()
+                valores_colunas.append([
+                    None if nulos[posicao // 8] >> (posicao % 8) & 1 else valor
+                    for posicao, valor in enumerate(valores)
+                ])
+            for linha in zip(*valores_colunas):
+                yield dict(zip(colunas, linha))
+
+
+ESCRITORES = {"csv": _escrever_csv, "jsonl": _escrever_jsonl, "col": _escrever_colunar}
+
+
+def exportar(consulta, parametros, caminho, formato=None, tamanho_lote=1000, pool=None):
+    """Exporta o resultado de uma consulta em fluxo, lendo tamanho_lote linhas por vez."""
+    formato = formato or os.path.splitext(caminho)[1].lstrip(".").lower()
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato de exportação não suportado: {formato}")
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    try:
+        cursor = conexao.execute(consulta, parametros)
+        colunas = [descricao[0] for descricao in cursor.description]
+        if formato == "col":
+            arquivo = open(caminho, "wb")
+        else:
+            arquivo = open(caminho, "w", encoding="utf-8", newline="")
+        with arquivo:
+            ESCRITORES[formato](arquivo, colunas, _lotes(cursor, tamanho_lote))
+        cursor.close()
+    finally:
+        pool.liberar(conexao)
+
+
+def exportar_tabela(classe, caminho, formato=None, tamanho_lote=1000, pool=None):
+    """Exporta as colunas de CHAVE e CAMPOS de uma tabela inteira, em ordem de chave primária."""
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    try:
+        colunas = esquema.colunas(pool, conexao, classe)
+    finally:
+        pool.liberar(conexao)
+    exportar(
+        f'SELECT {", ".join(colunas)} FROM "{classe.TABELA}" ORDER BY {classe.CHAVE}', (),
+        caminho, formato, tamanho_lote, pool
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Exportação de tabelas para CSV, JSON Lines ou formato colunar.")
+    parser.add_argument("tabela", choices=TABELAS)
+    parser.add_argument("arquivo")
+    parser.add_argument("--formato", choices=FORMATOS)
+    parser.add_argument("--lote", type=int, default=1000, help="linhas lidas por vez do cursor")
+    parser.add_argument("--inicio", help="data de saída inicial (apenas voos)")
+    parser.add_argument("--fim", help="data de saída final (apenas voos)")
+    parser.add_argument("--aeroporto", type=int, help="aeroporto de decolagem ou destino (apenas voos)")
+    parser.add_argument("--empresa", type=int, help="empresa do voo (apenas voos)")
+    argumentos = parser.parse_args()
+    if argumentos.tabela == "voos":
+        exportar(
+            *consulta_voos(argumentos.inicio, argumentos.fim, argumentos.aeroporto, argumentos.empresa),
+            argumentos.arquivo, argumentos.formato, argumentos.lote
+        )
+    else:
+        exportar_tabela(TABELAS[argumentos.tabela], argumentos.arquivo, argumentos.formato, argumentos.lote)
@@ -0,0 +1,212 @@
+import argparse
+import itertools
+import os
+import random
+import sqlite3 as sql
+import time
+import busca
+import comandos
+import conexoes
+import horarios
+import migracoes
+import resumos
+from classes import Aeronaves, Aeroportos, Empresas, Voos
+
+MODELOS = (
+    ("Airbus A320", 174, 23.0), ("Airbus A321", 220, 23.0), ("Boeing 737-800", 186, 23.0),
+    ("Boeing 777-300ER", 396, 32.0), ("Embraer E195", 118, 23.0), ("ATR 72-600", 70, 15.0),
+    ("Airbus A330-200", 242, 32.0), ("Boeing 787-9", 290, 32.0),
+)
+CONTINENTES = {
+    "América do Sul": ("Brasil", "Argentina", "Chile", "Peru", "Colômbia"),
+    "América do Norte": ("Estados Unidos", "Canadá", "México"),
+    "Europa": ("Portugal", "Espanha", "França", "Alemanha", "Itália"),
+    "Ásia": ("Japão", "China", "Índia"),
+    "África": ("Angola", "Moçambique", "África do Sul"),
+}
+NATUREZAS = ("Regular", "Regular", "Regular", "Regular", "Regular", "Regular", "Charter", "Carga")
+TAMANHO_LOTE = 10000
+
+
+def escalas(voos, aeroportos=None, aeronaves=None, empresas=None):
+    """Calcula volumes proporcionais ao número de voos para as tabelas não informadas."""
+    aeronaves = aeronaves or max(10, voos // 1000)
+    return {
+        "aeroportos": aeroportos or max(20, min(5000, voos // 2000)),
+        "aeronaves": aeronaves,
+        "empresas": empresas or max(3, aeronaves // 25),
+        "voos": voos,
+    }
+
+
+def criar_esquema(destino, origem=conexoes.CAMINHO_BANCO):
+    """Cria em destino as tabelas do banco de origem, sem copiar as linhas."""
+    with sql.connect(origem) as modelo:
+        # Índices de busca e suas tabelas internas são recriados pelas migrações.
+        comandos = [
+            linha[0] for linha in modelo.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+                "AND name NOT LIKE ? || '%'", (busca.PREFIXO_TABELA,)
+            )
+        ]
+    conexao = sql.connect(destino)
+    try:
+        for comando in comandos:
+            conexao.execute(comando)
+        conexao.commit()
+    finally:
+        conexao.close()
+
+
+def inserir(pool, conexao, classe, linhas):
+    """Insere as linhas em lotes, uma transação por lote, e retorna quantas foram gravadas."""
+    comando = comandos.inserir(classe, classe.CAMPOS)
+    total = 0
+    linhas = iter(linhas)
+    while lote := list(itertools.islice(linhas, TAMANHO_LOTE)):
+        pool.transacao(conexao, lambda destino: destino.executemany(comando, lote))
+        total += len(lote)
+    return total
+
+
+def _aeroportos(gerador, quantidade):
+    for numero in range(1, quantidade + 1):
+        continente = gerador.choice(tuple(CONTINENTES))
+        pais = gerador.choice(CONTINENTES[continente])
+        sigla = "".join(gerador.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(3))
+        yield (
+            f"Aeroporto {numero}", sigla, f"Cidade {numero}", f"Estado {numero % 50 + 1}", pais, continente
+        )
+
+
+def _aeronaves(gerador, quantidade):
+    # Modelos de corredor único são mais comuns que os de fuselagem larga.
+    pesos = [4 if assentos < 250 else 1 for _, assentos, _ in MODELOS]
+    for modelo, assentos, bagagem in gerador.choices(MODELOS, pesos, k=quantidade):
+        yield modelo, assentos, bagagem
+
+
+def _empresas(gerador, quantidade):
+    paises = [pais for lista in CONTINENTES.values() for pais in lista]
+    for numero in range(1, quantidade + 1):
+        sigla = "".join(gerador.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(2))
+        yield f"Empresa {numero}", gerador.choice(paises), sigla
+
+
+def _voos(gerador, volumes, aeroportos, aeronaves, empresas, inicio):
+    """Gera voos encadeados por aeronave, sem sobreposições e partindo de onde a aeronave pousou.
+
+    A popularidade dos aeroportos segue uma lei de Zipf, de modo que poucos hubs concentram boa
+    parte do tráfego, e cada aeronave pertence a uma única empresa.
+    """
+    acumulado = list(itertools.accumulate(1 / posicao for posicao in range(1, len(aeroportos) + 1)))
+    por_aeronave, restantes = divmod(volumes["voos"], len(aeronaves))
+    for numero, (aeronave, lugares) in enumerate(aeronaves):
+        empresa = empresas[numero % len(empresas)]
+        local = gerador.choices(aeroportos, cum_weights=acumulado)[0]
+        momento = inicio + gerador.randrange(24 * 60)
+        for _ in range(por_aeronave + (numero < restantes)):
+            destino = local
+            while destino == local:
+                destino = gerador.choices(aeroportos, cum_weights=acumulado)[0]
+            duracao = min(900, max(40, int(gerador.lognormvariate(4.8, 0.5))))
+            saida, chegada = horarios.de_minutos(momento), horarios.de_minutos(momento + duracao)
+            natureza = gerador.choice(NATUREZAS)
+            passageiros = 0 if natureza == "Carga" else int(lugares * gerador.betavariate(8, 2))
+            yield (
+                saida[:10], saida[11:], local, destino, passageiros, lugares - passageiros,
+                round(gerador.uniform(500, 20000 if natureza == "Carga" else 5000), 1),
+                aeronave, chegada[:10], chegada[11:], natureza, empresa
+            )
+            # Tempo em solo entre um voo e o próximo da mesma aeronave.
+            momento += duracao + gerador.randrange(45, 240)
+            local = destino
+
+
+def voos_encadeados(gerador, aeronave, empresa, aeroportos, inicio, assentos=180):
+    """Gera indefinidamente voos de uma aeronave, cada um partindo de onde o anterior pousou."""
+    local, momento = gerador.choice(aeroportos), horarios.minutos(inicio)
+    while True:
+        destino = gerador.choice([codigo for codigo in aeroportos if codigo != local])
+        saida, chegada = horarios.de_minutos(momento), horarios.de_minutos(momento + 60)
+        passageiros = gerador.randint(0, assentos)
+        yield (
+            saida[:10], saida[11:], local, destino, passageiros, assentos - passageiros, 100.0,
+            aeronave, chegada[:10], chegada[11:], "Regular", empresa
+        )
+        momento += 60 + 45
+        local = destino
+
+
+def gerar(caminho, voos=10000, semente=1, aeroportos=None, aeronaves=None, empresas=None,
+          inicio="2024-01-01", perfil="padrao", esquema=conexoes.CAMINHO_BANCO):
+    """Preenche um banco com dados sintéticos determinísticos e retorna os volumes e tempos."""
+    if not os.path.exists(caminho):
+        criar_esquema(caminho, esquema)
+    volumes = escalas(voos, aeroportos, aeronaves, empresas)
+    gerador = random.Random(semente)
+    pool = conexoes.PoolConexoes(caminho, perfil=perfil)
+    migracoes.sincronizar(pool)
+    conexao = pool.adquirir()
+    tempos = {}
+    try:
+        existentes = {
+            classe.TABELA: conexao.execute(f'SELECT COUNT(*) FROM "{classe.TABELA}"').fetchone()[0]
+            for classe in (Aeronaves, Aeroportos, Empresas, Voos)
+        }
+        if any(existentes.values()):
+            raise ValueError(f"O banco {caminho} já tem dados: {existentes}")
+        for classe, linhas in (
+            (Aeroportos, _aeroportos(gerador, volumes["aeroportos"])),
+            (Empresas, _empresas(gerador, volumes["empresas"])),
+            (Aeronaves, list(_aeronaves(gerador, volumes["aeronaves"]))),
+        ):
+            inicio_tabela = time.perf_counter()
+            inserir(pool, conexao, classe, linhas)
+            tempos[classe.TABELA] = time.perf_counter() - inicio_tabela
+        codigos = {
+            classe.TABELA: conexao.execute(
+                f'SELECT {classe.CHAVE} FROM "{classe.TABELA}" ORDER BY {classe.CHAVE}'
+            ).fetchall()
+            for classe in (Aeroportos, Empresas)
+        }
+        aeronaves = conexao.execute(
+            f"SELECT {Aeronaves.CHAVE}, ASSENTOS_DISPONIVEIS FROM Aeronaves ORDER BY {Aeronaves.CHAVE}"
+        ).fetchall()
+        inicio_voos = time.perf_counter()
+        # Os gatilhos do resumo são removidos durante a carga; resumos.criar os recria e recalcula.
+        pool.transacao(conexao, lambda destino: [
+            destino.execute(f"DROP TRIGGER IF EXISTS {nome}")
+            for nome in ("TRG_RESUMO_INSERIR", "TRG_RESUMO_DELETAR", "TRG_RESUMO_ATUALIZAR")
+        ])
+        try:
+            inserir(pool, conexao, Voos, _voos(
+                gerador, volumes, [codigo for codigo, in codigos[Aeroportos.TABELA]], aeronaves,
+                [codigo for codigo, in codigos[Empresas.TABELA]], horarios.minutos(inicio)
+            ))
+        finally:
+            pool.transacao(conexao, lambda destino: resumos.criar(destino.cursor()))
+        tempos[Voos.TABELA] = time.perf_counter() - inicio_voos
+        conexao.execute("ANALYZE")
+    finally:
+        pool.liberar(conexao)
+        pool.fechar()
+    return {"semente": semente, "volumes": volumes, "segundos": tempos}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos determinísticos para as tabelas.")
+    parser.add_argument("banco", help="arquivo do banco; criado com o esquema de --esquema se não existir")
+    parser.add_argument("--voos", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--aeroportos", type=int)
+    parser.add_argument("--aeronaves", type=int)
+    parser.add_argument("--empresas", type=int)
+    parser.add_argument("--inicio", default="2024-01-01", help="data do primeiro voo")
+    parser.add_argument("--esquema", default=conexoes.CAMINHO_BANCO, help="banco de onde copiar as tabelas")
+    argumentos = parser.parse_args()
+    resultado = gerar(
+        argumentos.banco, argumentos.voos, argumentos.semente, argumentos.aeroportos,
+        argumentos.aeronaves, argumentos.empresas, argumentos.inicio, esquema=argumentos.esquema
+    )
+    print(resultado)
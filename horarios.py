@@ -0,0 +1,82 @@
+from datetime import date, datetime, time, timedelta
+
+FORMATO_DATA = "%Y-%m-%d"
+FORMATO_HORA = "%H:%M"
+# Formatos aceitos na entrada; as datas e horas são sempre gravadas em ISO-8601.
+FORMATOS_DATA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d", "%Y%m%d")
+FORMATOS_HORA = ("%H:%M", "%H:%M:%S", "%Hh%M", "%Hh", "%H%M", "%H")
+EPOCA = datetime(1970, 1, 1)
+
+
+def _converter(valor, formatos):
+    texto = str(valor).strip()
+    for formato in formatos:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            pass
+    raise ValueError(f"Valor fora dos formatos aceitos: {valor!r}")
+
+
+def data(valor):
+    """Normaliza uma data para AAAA-MM-DD."""
+    if isinstance(valor, (date, datetime)):
+        return valor.strftime(FORMATO_DATA)
+    return _converter(valor, FORMATOS_DATA).strftime(FORMATO_DATA)
+
+
+def hora(valor):
+    """Normaliza uma hora para HH:MM."""
+    if isinstance(valor, (time, datetime)):
+        return valor.strftime(FORMATO_HORA)
+    texto = str(valor).strip()
+    if texto.isascii() and texto.isdigit():
+        # Só dígitos, em texto ou INTEGER (que perde os zeros à esquerda): "7" e "12" são horas
+        # cheias; "930" e "0930" são HHMM; de 24 a 99 não dá para saber se são horas ou minutos.
+        if len(texto) <= 2:
+            if int(texto) >= 24:
+                raise ValueError(f"Hora ambígua: {valor!r}")
+            texto = f"{int(texto):02d}00"
+        elif len(texto) <= 4:
+            texto = texto.zfill(4)
+    return _converter(texto, FORMATOS_HORA).strftime(FORMATO_HORA)
+
+
+def instante(valor, fim_do_dia=False):
+    """Normaliza um instante para AAAA-MM-DDTHH:MM.
+
+    Uma data sozinha vale como 00:00, ou como 23:59 com fim_do_dia, para que o fim de uma
+    janela dado só pela data inclua o dia inteiro.
+    """
+    if isinstance(valor, datetime):
+        return valor.strftime(f"{FORMATO_DATA}T{FORMATO_HORA}")
+    horario = "23:59" if fim_do_dia else "00:00"
+    if isinstance(valor, date):
+        return f"{data(valor)}T{horario}"
+    texto = str(valor).strip()
+    for separador in ("T", " "):
+        if separador in texto:
+            dia, horario = texto.split(separador, 1)
+            return f"{data(dia)}T{hora(horario)}"
+    return f"{data(texto)}T{horario}"
+
+
+def separar(valor, fim_do_dia=False):
+    """Divide um instante normalizado em (data, hora)."""
+    dia, horario = instante(valor, fim_do_dia).split("T")
+    return dia, horario
+
+
+def minutos(valor):
+    """Converte um instante em minutos desde 1970-01-01 00:00."""
+    try:
+        # Caminho rápido para os instantes já gravados em ISO-8601.
+        momento = datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        momento = datetime.fromisoformat(instante(valor))
+    return (momento - EPOCA) // timedelta(minutes=1)
+
+
+def de_minutos(valor):
+    """Converte minutos desde 1970-01-01 00:00 em um instante AAAA-MM-DDTHH:MM."""
+    return instante(EPOCA + timedelta(minutes=valor))
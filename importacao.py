@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3 as sql
+import time
+import comandos
+import conexoes
+from classes import BancoDados, Aeronaves, Aeroportos, Empresas, Voos
+
+TABELAS = {"aeronaves": Aeronaves, "aeroportos": Aeroportos, "empresas": Empresas, "voos": Voos}
+ERROS_VALIDACAO = (ValueError, BancoDados.ValorNuloErro, BancoDados.ValorInvalidoErro)
+LIMITE_PARAMETROS = 500
+
+
+class RelatorioImportacao:
+    def __init__(self, tabela):
+        """Acumula os resultados de uma importação em massa."""
+        self.tabela = tabela
+        self.inseridas = 0
+        self.rejeitadas = []
+        self.lotes = 0
+        self.segundos = 0.0
+
+    def rejeitar(self, numero, motivo):
+        """Registra uma linha rejeitada e o motivo da rejeição."""
+        self.rejeitadas.append((numero, motivo))
+
+    @property
+    def linhas_por_segundo(self):
+        """Taxa de linhas inseridas por segundo."""
+        return self.inseridas / self.segundos if self.segundos else 0.0
+
+    def __str__(self):
+        linhas = [
+            f"Tabela: {self.tabela}",
+            f"Linhas inseridas: {self.inseridas} em {self.lotes} lote(s)",
+            f"Linhas rejeitadas: {len(self.rejeitadas)}",
+            f"Tempo: {self.segundos:.3f} s ({self.linhas_por_segundo:.0f} linhas/s)",
+        ]
+        linhas += [f"    Linha {numero}: {motivo}" for numero, motivo in self.rejeitadas]
+        return "\n".join(linhas)
+
+
+def ler_registros(caminho):
+    """Gera (número da linha, registro) a partir de um arquivo CSV, JSON Lines ou JSON."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        if extensao == ".csv":
+            for numero, registro in enumerate(csv.DictReader(arquivo), start=2):
+                yield numero, registro
+        elif extensao in (".jsonl", ".ndjson"):
+            for numero, linha in enumerate(arquivo, start=1):
+                if linha.strip():
+                    yield numero, json.loads(linha)
+        elif extensao == ".json":
+            # Um vetor JSON precisa ser lido por inteiro; prefira JSON Lines em arquivos grandes.
+            for numero, registro in enumerate(json.load(arquivo), start=1):
+                yield numero, registro
+        else:
+            raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+
+
+def _codigos_existentes(conexao, classe, codigos):
+    """Retorna quais dos códigos informados existem na tabela, em consultas IN agrupadas."""
+    codigos = list(codigos)
+    existentes = set()
+    for inicio in range(0, len(codigos), LIMITE_PARAMETROS):
+        parte = codigos[inicio:inicio + LIMITE_PARAMETROS]
+        existentes.update(linha[0] for linha in conexao.execute(
+            f'SELECT {classe.CHAVE} FROM "{classe.TABELA}" '
+            f'WHERE {classe.CHAVE} IN ({", ".join("?" * len(parte))})', parte
+        ))
+    return existentes
+
+
+def _validar_referencias(conexao, classe, lote, relatorio):
+    """Remove do lote as linhas cujas chaves estrangeiras não existem."""
+    referencias = getattr(classe, "REFERENCIAS", {})
+    if not referencias:
+        return lote
+    colunas = list(classe.CAMPOS)
+    for coluna, (referenciada, erro) in referencias.items():
+        posicao = colunas.index(coluna)
+        existentes = _codigos_existentes(conexao, referenciada, {valores[posicao] for _, valores in lote})
+        validas = []
+        for numero, valores in lote:
+            if valores[posicao] in existentes:
+                validas.append((numero, valores))
+            else:
+                relatorio.rejeitar(numero, f"{coluna}={valores[posicao]}: {erro}")
+        lote = validas
+    return lote
+
+
+def _gravar_verificando(pool, conexao, tabela, lote, relatorio):
+    """Insere o lote em ORDEM_VERIFICACAO, passando antes cada linha pela verificação da tabela.
+
+    Tudo ocorre em uma transação, e cada linha é comparada com as já gravadas e com as anteriores
+    do próprio lote, como faria criar linha a linha.
+    """
+    comando = comandos.inserir(tabela, tabela.CAMPOS)
+    colunas = list(tabela.CAMPOS)
+    posicoes = [colunas.index(coluna) for coluna in tabela.ORDEM_VERIFICACAO]
+    ordenado = sorted(lote, key=lambda item: [item[1][posicao] for posicao in posicoes])
+
+    def inserir(destino):
+        # As rejeições só valem depois do commit, pois a transação pode ser repetida em SQLITE_BUSY.
+        inseridas, rejeitadas = [], []
+        for numero, valores in ordenado:
+            try:
+                tabela.verificar(destino, dict(zip(colunas, valores)))
+                inseridas.append(destino.execute(comando, valores).lastrowid)
+            except (BancoDados.ValorInvalidoErro, sql.IntegrityError) as erro:
+                rejeitadas.append((numero, str(erro).replace("\n", "; ")))
+        return inseridas, rejeitadas
+    inseridas, rejeitadas = pool.transacao(conexao, inserir)
+    relatorio.inseridas += len(inseridas)
+    for numero, motivo in sorted(rejeitadas):
+        relatorio.rejeitar(numero, motivo)
+    return inseridas
+
+
+def _inserir_todas(destino, tabela, comando, linhas):
+    """Insere as linhas com executemany e retorna os códigos gerados."""
+    destino.executemany(comando, linhas)
+    # As linhas de um mesmo INSERT recebem códigos consecutivos acima de todos os existentes.
+    ultimo = destino.execute(f'SELECT MAX({tabela.CHAVE}) FROM "{tabela.TABELA}"').fetchone()[0]
+    return list(range(ultimo - len(linhas) + 1, ultimo + 1))
+
+
+def _gravar(pool, conexao, tabela, lote, relatorio):
+    """Insere um lote validado em uma única transação e avisa os ouvintes das linhas inseridas."""
+    lote = _validar_referencias(conexao, tabela, lote, relatorio)
+    if not lote:
+        return
+    if type(tabela).verificar is not BancoDados.verificar:
+        codigos = _gravar_verificando(pool, conexao, tabela, lote, relatorio)
+    else:
+        comando = comandos.inserir(tabela, tabela.CAMPOS)
+        try:
+            linhas = [valores for _, valores in lote]
+            codigos = pool.transacao(conexao, lambda destino: _inserir_todas(destino, tabela, comando, linhas))
+            relatorio.inseridas += len(lote)
+        except sql.IntegrityError:
+            # Refaz o lote linha a linha para isolar as linhas que violam o esquema.
+            codigos = []
+            for numero, valores in lote:
+                try:
+                    codigos.append(pool.transacao(conexao, lambda destino: destino.execute(comando, valores)).lastrowid)
+                    relatorio.inseridas += 1
+                except sql.IntegrityError as erro:
+                    relatorio.rejeitar(numero, str(erro))
+    if codigos:
+        tabela.notificar("criar", codigos)
+    relatorio.lotes += 1
+
+
+def importar(classe, caminho, tamanho_lote=1000, pool=None):
+    """Importa um arquivo para a tabela da classe em transações de tamanho_lote linhas."""
+    pool = pool or conexoes.pool
+    relatorio = RelatorioImportacao(classe.TABELA)
+    colunas = list(classe.CAMPOS)
+    inicio = time.perf_counter()
+    conexao = pool.adquirir()
+    tabela = classe(pool)
+    try:
+        lote = []
+        for numero, registro in ler_registros(caminho):
+            try:
+                valores = tuple(classe.validar(coluna, registro.get(coluna)) for coluna in colunas)
+            except ERROS_VALIDACAO as erro:
+                relatorio.rejeitar(numero, str(erro))
+                continue
+            lote.append((numero, valores))
+            if len(lote) >= tamanho_lote:
+                _gravar(pool, conexao, tabela, lote, relatorio)
+                lote = []
+        if lote:
+            _gravar(pool, conexao, tabela, lote, relatorio)
+    finally:
+        tabela.fechar()
+        pool.liberar(conexao)
+    relatorio.segundos = time.perf_counter() - inicio
+    return relatorio
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Importação em massa de arquivos CSV, JSON Lines ou JSON.")
+    parser.add_argument("tabela", choices=TABELAS)
+    parser.add_argument("arquivo")
+    parser.add_argument("--lote", type=int, default=1000, help="linhas por transação")
+    argumentos = parser.parse_args()
+    print(importar(TABELAS[argumentos.tabela], argumentos.arquivo, argumentos.lote))
@@ -0,0 +1,224 @@
+import argparse
+import itertools
+import json
+import os
+import sqlite3 as sql
+import tempfile
+import conexoes
+import resumos
+from classes import Aeronaves, Aeroportos, Empresas, Voos
+
+TABELAS = (Aeronaves, Aeroportos, Empresas, Voos)
+ACOES = ("RESTRICT", "CASCADE", "SET NULL")
+
+
+def politicas(classe):
+    """Retorna, para cada coluna de REFERENCIAS, a tabela e a chave referenciadas e a ação ao deletar."""
+    resultado = {}
+    for coluna, (referenciada, _) in classe.REFERENCIAS.items():
+        acao = classe.POLITICAS.get(coluna, "RESTRICT")
+        if acao not in ACOES:
+            raise ValueError(f"Ação {acao!r} inválida para {classe.TABELA}.{coluna}; use uma de {ACOES}.")
+        resultado[coluna] = (referenciada.TABELA, referenciada.CHAVE, acao)
+    return resultado
+
+
+def declaradas(cursor, tabela):
+    """Retorna as chaves estrangeiras declaradas no esquema da tabela, no formato de politicas."""
+    return {
+        coluna: (referenciada, chave, acao)
+        for _, _, referenciada, coluna, chave, _, acao, _ in cursor.execute(f'PRAGMA foreign_key_list("{tabela}")')
+    }
+
+
+def aplicar(cursor, classes=TABELAS):
+    """Reconstrói as tabelas cujas chaves estrangeiras declaradas diferem de POLITICAS e retorna quais mudaram.
+
+    Deve rodar com PRAGMA foreign_keys desligado, como nas migrações.
+    """
+    existentes = {nome for nome, in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    reconstruidas = []
+    for classe in classes:
+        if not classe.REFERENCIAS or classe.TABELA not in existentes:
+            continue
+        desejadas = politicas(classe)
+        if declaradas(cursor, classe.TABELA) != desejadas:
+            _reconstruir(cursor, classe.TABELA, desejadas)
+            reconstruidas.append(classe.TABELA)
+    return reconstruidas
+
+
+def aplicar_no_banco(caminho, classes=TABELAS):
+    """Abre o banco, desliga as chaves estrangeiras e aplica as políticas em uma única transação."""
+    conexao = sql.connect(caminho, isolation_level=None)
+    try:
+        conexao.execute("PRAGMA foreign_keys=OFF")
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            reconstruidas = aplicar(conexao.cursor(), classes)
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+    finally:
+        conexao.close()
+    return reconstruidas
+
+
+def conferir(caminho=conexoes.CAMINHO_BANCO, classes=TABELAS):
+    """Confere que o resumo de movimentos segue consistente sob cada combinação de ações.
+
+    As colunas que apontam para a mesma tabela (decolagem e destino, por exemplo) variam juntas,
+    pois uma delas em RESTRICT bloquearia a remoção. Para cada combinação, copia o banco (já
+    migrado), aplica as ações na cópia, deleta pela API uma linha referenciada que tenha dependentes
+    e roda resumos.verificar. Retorna, por tabela referenciada, as ações, se a remoção foi feita
+    e quantas linhas do resumo divergem de Voos.
+    """
+    resultado = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for classe in classes:
+            relacoes = {}
+            for coluna, (referenciada, _) in classe.REFERENCIAS.items():
+                relacoes.setdefault(referenciada, []).append(coluna)
+            for referenciada, colunas in relacoes.items():
+                for numero, acoes in enumerate(itertools.product(ACOES, repeat=len(colunas))):
+                    copia = os.path.join(pasta, f"{referenciada.TABELA}_{numero}.db")
+                    origem, destino = sql.connect(caminho), sql.connect(copia)
+                    try:
+                        origem.backup(destino)
+                    finally:
+                        origem.close()
+                        destino.close()
+                    originais = classe.POLITICAS
+                    classe.POLITICAS = originais | dict(zip(colunas, acoes))
+                    pool = conexoes.PoolConexoes(copia)
+                    try:
+                        aplicar_no_banco(copia, (classe,))
+                        with referenciada(pool) as tabela:
+                            codigo = tabela.conexao.execute(
+                                f'SELECT {colunas[0]} FROM "{classe.TABELA}" WHERE {colunas[0]} IS NOT NULL LIMIT 1'
+                            ).fetchone()
+                            removida = False
+                            if codigo is not None:
+                                try:
+                                    removida = bool(tabela.remover(codigo[0]))
+                                except tabela.ValorInvalidoErro:
+                                    pass
+                        divergencias = resumos.verificar(pool)
+                    finally:
+                        classe.POLITICAS = originais
+                        pool.fechar()
+                    resultado.setdefault(referenciada.TABELA, []).append({
+                        "politicas": {f"{classe.TABELA}.{coluna}": acao for coluna, acao in zip(colunas, acoes)},
+                        "removida": removida,
+                        "divergencias": sum(len(linhas) for linhas in divergencias.values()),
+                    })
+    return resultado
+
+
+def _reconstruir(cursor, tabela, desejadas):
+    """Recria a tabela com as novas chaves estrangeiras, preservando linhas, índices, gatilhos e a sequência."""
+    # O SQLite não altera chaves estrangeiras no lugar; a tabela é copiada para uma nova definição.
+    original = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()[0]
+    definicoes = []
+    for _, nome, tipo, obrigatoria, padrao, chave in cursor.execute(f'PRAGMA table_info("{tabela}")').fetchall():
+        definicao = f'"{nome}" {tipo}'.rstrip()
+        if chave:
+            definicao += " PRIMARY KEY AUTOINCREMENT" if "AUTOINCREMENT" in original.upper() else " PRIMARY KEY"
+        elif obrigatoria and desejadas.get(nome, (None, None, None))[2] != "SET NULL":
+            # Colunas com SET NULL precisam aceitar nulos.
+            definicao += " NOT NULL"
+        if padrao is not None:
+            definicao += f" DEFAULT {padrao}"
+        definicoes.append(definicao)
+    for coluna, (referenciada, chave, acao) in desejadas.items():
+        definicoes.append(
+            f'FOREIGN KEY("{coluna}") REFERENCES "{referenciada}"("{chave}") ON DELETE {acao}'
+        )
+    # Gatilhos de outras tabelas que citam esta (como os do resumo em Aeronaves) impediriam a
+    # renomeação da cópia; eles saem antes e voltam junto com os da própria tabela.
+    objetos = cursor.execute(
+        "SELECT name, tbl_name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL "
+        "AND (tbl_name = ? OR (type = 'trigger' AND instr(sql, ?) > 0))",
+        (tabela, tabela)
+    ).fetchall()
+    for nome, dona, _ in objetos:
+        if dona != tabela:
+            cursor.execute(f'DROP TRIGGER "{nome}"')
+    sequencia = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (tabela,)).fetchone() \
+        if "AUTOINCREMENT" in original.upper() else None
+    nova = f"{tabela}_nova"
+    cursor.execute(f'CREATE TABLE "{nova}" (\n\t' + ",\n\t".join(definicoes) + "\n)")
+    cursor.execute(f'INSERT INTO "{nova}" SELECT * FROM "{tabela}"')
+    cursor.execute(f'DROP TABLE "{tabela}"')
+    cursor.execute(f'ALTER TABLE "{nova}" RENAME TO "{tabela}"')
+    for _, _, comando in objetos:
+        cursor.execute(comando)
+    if sequencia is not None:
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequencia[0], tabela))
+
+
+def orfaos(caminho=conexoes.CAMINHO_BANCO, amostras=10, classes=TABELAS):
+    """Procura, em uma única passada por tabela, as linhas cujas chaves estrangeiras não existem.
+
+    Abre o banco somente para leitura e não depende de PRAGMA foreign_keys nem do esquema
+    declarado: as relações vêm de REFERENCIAS.
+    """
+    conexao = sql.connect(f"file:{caminho}?mode=ro", uri=True)
+    resultado = {}
+    try:
+        existentes = {nome for nome, in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for classe in classes:
+            if not classe.REFERENCIAS or classe.TABELA not in existentes:
+                continue
+            juncoes, testes = [], []
+            for numero, (coluna, (referenciada, _)) in enumerate(classe.REFERENCIAS.items()):
+                if referenciada.TABELA in existentes:
+                    juncoes.append(
+                        f'LEFT JOIN "{referenciada.TABELA}" AS P{numero} '
+                        f"ON P{numero}.{referenciada.CHAVE} = F.{coluna}"
+                    )
+                    testes.append(f"F.{coluna} IS NOT NULL AND P{numero}.{referenciada.CHAVE} IS NULL")
+                else:
+                    # Sem a tabela referenciada, todo valor preenchido é órfão.
+                    testes.append(f"F.{coluna} IS NOT NULL")
+            comando = (
+                f'SELECT F.{classe.CHAVE}, {", ".join(f"({teste})" for teste in testes)} '
+                f'FROM "{classe.TABELA}" AS F {" ".join(juncoes)} '
+                f'WHERE {" OR ".join(f"({teste})" for teste in testes)}'
+            )
+            relacoes = {
+                coluna: {"referencia": referenciada.TABELA, "orfaos": 0, "exemplos": []}
+                for coluna, (referenciada, _) in classe.REFERENCIAS.items()
+            }
+            for codigo, *marcas in conexao.execute(comando):
+                for relacao, orfa in zip(relacoes.values(), marcas):
+                    if orfa:
+                        relacao["orfaos"] += 1
+                        if len(relacao["exemplos"]) < amostras:
+                            relacao["exemplos"].append(codigo)
+            resultado[classe.TABELA] = relacoes
+    finally:
+        conexao.close()
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Verifica e aplica a integridade referencial das tabelas.")
+    parser.add_argument("banco", nargs="?", default=conexoes.CAMINHO_BANCO)
+    parser.add_argument("--amostras", type=int, default=10, help="códigos de exemplo por relação")
+    parser.add_argument("--aplicar", action="store_true", help="reconstrói as tabelas segundo POLITICAS")
+    parser.add_argument(
+        "--conferir", action="store_true", help="confere o resumo de movimentos sob cada ação, em cópias do banco"
+    )
+    argumentos = parser.parse_args()
+    if argumentos.aplicar:
+        print("Tabelas reconstruídas:", aplicar_no_banco(argumentos.banco) or "nenhuma")
+    if argumentos.conferir:
+        conferencia = conferir(argumentos.banco)
+        print(json.dumps(conferencia, indent=4, ensure_ascii=False))
+        if any(caso["divergencias"] for casos in conferencia.values() for caso in casos):
+            raise SystemExit("O resumo de movimentos divergiu de Voos em alguma política.")
+    print(json.dumps(orfaos(argumentos.banco, argumentos.amostras), indent=4, ensure_ascii=False))
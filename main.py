@@ -1,166 +1,87 @@
-from classes import Aeronaves, Aeroportos, Empresas, Voos
+from classes import BancoDados, Aeronaves, Aeroportos, Empresas, Voos
 from funcoes import *
+import argparse
+import sqlite3 as sql
+import cache
+import conexoes
+import esquema
+import medicoes
+import migracoes
 
+OPERACOES = [
+    ("Registrar", "registrar"), ("Atualizar", "atualizar"), ("Deletar", "deletar"),
+    ("Atualizar em lote", "atualizar_lote"), ("Deletar em lote", "deletar_lote")
+]
 
-def voos():
-    tabela = Voos()
-    menu = {"1": tabela.registrar, "2": tabela.atualizar, "3": tabela.deletar, "4": main}
-    print("Menu de Voos:\n"
-          "[1] - Registrar\n"
-          "[2] - Atualizar\n"
-          "[3] - Deletar\n"
-          "[4] - Voltar")
-    escolha = input(">> ")
-    print()
-    if escolha not in menu.keys():
-        print("Escolha inválida.")
-        continuar()
-        voos()
-    elif escolha == "4":
-        return main()
-    else:
-        try:
-            return menu.get(escolha)()
-        except ValueError as erro:
-            print("\n", erro)
-            continuar()
-            return voos()
-        except tabela.ValorNuloErro as erro:
-            print("\n", erro)
-            continuar()
-            return voos()
-        except tabela.ValorInvalidoErro as erro:
-            print("\n", erro)
-            continuar()
-            return voos()
-        except tabela.CancelarErro:
-            return voos()
+# Cada estado do menu é (título, opções); uma opção é (rótulo, próximo estado ou método da tabela).
+MENUS = {
+    "principal": ("Menu Principal", [
+        ("Aeronaves", "aeronaves"), ("Aeroportos", "aeroportos"), ("Empresas", "empresas"),
+        ("Voos", "voos"), ("Sair", None)
+    ]),
+    "aeronaves": ("Menu de Aeronaves", OPERACOES + [("Voltar", "principal")]),
+    "aeroportos": ("Menu de Aeroportos", OPERACOES + [("Voltar", "principal")]),
+    "empresas": ("Menu de Empresas", OPERACOES + [("Voltar", "principal")]),
+    "voos": ("Menu de Voos", OPERACOES + [
+        ("Relatório de Aeroporto", "relatorio_aeroporto"), ("Voltar", "principal")
+    ]),
+}
+TABELAS = {"aeronaves": Aeronaves, "aeroportos": Aeroportos, "empresas": Empresas, "voos": Voos}
 
 
-def empresas():
-    tabela = Empresas()
-    menu = {"1": tabela.registrar, "2": tabela.atualizar, "3": tabela.deletar, "4": main}
-    print("Menu de Empresas:\n"
-          "[1] - Registrar\n"
-          "[2] - Atualizar\n"
-          "[3] - Deletar\n"
-          "[4] - Voltar")
+def passo(estado, tabelas):
+    """Exibe o menu do estado atual, executa a escolha e retorna o próximo estado."""
+    titulo, opcoes = MENUS[estado]
+    print(f"{titulo}:", *(f"[{numero}] - {rotulo}" for numero, (rotulo, _) in enumerate(opcoes, 1)), sep="\n")
     escolha = input(">> ")
     print()
-    if escolha not in menu.keys():
+    if not escolha.isdigit() or not 1 <= int(escolha) <= len(opcoes):
         print("Escolha inválida.")
         continuar()
-        empresas()
-    elif escolha == "4":
-        return main()
-    else:
-        try:
-            return menu.get(escolha)()
-        except ValueError as erro:
-            print("\n", erro)
-            continuar()
-            return empresas()
-        except tabela.ValorNuloErro as erro:
-            print("\n", erro)
-            continuar()
-            return empresas()
-        except tabela.ValorInvalidoErro as erro:
-            print("\n", erro)
-            continuar()
-            return empresas()
-        except tabela.CancelarErro:
-            return empresas()
-
-
-def aeroportos():
-    tabela = Aeroportos()
-    menu = {"1": tabela.registrar, "2": tabela.atualizar, "3": tabela.deletar, "4": main}
-    print("Menu de Aeroportos:\n"
-          "[1] - Registrar\n"
-          "[2] - Atualizar\n"
-          "[3] - Deletar\n"
-          "[4] - Voltar")
-    escolha = input(">> ")
-    print()
-    if escolha not in menu.keys():
-        print("Escolha inválida.")
+        return estado
+    destino = opcoes[int(escolha) - 1][1]
+    if destino is None or destino in MENUS:
+        return destino
+    if estado not in tabelas:
+        tabelas[estado] = TABELAS[estado]()
+    try:
+        getattr(tabelas[estado], destino)()
+    except (ValueError, BancoDados.ValorNuloErro, BancoDados.ValorInvalidoErro, esquema.EsquemaErro, sql.Error) as erro:
+        print("\n", erro)
         continuar()
-        aeroportos()
-    elif escolha == "4":
-        return main()
-    else:
-        try:
-            return menu.get(escolha)()
-        except ValueError as erro:
-            print("\n", erro)
-            continuar()
-            return aeroportos()
-        except tabela.ValorNuloErro as erro:
-            print("\n", erro)
-            continuar()
-            return aeroportos()
-        except tabela.ValorInvalidoErro as erro:
-            print("\n", erro)
-            continuar()
-            return aeroportos()
-        except tabela.CancelarErro:
-            return aeroportos()
+    except BancoDados.CancelarErro:
+        pass
+    return estado
 
 
-def aeronaves():
-    tabela = Aeronaves()
-    menu = {"1": tabela.registrar, "2": tabela.atualizar, "3": tabela.deletar, "4": main}
-    print("Menu de Aeronaves:\n"
-          "[1] - Registrar\n"
-          "[2] - Atualizar\n"
-          "[3] - Deletar\n"
-          "[4] - Voltar")
-    escolha = input(">> ")
-    print()
-    if escolha not in menu.keys():
-        print("Escolha inválida.")
-        continuar()
-        aeronaves()
-    elif escolha == "4":
-        return main()
-    else:
-        try:
-            return menu.get(escolha)()
-        except ValueError as erro:
-            print("\n", erro)
-            continuar()
-            return aeronaves()
-        except tabela.ValorNuloErro as erro:
-            print("\n", erro)
-            continuar()
-            return aeronaves()
-        except tabela.ValorInvalidoErro as erro:
-            print("\n", erro)
-            continuar()
-            return aeronaves()
-        except tabela.CancelarErro:
-            return aeronaves()
-
-
-def main():
-    menu = {"1": aeronaves, "2": aeroportos, "3": empresas, "4": voos, "5": None}
-    print("Menu Principal:\n"
-          "[1] - Aeronaves\n"
-          "[2] - Aeroportos\n"
-          "[3] - Empresas\n"
-          "[4] - Voos\n"
-          "[5] - Sair")
-    escolha = input(">> ")
-    print()
-    if escolha not in menu.keys():
-        print("Escolha inválida.")
-        continuar()
-        main()
-    elif escolha == "5":
-        return None
-    else:
-        return menu.get(escolha)()
+def main(estado="principal"):
+    tabelas = {}
+    try:
+        while estado is not None:
+            estado = passo(estado, tabelas)
+    finally:
+        for tabela in tabelas.values():
+            tabela.fechar()
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Menu interativo das tabelas do aeroporto.")
+    parser.add_argument("--profile", metavar="ARQUIVO", help="mede os comandos SQL e grava as estatísticas ao sair")
+    parser.add_argument("--formato", choices=medicoes.FORMATOS, default="json", help="formato do arquivo de --profile")
+    parser.add_argument("--lentas", type=float, metavar="MS", help="registra os comandos que levarem MS ou mais")
+    parser.add_argument("--arquivo-lentas", default="consultas_lentas.log")
+    argumentos = parser.parse_args()
+    medidor = None
+    if argumentos.profile or argumentos.lentas is not None:
+        medidor = medicoes.ativar(
+            conexoes.pool, lentas=None if argumentos.lentas is None else argumentos.lentas / 1000,
+            arquivo_lentas=argumentos.arquivo_lentas
+        )
+    try:
+        migracoes.sincronizar()
+        cache.ativar(conexoes.pool, distribuido=True)
+        main()
+    finally:
+        conexoes.pool.fechar()
+        if argumentos.profile:
+            medidor.exportar(argumentos.profile, argumentos.formato)
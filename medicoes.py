@@ -0,0 +1,282 @@
+import bisect
+import json
+import re
+import sqlite3 as sql
+import threading
+import time
+
+# Limites superiores, em segundos, das faixas dos histogramas de latência.
+FAIXAS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+FORMATOS = ("json", "prometheus")
+LIMITE_NORMALIZADOS = 4096
+
+_TEXTOS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.IGNORECASE)
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar(comando):
+    """Reduz um comando SQL à sua forma com literais trocados por ? e espaços colapsados."""
+    comando = _TEXTOS.sub("?", comando)
+    comando = _NUMEROS.sub("?", comando)
+    # Listas de IN com tamanhos diferentes contam como o mesmo comando.
+    comando = _LISTAS.sub("(?, ...)", comando)
+    return _ESPACOS.sub(" ", comando).strip()
+
+
+class Histograma:
+    def __init__(self):
+        """Contagem de observações por faixa de latência, com soma, máximo e linhas."""
+        self.contagens = [0] * (len(FAIXAS) + 1)
+        self.chamadas = 0
+        self.segundos = 0.0
+        self.maximo = 0.0
+        self.linhas = 0
+
+    def observar(self, segundos, linhas=0):
+        """Registra uma observação de duração e de linhas."""
+        self.contagens[bisect.bisect_left(FAIXAS, segundos)] += 1
+        self.chamadas += 1
+        self.segundos += segundos
+        self.maximo = max(self.maximo, segundos)
+        self.linhas += linhas
+
+    def resumo(self):
+        """Retorna os totais e as contagens acumuladas por faixa."""
+        acumuladas, total = {}, 0
+        for limite, contagem in zip((*FAIXAS, "+Inf"), self.contagens):
+            total += contagem
+            acumuladas[str(limite)] = total
+        return {
+            "chamadas": self.chamadas,
+            "segundos": self.segundos,
+            "medio_ms": self.segundos / self.chamadas * 1000 if self.chamadas else 0.0,
+            "maximo_ms": self.maximo * 1000,
+            "linhas": self.linhas,
+            "faixas": acumuladas,
+        }
+
+
+class Medidor:
+    def __init__(self, lentas=None, arquivo_lentas="consultas_lentas.log"):
+        """Coleta latências por comando SQL normalizado e durações de commit das conexões do pool."""
+        self.lentas = lentas
+        self.arquivo_lentas = arquivo_lentas
+        self.__trava = threading.Lock()
+        self.__comandos = {}
+        self.__commits = Histograma()
+        self.__normalizados = {}
+
+    def conectar(self, *argumentos, **opcoes):
+        """Abre uma conexão SQLite cujos comandos e commits são medidos por este medidor."""
+        conexao = sql.connect(*argumentos, factory=ConexaoMedida, **opcoes)
+        conexao.medidor = self
+        return conexao
+
+    def observar(self, comando, segundos, linhas=0):
+        """Registra a execução de um comando, incluindo a leitura das suas linhas."""
+        # Os comandos das classes são montados sempre iguais; normalizar cada um só uma vez basta.
+        normalizado = self.__normalizados.get(comando)
+        if normalizado is None:
+            if len(self.__normalizados) >= LIMITE_NORMALIZADOS:
+                self.__normalizados.clear()
+            normalizado = self.__normalizados.setdefault(comando, normalizar(comando))
+        with self.__trava:
+            histograma = self.__comandos.get(normalizado)
+            if histograma is None:
+                histograma = self.__comandos[normalizado] = Histograma()
+            histograma.observar(segundos, linhas)
+        if self.lentas is not None and segundos >= self.lentas:
+            self.__registrar_lenta(normalizado, segundos, linhas)
+
+    def observar_commit(self, segundos):
+        """Registra a duração de um commit."""
+        with self.__trava:
+            self.__commits.observar(segundos)
+
+    def __registrar_lenta(self, normalizado, segundos, linhas):
+        linha = f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{segundos * 1000:.3f} ms\t{linhas} linhas\t{normalizado}\n"
+        with self.__trava:
+            with open(self.arquivo_lentas, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linha)
+
+    def estatisticas(self):
+        """Retorna os histogramas por comando, do mais demorado no total ao menos, e o dos commits."""
+        with self.__trava:
+            comandos = sorted(self.__comandos.items(), key=lambda item: item[1].segundos, reverse=True)
+            return {
+                "comandos": {comando: histograma.resumo() for comando, histograma in comandos},
+                "commits": self.__commits.resumo(),
+            }
+
+    def limpar(self):
+        """Descarta as medições coletadas."""
+        with self.__trava:
+            self.__comandos.clear()
+            self.__commits = Histograma()
+
+    def prometheus(self):
+        """Retorna as estatísticas no formato de texto do Prometheus."""
+        estatisticas = self.estatisticas()
+        linhas = [
+            "# HELP crud_sql_duracao_segundos Duração dos comandos SQL, incluindo a leitura das linhas.",
+            "# TYPE crud_sql_duracao_segundos histogram",
+        ]
+        for comando, resumo in estatisticas["comandos"].items():
+            linhas.extend(_histograma("crud_sql_duracao_segundos", resumo, f'comando="{_rotulo(comando)}"'))
+        linhas.extend([
+            "# HELP crud_sql_linhas_total Linhas lidas ou alteradas pelos comandos SQL.",
+            "# TYPE crud_sql_linhas_total counter",
+        ])
+        for comando, resumo in estatisticas["comandos"].items():
+            linhas.append(f'crud_sql_linhas_total{{comando="{_rotulo(comando)}"}} {resumo["linhas"]}')
+        linhas.extend([
+            "# HELP crud_commit_duracao_segundos Duração dos commits.",
+            "# TYPE crud_commit_duracao_segundos histogram",
+            *_histograma("crud_commit_duracao_segundos", estatisticas["commits"]),
+        ])
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho, formato="json"):
+        """Grava as estatísticas em um arquivo, em JSON ou no formato de texto do Prometheus."""
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato {formato!r} não suportado; use um de {FORMATOS}.")
+        conteudo = self.prometheus() if formato == "prometheus" else json.dumps(
+            self.estatisticas(), indent=4, ensure_ascii=False
+        ) + "\n"
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+
+
+def _rotulo(valor):
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histograma(nome, resumo, rotulos=""):
+    separador = "," if rotulos else ""
+    for limite, contagem in resumo["faixas"].items():
+        yield f'{nome}_bucket{{{rotulos}{separador}le="{limite}"}} {contagem}'
+    sufixo = f"{{{rotulos}}}" if rotulos else ""
+    yield f"{nome}_sum{sufixo} {resumo['segundos']}"
+    yield f"{nome}_count{sufixo} {resumo['chamadas']}"
+
+
+class CursorMedido(sql.Cursor):
+    """Cursor que mede cada comando desde a execução até a última linha lida."""
+
+    __pendente = None
+
+    def execute(self, comando, parametros=()):
+        self.__concluir()
+        inicio = time.perf_counter()
+        try:
+            return super().execute(comando, parametros)
+        finally:
+            self.__pendente = [comando, time.perf_counter() - inicio, 0]
+
+    def executemany(self, comando, parametros):
+        self.__concluir()
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(comando, parametros)
+        finally:
+            self.__pendente = [comando, time.perf_counter() - inicio, 0]
+            self.__concluir()
+
+    def executescript(self, script):
+        self.__concluir()
+        inicio = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            self.__pendente = [script, time.perf_counter() - inicio, 0]
+            self.__concluir()
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self.__ler(inicio, linha is not None, linha is None)
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self.__ler(inicio, len(linhas), not linhas)
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self.__ler(inicio, len(linhas), True)
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self.__ler(inicio, 0, True)
+            raise
+        self.__ler(inicio, 1, False)
+        return linha
+
+    def close(self):
+        self.__concluir()
+        super().close()
+
+    def __del__(self):
+        self.__concluir()
+
+    def __ler(self, inicio, linhas, fim):
+        pendente = self.__pendente
+        if pendente is not None:
+            pendente[1] += time.perf_counter() - inicio
+            pendente[2] += linhas
+            if fim:
+                self.__concluir()
+
+    def __concluir(self):
+        pendente = self.__pendente
+        if pendente is None:
+            return
+        self.__pendente = None
+        comando, segundos, linhas = pendente
+        # Nas escritas, rowcount é o número de linhas alteradas; nas leituras, vale -1.
+        linhas = linhas or max(getattr(self, "rowcount", -1), 0)
+        self.connection.medidor.observar(comando, segundos, linhas)
+
+
+class ConexaoMedida(sql.Connection):
+    """Conexão cujos cursores são medidos e cujos commits têm a duração registrada."""
+
+    def cursor(self, factory=CursorMedido):
+        return super().cursor(factory)
+
+    # Connection.execute cria um cursor comum; os atalhos passam pelo cursor medido.
+    def execute(self, comando, parametros=()):
+        return self.cursor().execute(comando, parametros)
+
+    def executemany(self, comando, parametros):
+        return self.cursor().executemany(comando, parametros)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def commit(self):
+        inicio = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            self.medidor.observar_commit(time.perf_counter() - inicio)
+
+
+def ativar(pool, **opcoes):
+    """Liga a medição no pool; as conexões abertas a partir daqui são medidas."""
+    pool.medidor = Medidor(**opcoes)
+    return pool.medidor
+
+
+def desativar(pool):
+    """Desliga a medição das novas conexões do pool."""
+    pool.medidor = None
@@ -0,0 +1,286 @@
+import time
+import busca
+import cache
+import conexoes
+import esquema
+import horarios
+import integridade
+import resumos
+from classes import Aeronaves, Aeroportos, Empresas, Voos
+
+MIGRACOES = []
+TABELAS = (Aeronaves, Aeroportos, Empresas, Voos)
+TIPOS_SQL = {int: "INTEGER", float: "REAL"}
+
+
+def migracao(versao, descricao):
+    """Registra uma função como a migração de uma versão do esquema."""
+    def registrar(funcao):
+        MIGRACOES.append((versao, descricao, funcao))
+        MIGRACOES.sort(key=lambda item: item[0])
+        return funcao
+    return registrar
+
+
+def versao_atual(conexao):
+    """Retorna a última versão de migração aplicada ao banco de dados."""
+    conexao.execute(
+        "CREATE TABLE IF NOT EXISTS Migracoes("
+        "VERSAO INTEGER PRIMARY KEY, DESCRICAO TEXT NOT NULL, APLICADA_EM TEXT NOT NULL)"
+    )
+    versao = conexao.execute("SELECT MAX(VERSAO) FROM Migracoes").fetchone()[0]
+    return versao or 0
+
+
+def migrar(pool=None):
+    """Aplica, em ordem e uma única vez, as migrações pendentes do esquema."""
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    aplicadas = []
+    try:
+        atual = versao_atual(conexao)
+        conexao.commit()
+        # Reconstruir tabelas exige as chaves estrangeiras desligadas; o pragma não muda dentro de transações.
+        conexao.execute("PRAGMA foreign_keys=OFF")
+        for versao, descricao, funcao in MIGRACOES:
+            if versao <= atual:
+                continue
+            cursor = conexao.cursor()
+            try:
+                cursor.execute("BEGIN")
+                funcao(cursor)
+                cursor.execute(
+                    "INSERT INTO Migracoes(VERSAO, DESCRICAO, APLICADA_EM) VALUES(?, ?, ?)",
+                    (versao, descricao, time.strftime("%Y-%m-%d %H:%M:%S"))
+                )
+                conexao.commit()
+            except Exception:
+                conexao.rollback()
+                raise
+            finally:
+                cursor.close()
+            aplicadas.append(versao)
+    finally:
+        conexao.execute(f"PRAGMA foreign_keys={pool.perfil.get('foreign_keys', 'OFF')}")
+        pool.liberar(conexao)
+    return aplicadas
+
+
+@migracao(1, "Índices das chaves estrangeiras e da data de saída de Voos")
+def _indices_voos(cursor):
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS IDX_VOOS_DECOLAGEM ON Voos(COD_AEROPORTO_DECOLAGEM, DATA_SAIDA)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS IDX_VOOS_DESTINO ON Voos(COD_AEROPORTO_DESTINO, DATA_CHEGADA)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_VOOS_AERONAVE ON Voos(COD_AERONAVE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_VOOS_EMPRESA ON Voos(COD_EMPRESA)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_VOOS_DATA_SAIDA ON Voos(DATA_SAIDA)")
+
+
+@migracao(2, "Índice da data de chegada de Voos")
+def _indice_chegada(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_VOOS_DATA_CHEGADA ON Voos(DATA_CHEGADA)")
+
+
+@migracao(3, "Tabela de resumo de movimentos mantida por gatilhos")
+def _resumo_movimentos(cursor):
+    resumos.criar(cursor)
+
+
+def _normalizar(funcao, valor):
+    try:
+        return funcao(valor)
+    except (TypeError, ValueError):
+        return valor
+
+
+@migracao(4, "Datas e horas de Voos em ISO-8601 e índices por data e hora")
+def _horarios_voos(cursor):
+    # Valores que não se encaixam em nenhum formato conhecido são mantidos como estão.
+    linhas = cursor.execute(
+        "SELECT COD_VOO, DATA_SAIDA, HORA_SAIDA, DATA_CHEGADA, HORA_CHEGADA FROM Voos"
+    ).fetchall()
+    alteradas = []
+    for codigo, *valores in linhas:
+        normalizados = [
+            _normalizar(funcao, valor)
+            for funcao, valor in zip((horarios.data, horarios.hora) * 2, valores)
+        ]
+        if normalizados != valores:
+            alteradas.append((*normalizados, codigo))
+    cursor.executemany(
+        "UPDATE Voos SET DATA_SAIDA=?, HORA_SAIDA=?, DATA_CHEGADA=?, HORA_CHEGADA=? WHERE COD_VOO=?",
+        alteradas
+    )
+    for indice, colunas in (
+        ("IDX_VOOS_DECOLAGEM", "COD_AEROPORTO_DECOLAGEM, DATA_SAIDA, HORA_SAIDA"),
+        ("IDX_VOOS_DESTINO", "COD_AEROPORTO_DESTINO, DATA_CHEGADA, HORA_CHEGADA"),
+        ("IDX_VOOS_DATA_SAIDA", "DATA_SAIDA, HORA_SAIDA"),
+        ("IDX_VOOS_DATA_CHEGADA", "DATA_CHEGADA, HORA_CHEGADA"),
+    ):
+        cursor.execute(f"DROP INDEX IF EXISTS {indice}")
+        cursor.execute(f"CREATE INDEX {indice} ON Voos({colunas})")
+
+
+@migracao(5, "Índice da agenda de cada aeronave em Voos")
+def _indice_agenda(cursor):
+    cursor.execute("DROP INDEX IF EXISTS IDX_VOOS_AERONAVE")
+    cursor.execute("CREATE INDEX IDX_VOOS_AERONAVE ON Voos(COD_AERONAVE, DATA_SAIDA, HORA_SAIDA)")
+
+
+@migracao(6, "Versões das tabelas de consulta para invalidar caches de outros processos")
+def _versoes_tabelas(cursor):
+    cache.criar_gatilhos(cursor)
+
+
+@migracao(7, "Índices de busca textual de aeroportos, empresas e modelos de aeronave")
+def _indices_busca(cursor):
+    for classe in (Aeroportos, Empresas, Aeronaves):
+        busca.criar(cursor, classe.TABELA, classe.CHAVE, classe.BUSCA)
+
+
+@migracao(8, "Chaves estrangeiras de Voos com as ações de POLITICAS ao deletar")
+def _politicas_integridade(cursor):
+    integridade.aplicar(cursor)
+
+
+@migracao(9, "Empresas Aéreas renomeada ou incorporada a Empresas, com gatilhos de versão e índice de busca")
+def _empresas_aereas(cursor):
+    existentes = {nome for nome, in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    colunas = ", ".join((Empresas.CHAVE, *Empresas.CAMPOS))
+    for antigo in Empresas.NOMES_ANTIGOS:
+        if antigo not in existentes:
+            continue
+        if Empresas.TABELA not in existentes:
+            # A renomeação também atualiza as chaves estrangeiras que apontavam para o nome antigo.
+            cursor.execute(f'ALTER TABLE "{antigo}" RENAME TO "{Empresas.TABELA}"')
+            existentes.add(Empresas.TABELA)
+            continue
+        cursor.execute(
+            f'INSERT OR IGNORE INTO "{Empresas.TABELA}"({colunas}) SELECT {colunas} FROM "{antigo}"'
+        )
+        # Linhas de mesmo código e conteúdo diferente ficam na tabela antiga para conferência.
+        divergentes = cursor.execute(
+            f'SELECT COUNT(*) FROM (SELECT {colunas} FROM "{antigo}" EXCEPT SELECT {colunas} FROM "{Empresas.TABELA}")'
+        ).fetchone()[0]
+        if not divergentes:
+            cursor.execute(f'DROP TABLE "{antigo}"')
+    if Empresas.TABELA in existentes:
+        cache.criar_gatilhos(cursor, (Empresas.TABELA,))
+        busca.criar(cursor, Empresas.TABELA, Empresas.CHAVE, Empresas.BUSCA)
+
+
+@migracao(10, "Resumo de movimentos com chaves anuladas e ocupação ajustada ao alterar ou deletar aeronaves")
+def _resumo_politicas(cursor):
+    resumos.criar(cursor)
+
+
+@migracao(11, "Índice de aeroporto do resumo cobrindo os totais usados pelo relatório de movimento")
+def _indice_relatorio(cursor):
+    resumos.criar_indices(cursor)
+
+
+@migracao(12, "Índice de período do resumo para o relatório de todos os aeroportos")
+def _indice_periodo(cursor):
+    resumos.criar_indices(cursor)
+
+
+@migracao(13, "Versões por linha das tabelas de consulta para invalidar só as linhas alteradas em outros processos")
+def _versoes_linhas(cursor):
+    cache.criar_gatilhos(cursor)
+
+
+def definicao(classe):
+    """Monta o CREATE TABLE da classe a partir de CHAVE, CAMPOS, REFERENCIAS e POLITICAS."""
+    politicas = integridade.politicas(classe)
+    definicoes = [f'"{classe.CHAVE}" INTEGER PRIMARY KEY AUTOINCREMENT']
+    for coluna, (tipo, *_) in classe.CAMPOS.items():
+        # Colunas com SET NULL precisam aceitar nulos.
+        nula = coluna in politicas and politicas[coluna][2] == "SET NULL"
+        definicoes.append(f'"{coluna}" {TIPOS_SQL.get(tipo, "TEXT")}{"" if nula else " NOT NULL"}')
+    for coluna, (referenciada, chave, acao) in politicas.items():
+        definicoes.append(f'FOREIGN KEY("{coluna}") REFERENCES "{referenciada}"("{chave}") ON DELETE {acao}')
+    return f'CREATE TABLE "{classe.TABELA}" (\n\t' + ",\n\t".join(definicoes) + "\n)"
+
+
+def sincronizar(pool=None, classes=TABELAS):
+    """Confere o modelo das classes contra sqlite_master, cria o que faltar e aplica as migrações.
+
+    Tabelas ausentes, sem um dos NOMES_ANTIGOS no banco, são criadas pelo modelo; as renomeações
+    ficam com as migrações. Depois delas, colunas ausentes são acrescentadas e os metadados do
+    esquema final ficam guardados no pool. Retorna os comandos de esquema e as migrações aplicadas.
+    """
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    try:
+        tabelas = esquema.inspecionar(conexao)
+        criacoes = [
+            definicao(classe) for classe in classes
+            if classe.TABELA not in tabelas and not any(nome in tabelas for nome in classe.NOMES_ANTIGOS)
+        ]
+        if criacoes:
+            pool.transacao(conexao, lambda destino: [destino.execute(comando) for comando in criacoes])
+        aplicadas = migrar(pool)
+        tabelas = esquema.inspecionar(conexao)
+        # ADD COLUMN não aceita NOT NULL sem valor padrão; a obrigatoriedade fica com validar.
+        acrescimos = [
+            f'ALTER TABLE "{classe.TABELA}" ADD COLUMN "{coluna}" {TIPOS_SQL.get(classe.CAMPOS[coluna][0], "TEXT")}'
+            for classe in classes if classe.TABELA in tabelas
+            for coluna in tabelas[classe.TABELA].falta(classe.CAMPOS)
+        ]
+        if acrescimos:
+            pool.transacao(conexao, lambda destino: [destino.execute(comando) for comando in acrescimos])
+            tabelas = esquema.inspecionar(conexao)
+        pool.esquema = tabelas
+        for classe in classes:
+            esquema.colunas(pool, conexao, classe)
+    finally:
+        pool.liberar(conexao)
+    return {"esquema": criacoes + acrescimos, "migracoes": aplicadas}
+
+
+CONSULTAS_VERIFICADAS = {
+    "voos_por_decolagem": ("SELECT * FROM Voos WHERE COD_AEROPORTO_DECOLAGEM=?", (1,)),
+    "voos_por_destino": ("SELECT * FROM Voos WHERE COD_AEROPORTO_DESTINO=?", (1,)),
+    "voos_por_aeronave": ("SELECT * FROM Voos WHERE COD_AERONAVE=?", (1,)),
+    "voos_por_empresa": ("SELECT * FROM Voos WHERE COD_EMPRESA=?", (1,)),
+    "voos_por_periodo": ("SELECT * FROM Voos WHERE DATA_SAIDA BETWEEN ? AND ?", ("", "")),
+    "relatorio_aeroporto": Voos.consulta_relatorio(1, "", ""),
+    "relatorio_periodo": Voos.consulta_relatorio(None, "", ""),
+    "relatorio_aeroporto_sem_resumo": Voos.consulta_relatorio_voos(1, "", ""),
+    "partidas_na_janela": Voos.consulta_janela("partidas", 1, "2024-01-01 06:00", "2024-01-01 09:00"),
+    "chegadas_na_janela": Voos.consulta_janela("chegadas", 1, "2024-01-01 06:00", "2024-01-01 09:00"),
+    "voo_anterior_da_aeronave": (
+        "SELECT * FROM Voos WHERE COD_AERONAVE = ? AND (DATA_SAIDA, HORA_SAIDA) <= (?, ?) "
+        "ORDER BY DATA_SAIDA DESC, HORA_SAIDA DESC LIMIT 1", (1, "2024-01-01", "06:00")
+    ),
+    "partidas_sem_aeroporto": Voos.consulta_janela("partidas", None, "2024-01-01 06:00", "2024-01-02 09:00"),
+}
+
+
+def verificar_planos(pool=None, consultas=None):
+    """Executa EXPLAIN QUERY PLAN e indica quais consultas usam índices."""
+    pool = pool or conexoes.pool
+    consultas = consultas or CONSULTAS_VERIFICADAS
+    conexao = pool.adquirir()
+    resultado = {}
+    try:
+        for nome, (consulta, parametros) in consultas.items():
+            plano = [
+                linha[-1] for linha in conexao.execute(f"EXPLAIN QUERY PLAN {consulta}", parametros)
+            ]
+            usa_indice = any("USING" in passo and "INDEX" in passo for passo in plano)
+            resultado[nome] = (usa_indice, plano)
+    finally:
+        pool.liberar(conexao)
+    return resultado
+
+
+if __name__ == '__main__':
+    resultado = sincronizar()
+    print("Comandos de esquema:", *resultado["esquema"] or ["nenhum"], sep="\n    ")
+    print("Migrações aplicadas:", resultado["migracoes"] or "nenhuma")
+    for nome, (usa_indice, plano) in verificar_planos().items():
+        print(f"{nome}: {'OK' if usa_indice else 'SEM ÍNDICE'}", *plano, sep="\n    ")
@@ -0,0 +1,194 @@
+import argparse
+import gc
+import tracemalloc
+from array import array
+from dataclasses import dataclass, fields
+
+
+@dataclass(slots=True)
+class Aeronave:
+    COD_AERONAVE: int
+    MODELO_AERONAVE: str
+    ASSENTOS_DISPONIVEIS: int
+    LIMITE_BAGAGEM: float
+
+
+@dataclass(slots=True)
+class Aeroporto:
+    COD_AEROPORTO: int
+    NOME_AEROPORTO: str
+    SIGLA_AEROPORTO: str
+    CIDADE: str
+    ESTADO: str
+    PAIS: str
+    CONTINENTE: str
+
+
+@dataclass(slots=True)
+class Empresa:
+    COD_EMPRESA: int
+    NOME_EMPRESA: str
+    NACIONALIDADE_DA_EMPRESA: str
+    SIGLA_DA_EMPRESA: str
+
+
+@dataclass(slots=True)
+class Voo:
+    COD_VOO: int
+    DATA_SAIDA: str
+    HORA_SAIDA: str
+    COD_AEROPORTO_DECOLAGEM: int
+    COD_AEROPORTO_DESTINO: int
+    NUMERO_PASSAGEIROS: int
+    ASSENTOS_DISPONIVEIS: int
+    CARGA_CARREGADA: float
+    COD_AERONAVE: int
+    DATA_CHEGADA: str
+    HORA_CHEGADA: str
+    NATUREZA_DO_VOO: str
+    COD_EMPRESA: int
+
+
+def colunas(registro):
+    """Retorna os nomes das colunas de uma classe de registro, na ordem da tabela."""
+    return tuple(campo.name for campo in fields(registro))
+
+
+def fabrica(registro):
+    """Cria uma row_factory do sqlite3 que constrói registros a partir das linhas."""
+    def construir(cursor, linha):
+        return registro(*linha)
+    return construir
+
+
+class LoteVoos:
+    # Colunas numéricas ficam em arrays; textos repetidos são guardados como índices de um dicionário.
+    NUMERICAS = {
+        "COD_VOO": "q",
+        "COD_AEROPORTO_DECOLAGEM": "q",
+        "COD_AEROPORTO_DESTINO": "q",
+        "NUMERO_PASSAGEIROS": "l",
+        "ASSENTOS_DISPONIVEIS": "l",
+        "CARGA_CARREGADA": "d",
+        "COD_AERONAVE": "q",
+        "COD_EMPRESA": "q",
+    }
+    TEXTOS = ("DATA_SAIDA", "HORA_SAIDA", "DATA_CHEGADA", "HORA_CHEGADA", "NATUREZA_DO_VOO")
+
+    def __init__(self):
+        """Lote colunar de voos para processamento analítico em memória."""
+        self.colunas = {coluna: array(tipo) for coluna, tipo in self.NUMERICAS.items()}
+        self.colunas.update({coluna: array("l") for coluna in self.TEXTOS})
+        self.dicionarios = {coluna: [] for coluna in self.TEXTOS}
+        self.__indices = {coluna: {} for coluna in self.TEXTOS}
+        # Os códigos de aeroporto têm afinidade TEXT no esquema e são convertidos ao entrar no lote.
+        self.__posicoes = [
+            (self.colunas[coluna], self.__indices.get(coluna), self.dicionarios.get(coluna),
+             float if self.NUMERICAS.get(coluna) == "d" else int)
+            for coluna in colunas(Voo)
+        ]
+
+    @classmethod
+    def de_linhas(cls, linhas):
+        """Monta um lote a partir de tuplas na ordem das colunas de Voos."""
+        lote = cls()
+        lote.estender(linhas)
+        return lote
+
+    @classmethod
+    def carregar(cls, conexao, comando=None, parametros=(), tamanho_lote=10000):
+        """Carrega o resultado de uma consulta de voos em um lote, lendo o cursor em partes."""
+        comando = comando or f"SELECT {', '.join(colunas(Voo))} FROM Voos ORDER BY COD_VOO"
+        lote = cls()
+        cursor = conexao.execute(comando, parametros)
+        while linhas := cursor.fetchmany(tamanho_lote):
+            lote.estender(linhas)
+        return lote
+
+    def estender(self, linhas):
+        """Acrescenta tuplas na ordem das colunas de Voos ao lote."""
+        for linha in linhas:
+            for (coluna, indices, dicionario, converter), valor in zip(self.__posicoes, linha):
+                if indices is None:
+                    coluna.append(converter(valor))
+                    continue
+                indice = indices.get(valor)
+                if indice is None:
+                    indice = indices[valor] = len(dicionario)
+                    dicionario.append(valor)
+                coluna.append(indice)
+
+    def __len__(self):
+        return len(self.colunas["COD_VOO"])
+
+    def coluna(self, nome):
+        """Retorna os valores de uma coluna, decodificando as colunas de texto."""
+        if nome in self.dicionarios:
+            dicionario = self.dicionarios[nome]
+            return [dicionario[indice] for indice in self.colunas[nome]]
+        return self.colunas[nome]
+
+    def registro(self, posicao):
+        """Retorna a linha da posição informada como um registro Voo."""
+        return Voo(*(
+            coluna[posicao] if dicionario is None else dicionario[coluna[posicao]]
+            for coluna, _, dicionario, _ in self.__posicoes
+        ))
+
+    def __iter__(self):
+        return (self.registro(posicao) for posicao in range(len(self)))
+
+    def somar(self, nome):
+        """Soma uma coluna numérica do lote."""
+        return sum(self.colunas[nome])
+
+    def ocupacao_media(self):
+        """Retorna a razão média entre passageiros e assentos disponíveis dos voos do lote."""
+        passageiros, assentos = self.colunas["NUMERO_PASSAGEIROS"], self.colunas["ASSENTOS_DISPONIVEIS"]
+        razoes = [ocupados / total for ocupados, total in zip(passageiros, assentos) if total]
+        return sum(razoes) / len(razoes) if razoes else 0.0
+
+
+def _linhas_sinteticas(quantidade):
+    """Gera linhas de voos com valores novos a cada linha, como as lidas de um cursor."""
+    for codigo in range(1, quantidade + 1):
+        dia = codigo % 365
+        data = f"2024-{dia // 31 % 12 + 1:02d}-{dia % 28 + 1:02d}"
+        yield (
+            codigo, data, f"{codigo % 24:02d}:{codigo % 60:02d}",
+            codigo % 500 + 1, (codigo * 7) % 500 + 1, codigo % 180, 180, float(codigo % 5000),
+            codigo % 300 + 1, f"2024-{dia // 31 % 12 + 1:02d}-{dia % 28 + 1:02d}",
+            f"{(codigo + 3) % 24:02d}:{codigo % 60:02d}", "Nacional" if codigo % 3 else "Internacional",
+            codigo % 40 + 1,
+        )
+
+
+def _medir(construir):
+    """Retorna os bytes alocados e mantidos por construir()."""
+    gc.collect()
+    tracemalloc.start()
+    resultado = construir()
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return atual
+
+
+def comparar_memoria(quantidade):
+    """Mede os bytes por linha de cada representação de quantidade voos."""
+    nomes = colunas(Voo)
+    representacoes = {
+        "tupla": lambda: list(_linhas_sinteticas(quantidade)),
+        "dicionario": lambda: [dict(zip(nomes, linha)) for linha in _linhas_sinteticas(quantidade)],
+        "registro": lambda: [Voo(*linha) for linha in _linhas_sinteticas(quantidade)],
+        "lote_colunar": lambda: LoteVoos.de_linhas(_linhas_sinteticas(quantidade)),
+    }
+    return {nome: _medir(construir) / quantidade for nome, construir in representacoes.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compara a memória ocupada por cada representação de voos.")
+    parser.add_argument("--voos", type=int, default=1000000)
+    argumentos = parser.parse_args()
+    for nome, bytes_por_linha in comparar_memoria(argumentos.voos).items():
+        print(f"{nome:>12}: {bytes_por_linha:8.1f} bytes/linha")
@@ -0,0 +1,226 @@
+import argparse
+import conexoes
+
+COLUNAS_RESUMO = ("DATA", "COD_AEROPORTO", "COD_EMPRESA")
+VALORES_RESUMO = ("PARTIDAS", "CHEGADAS", "PASSAGEIROS", "CARGA", "SOMA_OCUPACAO", "MOVIMENTOS_COM_OCUPACAO")
+
+# Código usado no resumo para voos cuja empresa ou aeroporto foi anulado por SET NULL.
+SEM_REFERENCIA = 0
+
+# Cada voo contribui com um movimento de partida e um de chegada.
+MOVIMENTOS = {
+    "partida": ("DATA_SAIDA", "COD_AEROPORTO_DECOLAGEM", 1, 0),
+    "chegada": ("DATA_CHEGADA", "COD_AEROPORTO_DESTINO", 0, 1),
+}
+
+
+def _ocupacao(linha):
+    """Expressão da ocupação de um voo em relação aos assentos da aeronave."""
+    return (
+        f"(SELECT CAST({linha}.NUMERO_PASSAGEIROS AS REAL) / NULLIF(ASSENTOS_DISPONIVEIS, 0) "
+        f"FROM Aeronaves WHERE COD_AERONAVE = {linha}.COD_AERONAVE)"
+    )
+
+
+def _chave(linha, coluna):
+    """Expressão de uma coluna de chave do resumo, com o código SEM_REFERENCIA no lugar de nulos."""
+    return f"COALESCE({linha}.{coluna}, {SEM_REFERENCIA})"
+
+
+def _aplicar_movimento(linha, movimento, sinal):
+    """Comando que soma (ou subtrai) o movimento de uma linha de Voos no resumo."""
+    data, aeroporto, partida, chegada = MOVIMENTOS[movimento]
+    ocupacao = _ocupacao(linha)
+    return (
+        f"INSERT INTO ResumoMovimentos({', '.join(COLUNAS_RESUMO + VALORES_RESUMO)}) VALUES("
+        f"substr({linha}.{data}, 1, 10), {_chave(linha, aeroporto)}, {_chave(linha, 'COD_EMPRESA')}, "
+        f"{sinal}{partida}, {sinal}{chegada}, {sinal}{linha}.NUMERO_PASSAGEIROS, "
+        f"{sinal}{linha}.CARGA_CARREGADA, {sinal}COALESCE({ocupacao}, 0), "
+        f"{sinal}({ocupacao} IS NOT NULL)) "
+        f"ON CONFLICT({', '.join(COLUNAS_RESUMO)}) DO UPDATE SET "
+        + ", ".join(f"{valor} = {valor} + excluded.{valor}" for valor in VALORES_RESUMO)
+        + ";"
+    )
+
+
+def _remover_vazios(linha, movimento):
+    """Comando que apaga a linha do resumo que ficou sem movimentos."""
+    data, aeroporto, _, _ = MOVIMENTOS[movimento]
+    return (
+        "DELETE FROM ResumoMovimentos WHERE PARTIDAS = 0 AND CHEGADAS = 0 "
+        f"AND DATA = substr({linha}.{data}, 1, 10) AND COD_AEROPORTO = {_chave(linha, aeroporto)} "
+        f"AND COD_EMPRESA = {_chave(linha, 'COD_EMPRESA')};"
+    )
+
+
+def _ocupacao_da_aeronave(linha, movimento, sinal):
+    """Comando que soma (ou subtrai) no resumo a ocupação dos voos de uma aeronave com os assentos da linha."""
+    data, aeroporto, _, _ = MOVIMENTOS[movimento]
+    ocupacao = f"CAST(V.NUMERO_PASSAGEIROS AS REAL) / NULLIF({linha}.ASSENTOS_DISPONIVEIS, 0)"
+    return (
+        f"INSERT INTO ResumoMovimentos({', '.join(COLUNAS_RESUMO + VALORES_RESUMO)}) "
+        f"SELECT substr(V.{data}, 1, 10), {_chave('V', aeroporto)}, {_chave('V', 'COD_EMPRESA')}, 0, 0, 0, 0, "
+        f"{sinal}TOTAL({ocupacao}), {sinal}COUNT({ocupacao}) "
+        f"FROM Voos V WHERE V.COD_AERONAVE = {linha}.COD_AERONAVE GROUP BY 1, 2, 3 "
+        f"ON CONFLICT({', '.join(COLUNAS_RESUMO)}) DO UPDATE SET "
+        + ", ".join(f"{valor} = {valor} + excluded.{valor}" for valor in VALORES_RESUMO[-2:])
+        + ";"
+    )
+
+
+def criar_indices(cursor):
+    """Cria os índices do resumo; os de aeroporto e de período cobrem os valores, e o relatório não lê a tabela."""
+    cursor.execute("DROP INDEX IF EXISTS IDX_RESUMO_AEROPORTO")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS IDX_RESUMO_AEROPORTO_TOTAIS "
+        f"ON ResumoMovimentos(COD_AEROPORTO, DATA, {', '.join(VALORES_RESUMO)})"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS IDX_RESUMO_PERIODO "
+        f"ON ResumoMovimentos(DATA, COD_AEROPORTO, {', '.join(VALORES_RESUMO)})"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS IDX_RESUMO_EMPRESA ON ResumoMovimentos(COD_EMPRESA, DATA)"
+    )
+
+
+def criar(cursor):
+    """Cria a tabela de resumo e os gatilhos que a mantêm atualizada."""
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS ResumoMovimentos("
+        "DATA TEXT NOT NULL, COD_AEROPORTO TEXT NOT NULL, COD_EMPRESA INTEGER NOT NULL, "
+        "PARTIDAS INTEGER NOT NULL, CHEGADAS INTEGER NOT NULL, PASSAGEIROS INTEGER NOT NULL, "
+        "CARGA REAL NOT NULL, SOMA_OCUPACAO REAL NOT NULL, MOVIMENTOS_COM_OCUPACAO INTEGER NOT NULL, "
+        "PRIMARY KEY(DATA, COD_AEROPORTO, COD_EMPRESA)) WITHOUT ROWID"
+    )
+    criar_indices(cursor)
+    adicionar = [_aplicar_movimento("NEW", movimento, "") for movimento in MOVIMENTOS]
+    remover = [
+        comando for movimento in MOVIMENTOS
+        for comando in (_aplicar_movimento("OLD", movimento, "-"), _remover_vazios("OLD", movimento))
+    ]
+    gatilhos = {
+        "TRG_RESUMO_INSERIR": ("AFTER INSERT", adicionar),
+        "TRG_RESUMO_DELETAR": ("AFTER DELETE", remover),
+        "TRG_RESUMO_ATUALIZAR": ("AFTER UPDATE", remover + adicionar),
+    }
+    # A ocupação de um voo depende dos assentos da aeronave: ao deletar a aeronave, a parte dos seus
+    # voos sai do resumo antes que CASCADE ou SET NULL os alcance, quando ela já não existe mais.
+    gatilhos_aeronaves = {
+        "TRG_RESUMO_AERONAVE_DELETAR": (
+            "BEFORE DELETE", [_ocupacao_da_aeronave("OLD", movimento, "-") for movimento in MOVIMENTOS]
+        ),
+        "TRG_RESUMO_AERONAVE_ATUALIZAR": (
+            "AFTER UPDATE OF ASSENTOS_DISPONIVEIS",
+            [_ocupacao_da_aeronave(linha, movimento, sinal)
+             for linha, sinal in (("OLD", "-"), ("NEW", "")) for movimento in MOVIMENTOS]
+        ),
+    }
+    for tabela, definicoes in (("Voos", gatilhos), ("Aeronaves", gatilhos_aeronaves)):
+        for nome, (evento, comandos) in definicoes.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {nome}")
+            cursor.execute(
+                f"CREATE TRIGGER {nome} {evento} ON {tabela} BEGIN {' '.join(comandos)} END"
+            )
+    _reconstruir(cursor)
+
+
+def _consulta_base():
+    """Consulta que calcula o resumo diretamente a partir de Voos."""
+    # As chaves são convertidas aos tipos das colunas do resumo; sem isso, o EXCEPT de verificar
+    # distinguiria o aeroporto 5 de Voos do '5' guardado no resumo.
+    movimentos = " UNION ALL ".join(
+        f"SELECT substr(V.{data}, 1, 10) AS DATA, CAST({_chave('V', aeroporto)} AS TEXT) AS COD_AEROPORTO, "
+        f"CAST({_chave('V', 'COD_EMPRESA')} AS INTEGER) AS COD_EMPRESA, "
+        f"{partida} AS PARTIDA, {chegada} AS CHEGADA, V.NUMERO_PASSAGEIROS, V.CARGA_CARREGADA, "
+        "CAST(V.NUMERO_PASSAGEIROS AS REAL) / NULLIF(A.ASSENTOS_DISPONIVEIS, 0) AS OCUPACAO "
+        "FROM Voos V LEFT JOIN Aeronaves A ON A.COD_AERONAVE = V.COD_AERONAVE"
+        for data, aeroporto, partida, chegada in MOVIMENTOS.values()
+    )
+    return (
+        "SELECT DATA, COD_AEROPORTO, COD_EMPRESA, SUM(PARTIDA) AS PARTIDAS, SUM(CHEGADA) AS CHEGADAS, "
+        "SUM(NUMERO_PASSAGEIROS) AS PASSAGEIROS, SUM(CARGA_CARREGADA) AS CARGA, "
+        "TOTAL(OCUPACAO) AS SOMA_OCUPACAO, COUNT(OCUPACAO) AS MOVIMENTOS_COM_OCUPACAO "
+        f"FROM ({movimentos}) "
+        "GROUP BY DATA, COD_AEROPORTO, COD_EMPRESA"
+    )
+
+
+def _reconstruir(cursor):
+    cursor.execute("DELETE FROM ResumoMovimentos")
+    cursor.execute(
+        f"INSERT INTO ResumoMovimentos({', '.join(COLUNAS_RESUMO + VALORES_RESUMO)}) {_consulta_base()}"
+    )
+
+
+def reconstruir(pool=None):
+    """Recalcula a tabela de resumo inteira a partir de Voos."""
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    try:
+        pool.transacao(conexao, lambda destino: _reconstruir(destino.cursor()))
+    finally:
+        pool.liberar(conexao)
+
+
+def verificar(pool=None):
+    """Compara o resumo com os dados de Voos e retorna as linhas divergentes."""
+    pool = pool or conexoes.pool
+    arredondadas = ", ".join(
+        list(COLUNAS_RESUMO) + [f"ROUND({valor}, 6)" for valor in VALORES_RESUMO]
+    )
+    base = f"SELECT {arredondadas} FROM ({_consulta_base()})"
+    resumo = f"SELECT {arredondadas} FROM ResumoMovimentos"
+    conexao = pool.adquirir()
+    try:
+        return {
+            "faltando_no_resumo": conexao.execute(f"{base} EXCEPT {resumo}").fetchall(),
+            "sobrando_no_resumo": conexao.execute(f"{resumo} EXCEPT {base}").fetchall(),
+        }
+    finally:
+        pool.liberar(conexao)
+
+
+def consultar(agrupamento=("COD_AEROPORTO",), data_inicio=None, data_fim=None, aeroporto=None,
+              empresa=None, pool=None):
+    """Lê totais e ocupação média apenas da tabela de resumo, agrupados pelas colunas pedidas."""
+    if not set(agrupamento) <= set(COLUNAS_RESUMO):
+        raise ValueError(f"Agrupamento deve usar apenas as colunas {', '.join(COLUNAS_RESUMO)}.")
+    condicoes, parametros = [], []
+    for condicao, valor in (
+        ("DATA >= ?", data_inicio), ("DATA <= ?", data_fim),
+        ("COD_AEROPORTO = ?", aeroporto), ("COD_EMPRESA = ?", empresa)
+    ):
+        if valor is not None:
+            condicoes.append(condicao)
+            parametros.append(valor)
+    filtro = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    colunas = ", ".join(agrupamento)
+    selecao = f"{colunas}, " if agrupamento else ""
+    agrupar = f" GROUP BY {colunas} ORDER BY {colunas}" if agrupamento else ""
+    pool = pool or conexoes.pool
+    conexao = pool.adquirir()
+    try:
+        return conexao.execute(
+            f"SELECT {selecao}SUM(PARTIDAS), SUM(CHEGADAS), SUM(PASSAGEIROS), SUM(CARGA), "
+            f"SUM(SOMA_OCUPACAO) / NULLIF(SUM(MOVIMENTOS_COM_OCUPACAO), 0) "
+            f"FROM ResumoMovimentos{filtro}{agrupar}", parametros
+        ).fetchall()
+    finally:
+        pool.liberar(conexao)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Manutenção da tabela de resumo de movimentos.")
+    parser.add_argument("comando", choices=("reconstruir", "verificar"))
+    argumentos = parser.parse_args()
+    if argumentos.comando == "reconstruir":
+        reconstruir()
+        print("Resumo reconstruído.")
+    else:
+        divergencias = verificar()
+        if not any(divergencias.values()):
+            print("Resumo consistente com Voos.")
+        for tipo, linhas in divergencias.items():
+            for linha in linhas:
+                print(tipo, *linha, sep=" - ")
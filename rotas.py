@@ -0,0 +1,318 @@
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+import conexoes
+import horarios
+from carga import percentil
+from classes import BancoDados, Aeroportos, Voos
+
+INFINITO = float("inf")
+CONSULTA_VOOS = (
+    "SELECT COD_VOO, CAST(COD_AEROPORTO_DECOLAGEM AS INTEGER), CAST(COD_AEROPORTO_DESTINO AS INTEGER), "
+    "DATA_SAIDA || 'T' || HORA_SAIDA, DATA_CHEGADA || 'T' || HORA_CHEGADA FROM Voos"
+)
+
+
+@dataclass(slots=True)
+class Trecho:
+    voo: int
+    origem: int
+    destino: int
+    saida: str
+    chegada: str
+
+
+class Rotas:
+    def __init__(self, escala_minima=30, horizonte=2 * 24 * 60):
+        """Índice em memória da malha de voos para buscas de itinerários (Connection Scan)."""
+        self.escala_minima = escala_minima
+        self.horizonte = horizonte
+        # As conexões ficam em arrays paralelos, ordenados pelo minuto de saída.
+        self.saidas = array("q")
+        self.chegadas = array("q")
+        self.origens = array("q")
+        self.destinos = array("q")
+        self.voos = array("q")
+        self.aeroportos = set()
+        self.ligacoes = {}
+        self.__trava = threading.RLock()
+
+    @classmethod
+    def carregar(cls, pool=None, escala_minima=30, horizonte=2 * 24 * 60, tamanho_lote=10000):
+        """Monta o índice a partir de Aeroportos e de Voos, lendo os voos já na ordem de saída."""
+        rotas = cls(escala_minima, horizonte)
+        pool = pool or conexoes.pool
+        conexao = pool.adquirir()
+        try:
+            rotas.aeroportos.update(
+                codigo for codigo, in conexao.execute(f"SELECT {Aeroportos.CHAVE} FROM {Aeroportos.TABELA}")
+            )
+            cursor = conexao.execute(f"{CONSULTA_VOOS} ORDER BY DATA_SAIDA, HORA_SAIDA")
+            while linhas := cursor.fetchmany(tamanho_lote):
+                rotas.estender(linhas)
+        finally:
+            pool.liberar(conexao)
+        return rotas
+
+    def estender(self, linhas):
+        """Acrescenta voos (código, origem, destino, saída, chegada) já ordenados pela saída."""
+        with self.__trava:
+            for codigo, origem, destino, saida, chegada in linhas:
+                try:
+                    saida, chegada = horarios.minutos(saida), horarios.minutos(chegada)
+                except ValueError:
+                    # Voos com horários fora do formato ISO não entram na malha.
+                    continue
+                if self.saidas and saida < self.saidas[-1]:
+                    self.adicionar(codigo, origem, destino, saida, chegada)
+                    continue
+                self.saidas.append(saida)
+                self.chegadas.append(chegada)
+                self.origens.append(origem)
+                self.destinos.append(destino)
+                self.voos.append(codigo)
+                self.__ligar(origem, destino, 1)
+
+    def __ligar(self, origem, destino, quantidade):
+        destinos = self.ligacoes.setdefault(origem, {})
+        destinos[destino] = destinos.get(destino, 0) + quantidade
+        if not destinos[destino]:
+            del destinos[destino]
+
+    def __len__(self):
+        return len(self.voos)
+
+    def adicionar(self, codigo, origem, destino, saida, chegada):
+        """Insere um voo na posição da sua saída, informada em minutos."""
+        with self.__trava:
+            posicao = bisect_right(self.saidas, saida)
+            for coluna, valor in (
+                (self.saidas, saida), (self.chegadas, chegada), (self.origens, origem),
+                (self.destinos, destino), (self.voos, codigo)
+            ):
+                coluna.insert(posicao, valor)
+            self.__ligar(origem, destino, 1)
+
+    def __posicao(self, codigo):
+        """Procura o código nos bytes do array; é bem mais rápido que array.index."""
+        dados, alvo = self.voos.tobytes(), array("q", [codigo]).tobytes()
+        inicio = dados.find(alvo)
+        while inicio != -1 and inicio % self.voos.itemsize:
+            inicio = dados.find(alvo, inicio + 1)
+        return None if inicio == -1 else inicio // self.voos.itemsize
+
+    def remover(self, codigo):
+        """Retira um voo do índice; retorna False se ele não estava presente."""
+        with self.__trava:
+            posicao = self.__posicao(codigo)
+            if posicao is None:
+                return False
+            self.__ligar(self.origens[posicao], self.destinos[posicao], -1)
+            for coluna in (self.saidas, self.chegadas, self.origens, self.destinos, self.voos):
+                del coluna[posicao]
+            return True
+
+    def sincronizar(self, conexao, codigos):
+        """Relê do banco os voos informados, refletindo inserções, alterações e remoções."""
+        with self.__trava:
+            for codigo in codigos:
+                self.remover(codigo)
+            for parte in range(0, len(codigos), 500):
+                lote = list(codigos[parte:parte + 500])
+                linhas = conexao.execute(
+                    f"{CONSULTA_VOOS} WHERE COD_VOO IN ({', '.join('?' * len(lote))})", lote
+                ).fetchall()
+                for codigo, origem, destino, saida, chegada in linhas:
+                    try:
+                        saida, chegada = horarios.minutos(saida), horarios.minutos(chegada)
+                    except ValueError:
+                        continue
+                    self.adicionar(codigo, origem, destino, saida, chegada)
+
+    def acompanhar(self, pool=None):
+        """Mantém o índice atualizado a cada escrita feita pelas classes de tabela."""
+        pool = pool or conexoes.pool
+
+        def ouvinte(tabela, operacao, codigos):
+            if tabela == Aeroportos.TABELA:
+                if operacao == "remover":
+                    self.aeroportos.difference_update(codigos)
+                else:
+                    self.aeroportos.update(codigos)
+            elif tabela == Voos.TABELA:
+                conexao = pool.adquirir()
+                try:
+                    self.sincronizar(conexao, list(codigos))
+                finally:
+                    pool.liberar(conexao)
+        BancoDados.OUVINTES.append(ouvinte)
+        return ouvinte
+
+    def __inicio(self, origem, destino, inicio):
+        if origem not in self.aeroportos or destino not in self.aeroportos:
+            raise ValueError("O aeroporto em questão não existe...")
+        partida = horarios.minutos(inicio)
+        # Só as conexões que partem dentro do horizonte a partir do início são examinadas.
+        primeira = bisect_left(self.saidas, partida)
+        return partida, primeira, bisect_right(self.saidas, partida + self.horizonte, primeira)
+
+    def __itinerario(self, origem, destino, rodadas):
+        """Reconstrói os trechos até destino, do último ao primeiro, com a conexão usada em cada rodada."""
+        trechos = []
+        aeroporto = destino
+        for anteriores in rodadas:
+            if aeroporto == origem:
+                break
+            posicao = anteriores[aeroporto]
+            trechos.append(Trecho(
+                self.voos[posicao], self.origens[posicao], self.destinos[posicao],
+                horarios.de_minutos(self.saidas[posicao]), horarios.de_minutos(self.chegadas[posicao])
+            ))
+            aeroporto = self.origens[posicao]
+        trechos.reverse()
+        return trechos
+
+    def __varrer(self, origem, destino, primeira, ultima, alcancados, pronto, anteriores):
+        """Examina as conexões em ordem de saída, a partir dos aeroportos em alcancados.
+
+        pronto e anteriores recebem, para cada aeroporto melhorado, o minuto a partir do qual se pode
+        partir dele (chegada mais escala mínima) e a posição da conexão usada.
+        """
+        escala = self.escala_minima
+        partir, obter = alcancados.get, pronto.get
+        limite = obter(destino, INFINITO) - escala
+        for posicao, saida, partiu, chegada, chegou in zip(
+            range(primeira, ultima), self.saidas[primeira:ultima], self.origens[primeira:ultima],
+            self.chegadas[primeira:ultima], self.destinos[primeira:ultima]
+        ):
+            if saida >= limite:
+                break
+            if saida < partir(partiu, INFINITO) or chegou == origem:
+                continue
+            if chegada + escala < obter(chegou, INFINITO):
+                pronto[chegou] = chegada + escala
+                anteriores[chegou] = posicao
+                if chegou == destino:
+                    limite = chegada
+
+    def mais_cedo(self, origem, destino, inicio):
+        """Retorna o itinerário que chega mais cedo ao destino saindo a partir de inicio, ou None."""
+        with self.__trava:
+            partida, primeira, ultima = self.__inicio(origem, destino, inicio)
+            if origem == destino:
+                return []
+            # Na origem não há escala; nos demais aeroportos a saída exige a escala mínima.
+            pronto, anteriores = {origem: partida}, {}
+            self.__varrer(origem, destino, primeira, ultima, pronto, pronto, anteriores)
+            if destino not in anteriores:
+                return None
+            return self.__itinerario(origem, destino, itertools.repeat(anteriores))
+
+    def menos_conexoes(self, origem, destino, inicio, maximo_trechos=4):
+        """Retorna o itinerário com menos trechos (e, entre eles, o que chega antes), ou None."""
+        with self.__trava:
+            partida, primeira, ultima = self.__inicio(origem, destino, inicio)
+            if origem == destino:
+                return []
+            # A rodada k parte só dos aeroportos alcançados com até k - 1 trechos.
+            prontos, rodadas = [{origem: partida}], [{}]
+            for _ in range(maximo_trechos):
+                pronto, usados = dict(prontos[-1]), dict(rodadas[-1])
+                self.__varrer(origem, destino, primeira, ultima, prontos[-1], pronto, usados)
+                if destino in usados:
+                    rodadas.append(usados)
+                    return self.__itinerario(origem, destino, reversed(rodadas))
+                if pronto == prontos[-1]:
+                    return None
+                prontos.append(pronto)
+                rodadas.append(usados)
+            return None
+
+
+def _malha_sintetica(aeroportos, voos, dias, semente):
+    """Gera voos aleatórios entre aeroportos, com cerca de 20% deles concentrados em 1% de hubs."""
+    gerador = random.Random(semente)
+    hubs = max(1, aeroportos // 100)
+    inicio = horarios.minutos("2024-01-01T00:00")
+    saidas = sorted(gerador.randrange(dias * 24 * 60) for _ in range(voos))
+    for codigo, saida in enumerate(saidas, 1):
+        origem = gerador.randrange(hubs) + 1 if gerador.random() < 0.2 else gerador.randrange(aeroportos) + 1
+        destino = gerador.randrange(aeroportos) + 1
+        if destino == origem:
+            destino = destino % aeroportos + 1
+        duracao = gerador.randrange(45, 12 * 60)
+        yield (
+            codigo, origem, destino,
+            horarios.de_minutos(inicio + saida), horarios.de_minutos(inicio + saida + duracao)
+        )
+
+
+def comparar(aeroportos=5000, voos=1000000, consultas=200, dias=7, semente=1):
+    """Mede a montagem do índice, a latência das buscas e a das atualizações incrementais."""
+    gerador = random.Random(semente)
+    rotas = Rotas()
+    rotas.aeroportos.update(range(1, aeroportos + 1))
+    inicio = time.perf_counter()
+    rotas.estender(_malha_sintetica(aeroportos, voos, dias, semente))
+    resultado = {"aeroportos": aeroportos, "voos": len(rotas), "montagem_s": time.perf_counter() - inicio}
+    pares = [
+        (gerador.randrange(aeroportos) + 1, gerador.randrange(aeroportos) + 1,
+         horarios.de_minutos(horarios.minutos("2024-01-01T00:00") + gerador.randrange((dias - 2) * 24 * 60)))
+        for _ in range(consultas)
+    ]
+    for nome, busca in (("mais_cedo", rotas.mais_cedo), ("menos_conexoes", rotas.menos_conexoes)):
+        latencias, encontrados = [], 0
+        for origem, destino, partida in pares:
+            inicio = time.perf_counter()
+            encontrados += busca(origem, destino, partida) is not None
+            latencias.append(time.perf_counter() - inicio)
+        latencias.sort()
+        resultado[nome] = {
+            "encontrados": encontrados,
+            "p50_ms": percentil(latencias, 0.50) * 1000,
+            "p99_ms": percentil(latencias, 0.99) * 1000,
+        }
+    latencias = []
+    for codigo in gerador.sample(range(1, voos + 1), min(consultas, voos)):
+        inicio = time.perf_counter()
+        rotas.remover(codigo)
+        rotas.adicionar(codigo, 1, 2, rotas.saidas[len(rotas) // 2], rotas.saidas[len(rotas) // 2] + 60)
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    resultado["atualizacao"] = {
+        "p50_ms": percentil(latencias, 0.50) * 1000,
+        "p99_ms": percentil(latencias, 0.99) * 1000,
+    }
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Busca de itinerários na malha de voos.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    busca = subcomandos.add_parser("buscar", help="busca um itinerário no banco de dados")
+    busca.add_argument("origem", type=int)
+    busca.add_argument("destino", type=int)
+    busca.add_argument("inicio", help="instante de partida, AAAA-MM-DD HH:MM")
+    busca.add_argument("--menos-conexoes", action="store_true")
+    busca.add_argument("--escala", type=int, default=30, help="escala mínima em minutos")
+    teste = subcomandos.add_parser("benchmark", help="mede as buscas em uma malha sintética")
+    teste.add_argument("--aeroportos", type=int, default=5000)
+    teste.add_argument("--voos", type=int, default=1000000)
+    teste.add_argument("--consultas", type=int, default=200)
+    argumentos = parser.parse_args()
+    if argumentos.comando == "benchmark":
+        print(json.dumps(comparar(argumentos.aeroportos, argumentos.voos, argumentos.consultas), indent=4))
+    else:
+        rotas = Rotas.carregar(escala_minima=argumentos.escala)
+        buscar = rotas.menos_conexoes if argumentos.menos_conexoes else rotas.mais_cedo
+        itinerario = buscar(argumentos.origem, argumentos.destino, argumentos.inicio)
+        if itinerario is None:
+            print("Nenhum itinerário encontrado.")
+        for trecho in itinerario or ():
+            print(trecho.voo, trecho.origem, trecho.destino, trecho.saida, trecho.chegada, sep=" - ")
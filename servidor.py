@@ -0,0 +1,241 @@
+import argparse
+import asyncio
+import json
+import sqlite3 as sql
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+import agrupamento
+import cache
+import conexoes
+import migracoes
+import resumos
+from classes import BancoDados, Aeronaves, Aeroportos, Empresas, Voos
+
+TABELAS = {"aeronaves": Aeronaves, "aeroportos": Aeroportos, "empresas": Empresas, "voos": Voos}
+TAMANHO_MAXIMO_CORPO = 1 << 20
+
+
+class RespostaErro(Exception):
+    """Erro convertido diretamente em uma resposta HTTP."""
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _como_dicionario(classe, linha):
+    return dict(zip((classe.CHAVE, *classe.CAMPOS), linha))
+
+
+def _parametro(parametros, nome, tipo=str):
+    valores = parametros.get(nome)
+    if not valores:
+        return None
+    try:
+        return tipo(valores[0])
+    except ValueError:
+        raise RespostaErro(HTTPStatus.BAD_REQUEST, f"Parâmetro {nome} inválido.")
+
+
+class Servidor:
+    def __init__(self, caminho=conexoes.CAMINHO_BANCO, trabalhadores=4, agrupar=False, guardar=False):
+        """Servidor HTTP/JSON com as chamadas ao banco em um grupo limitado de threads."""
+        # Com o commit agrupado, o escritor ocupa uma conexão além das threads de trabalho.
+        self.pool = conexoes.PoolConexoes(caminho, tamanho_maximo=trabalhadores + agrupar)
+        self.escritor = agrupamento.EscritorAgrupado(self.pool) if agrupar else None
+        if self.escritor:
+            self.escritor.iniciar()
+        if guardar:
+            # Vários processos podem servir o mesmo banco; as versões das linhas mantêm os caches coerentes.
+            cache.ativar(self.pool, distribuido=True)
+        # Cada thread adquire a sua conexão ao iniciar e a mantém até o fim.
+        self.executor = ThreadPoolExecutor(trabalhadores, initializer=self.pool.adquirir)
+
+    def tratar(self, metodo, caminho, corpo):
+        """Executa uma requisição na thread do banco e retorna (status, conteúdo)."""
+        url = urlsplit(caminho)
+        partes = [parte for parte in url.path.split("/") if parte]
+        parametros = parse_qs(url.query)
+        if partes == ["relatorios", "aeroportos"] and metodo == "GET":
+            with Voos(self.pool) as tabela:
+                linhas = tabela.relatorio(
+                    _parametro(parametros, "aeroporto"), _parametro(parametros, "inicio"),
+                    _parametro(parametros, "fim"), _parametro(parametros, "periodo") or "dia"
+                )
+            colunas = ("AEROPORTO", "PERIODO", "PARTIDAS", "CHEGADAS", "PASSAGEIROS", "CARGA", "OCUPACAO_MEDIA")
+            return HTTPStatus.OK, [dict(zip(colunas, linha)) for linha in linhas]
+        if partes == ["resumos"] and metodo == "GET":
+            agrupamento = tuple(filter(None, (_parametro(parametros, "agrupamento") or "").split(",")))
+            linhas = resumos.consultar(
+                agrupamento, _parametro(parametros, "inicio"), _parametro(parametros, "fim"),
+                _parametro(parametros, "aeroporto"), _parametro(parametros, "empresa", int), self.pool
+            )
+            colunas = (*agrupamento, "PARTIDAS", "CHEGADAS", "PASSAGEIROS", "CARGA", "OCUPACAO_MEDIA")
+            return HTTPStatus.OK, [dict(zip(colunas, linha)) for linha in linhas]
+        if not partes or partes[0] not in TABELAS or len(partes) > 2:
+            raise RespostaErro(HTTPStatus.NOT_FOUND, "Recurso inexistente.")
+        classe = TABELAS[partes[0]]
+        codigo = None
+        if len(partes) == 2:
+            try:
+                codigo = int(partes[1])
+            except ValueError:
+                raise RespostaErro(HTTPStatus.BAD_REQUEST, "ID deve ser um número inteiro positivo...")
+        with classe(self.pool) as tabela:
+            if metodo == "GET" and codigo is None:
+                linhas = tabela.listar(
+                    _parametro(parametros, "apos", int), _parametro(parametros, "tamanho", int),
+                    _parametro(parametros, "prefixo") or ""
+                )
+                return HTTPStatus.OK, [_como_dicionario(classe, linha) for linha in linhas]
+            if metodo == "POST" and codigo is None:
+                return HTTPStatus.CREATED, {classe.CHAVE: tabela.criar(**self.__json(corpo))}
+            if codigo is None:
+                raise RespostaErro(HTTPStatus.METHOD_NOT_ALLOWED, "Método não permitido.")
+            if metodo == "GET":
+                linha = tabela.obter(codigo)
+            elif metodo == "PATCH":
+                linha = tabela.obter(codigo) if tabela.alterar(codigo, **self.__json(corpo)) else None
+            elif metodo == "DELETE":
+                linha = (codigo,) if tabela.remover(codigo) else None
+            else:
+                raise RespostaErro(HTTPStatus.METHOD_NOT_ALLOWED, "Método não permitido.")
+        if linha is None:
+            raise RespostaErro(HTTPStatus.NOT_FOUND, "ID inexistente...")
+        if metodo == "DELETE":
+            return HTTPStatus.NO_CONTENT, None
+        return HTTPStatus.OK, _como_dicionario(classe, linha)
+
+    @staticmethod
+    def __json(corpo):
+        try:
+            valores = json.loads(corpo or b"{}")
+        except ValueError:
+            raise RespostaErro(HTTPStatus.BAD_REQUEST, "Corpo JSON inválido.")
+        if not isinstance(valores, dict):
+            raise RespostaErro(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON.")
+        return valores
+
+    def responder(self, metodo, caminho, corpo):
+        """Converte o resultado ou o erro de tratar em status e conteúdo JSON."""
+        try:
+            status, conteudo = self.tratar(metodo, caminho, corpo)
+        except RespostaErro as erro:
+            status, conteudo = erro.status, {"erro": str(erro)}
+        except (ValueError, BancoDados.ValorNuloErro, BancoDados.ValorInvalidoErro) as erro:
+            status, conteudo = HTTPStatus.BAD_REQUEST, {"erro": str(erro)}
+        except sql.IntegrityError as erro:
+            status, conteudo = HTTPStatus.CONFLICT, {"erro": str(erro)}
+        except Exception as erro:
+            # Qualquer outra falha vira 500; deixá-la escapar derrubaria a escrita das respostas da conexão.
+            status, conteudo = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"{type(erro).__name__}: {erro}"}
+        dados = b"" if conteudo is None else json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        return status, dados
+
+    async def __ler_requisicao(self, leitor):
+        """Lê uma requisição HTTP/1.1 ou retorna None quando o cliente fechar a conexão."""
+        try:
+            cabecalho = await leitor.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        linhas = cabecalho.decode("latin-1").split("\r\n")
+        metodo, caminho, versao = linhas[0].split(" ", 2)
+        campos = {}
+        for linha in linhas[1:]:
+            if ":" in linha:
+                nome, valor = linha.split(":", 1)
+                campos[nome.strip().lower()] = valor.strip()
+        tamanho = int(campos.get("content-length", 0))
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise RespostaErro(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo muito grande.")
+        corpo = await leitor.readexactly(tamanho) if tamanho else b""
+        conexao = campos.get("connection", "").lower()
+        manter = conexao != "close" if versao == "HTTP/1.1" else conexao == "keep-alive"
+        return metodo, caminho, corpo, manter
+
+    async def atender(self, leitor, escritor):
+        """Atende uma conexão com keep-alive, respondendo às requisições em ordem."""
+        laco = asyncio.get_running_loop()
+        respostas = asyncio.Queue()
+
+        async def escrever():
+            while True:
+                item = await respostas.get()
+                if item is None:
+                    break
+                futuro, manter = item
+                status, dados = await futuro
+                escritor.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(dados)}\r\n"
+                    f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode("latin-1") + dados
+                )
+                await escritor.drain()
+
+        tarefa_escrita = asyncio.create_task(escrever())
+        try:
+            while True:
+                try:
+                    requisicao = await self.__ler_requisicao(leitor)
+                except (RespostaErro, ValueError) as erro:
+                    status = getattr(erro, "status", HTTPStatus.BAD_REQUEST)
+                    futuro = laco.create_future()
+                    futuro.set_result((status, json.dumps({"erro": str(erro)}).encode("utf-8")))
+                    await respostas.put((futuro, False))
+                    break
+                if requisicao is None:
+                    break
+                metodo, caminho, corpo, manter = requisicao
+                # Requisições em pipeline são executadas em paralelo; a escrita preserva a ordem.
+                futuro = laco.run_in_executor(self.executor, self.responder, metodo, caminho, corpo)
+                await respostas.put((futuro, manter))
+                if not manter:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            await respostas.put(None)
+            try:
+                await tarefa_escrita
+            except ConnectionError:
+                pass
+            finally:
+                escritor.close()
+                try:
+                    await escritor.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def servir(self, endereco="127.0.0.1", porta=8080):
+        """Inicia o servidor e atende conexões até ser interrompido."""
+        servidor = await asyncio.start_server(self.atender, endereco, porta)
+        async with servidor:
+            await servidor.serve_forever()
+
+    def fechar(self):
+        """Encerra as threads e as conexões do servidor."""
+        self.executor.shutdown()
+        if self.escritor:
+            self.escritor.parar()
+        self.pool.fechar()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON das tabelas do aeroporto.")
+    parser.add_argument("--endereco", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--trabalhadores", type=int, default=4, help="threads com conexão ao banco")
+    parser.add_argument("--banco", default=conexoes.CAMINHO_BANCO)
+    parser.add_argument("--agrupar", action="store_true", help="agrupa as escritas em commits únicos")
+    parser.add_argument("--cache", action="store_true", help="guarda em memória as tabelas de consulta")
+    argumentos = parser.parse_args()
+    servico = Servidor(argumentos.banco, argumentos.trabalhadores, argumentos.agrupar, argumentos.cache)
+    migracoes.sincronizar(servico.pool)
+    print(f"Servindo em http://{argumentos.endereco}:{argumentos.porta}")
+    try:
+        asyncio.run(servico.servir(argumentos.endereco, argumentos.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servico.fechar()
@@ -0,0 +1,45 @@
+import pytest
+import cache
+import conexoes
+import gerador
+from classes import Aeroportos, Empresas
+
+
+@pytest.fixture
+def pools(tmp_path):
+    """Dois pools no mesmo banco, como dois processos do servidor; só o primeiro guarda em cache."""
+    caminho = str(tmp_path / "cache.db")
+    gerador.gerar(caminho, voos=100, aeroportos=20)
+    leitor, escritor = conexoes.PoolConexoes(caminho), conexoes.PoolConexoes(caminho)
+    cache.ativar(leitor, distribuido=True)
+    yield leitor, escritor
+    leitor.fechar()
+    escritor.fechar()
+
+
+def test_escrita_de_outro_processo_invalida_so_a_linha_alterada(pools):
+    leitor, escritor = pools
+    with Aeroportos(leitor) as tabela:
+        codigos = [linha[0] for linha in tabela.listar(tamanho=2)]
+        antigas = [tabela.obter(codigo) for codigo in codigos]
+    with Aeroportos(escritor) as tabela:
+        tabela.alterar(codigos[0], NOME_AEROPORTO="Aeroporto Alterado")
+    with Aeroportos(leitor) as tabela:
+        acertos = leitor.cache.estatisticas()["acertos"]
+        assert tabela.obter(codigos[0]) != antigas[0]
+        assert leitor.cache.estatisticas()["acertos"] == acertos
+        assert tabela.obter(codigos[1]) == antigas[1]
+        assert leitor.cache.estatisticas()["acertos"] == acertos + 1
+
+
+def test_escrita_em_outra_tabela_nao_invalida(pools):
+    leitor, escritor = pools
+    with Aeroportos(leitor) as tabela:
+        codigo = tabela.listar(tamanho=1)[0][0]
+        tabela.obter(codigo)
+    with Empresas(escritor) as tabela:
+        tabela.alterar(tabela.listar(tamanho=1)[0][0], NOME_EMPRESA="Empresa Alterada")
+    with Aeroportos(leitor) as tabela:
+        acertos = leitor.cache.estatisticas()["acertos"]
+        tabela.obter(codigo)
+        assert leitor.cache.estatisticas()["acertos"] == acertos + 1
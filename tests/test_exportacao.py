@@ -0,0 +1,33 @@
+import csv
+import pytest
+import conexoes
+import exportacao
+import gerador
+from classes import Voos
+
+
+@pytest.fixture(scope="module")
+def pool(tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("exportacao") / "exportacao.db"
+    gerador.gerar(str(caminho), voos=200)
+    pool = conexoes.PoolConexoes(str(caminho))
+    yield pool
+    pool.fechar()
+
+
+@pytest.mark.parametrize("classe", exportacao.TABELAS.values())
+def test_exportar_tabela_usa_chave_e_campos(pool, classe, tmp_path):
+    caminho = tmp_path / "tabela.csv"
+    exportacao.exportar_tabela(classe, str(caminho), pool=pool)
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        assert next(csv.reader(arquivo)) == [classe.CHAVE, *classe.CAMPOS]
+
+
+def test_janela_usa_chave_e_campos(pool):
+    with Voos(pool) as tabela:
+        aeroporto = tabela.obter(1)[tabela.colunas().index("COD_AEROPORTO_DECOLAGEM")]
+        cursor = tabela.conexao.execute(*tabela.consulta_janela(
+            "partidas", aeroporto, "2024-01-01 00:00", "2024-12-31", tabela.colunas()
+        ))
+        assert [descricao[0] for descricao in cursor.description] == [Voos.CHAVE, *Voos.CAMPOS]
+        assert len(tabela.partidas(aeroporto, "2024-01-01 00:00", "2024-12-31")) == len(cursor.fetchall())
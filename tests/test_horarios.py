@@ -0,0 +1,40 @@
+import sqlite3 as sql
+import pytest
+import horarios
+import migracoes
+from classes import Voos
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("12", "12:00"), ("23", "23:00"), ("7", "07:00"), (7, "07:00"), ("930", "09:30"),
+    ("0930", "09:30"), (930, "09:30"), ("14:15", "14:15"), ("9h", "09:00"),
+])
+def test_hora(valor, esperado):
+    assert horarios.hora(valor) == esperado
+
+
+@pytest.mark.parametrize("valor", ["45", 45, "24", "2400", "-3"])
+def test_hora_ambigua_ou_invalida(valor):
+    with pytest.raises(ValueError):
+        horarios.hora(valor)
+
+
+def test_migracao_mantem_horas_ambiguas():
+    conexao = sql.connect(":memory:")
+    conexao.execute(
+        "CREATE TABLE Voos(COD_VOO INTEGER PRIMARY KEY, DATA_SAIDA TEXT, HORA_SAIDA TEXT, "
+        "DATA_CHEGADA TEXT, HORA_CHEGADA INTEGER, COD_AEROPORTO_DECOLAGEM INTEGER, COD_AEROPORTO_DESTINO INTEGER)"
+    )
+    conexao.execute("INSERT INTO Voos VALUES(1, '01/02/2024', '12', '01/02/2024', 45, 1, 2)")
+    migracoes._horarios_voos(conexao.cursor())
+    assert conexao.execute("SELECT DATA_SAIDA, HORA_SAIDA, HORA_CHEGADA FROM Voos").fetchone() == (
+        "2024-02-01", "12:00", 45
+    )
+
+
+def test_fim_da_janela_so_com_data_inclui_o_dia():
+    assert horarios.instante("2024-01-10") == "2024-01-10T00:00"
+    assert horarios.instante("2024-01-10", fim_do_dia=True) == "2024-01-10T23:59"
+    assert horarios.instante("2024-01-10 08:00", fim_do_dia=True) == "2024-01-10T08:00"
+    _, parametros = Voos.consulta_janela("partidas", 1, "2024-01-01", "2024-01-10")
+    assert parametros[-2:] == ("2024-01-10", "23:59")
@@ -0,0 +1,110 @@
+import builtins
+import contextlib
+import os
+import sqlite3 as sql
+import sys
+import tracemalloc
+import pytest
+import conexoes
+import esquema
+import gerador
+import main
+
+# Passos iniciais em que caches e conexões se formam, antes de medir o crescimento.
+AQUECIMENTO = 1000
+# Crescimento de memória tolerado depois do aquecimento, em bytes.
+LIMITE_MEMORIA = 1 << 20
+AMOSTRAS = 10
+
+
+def roteiro():
+    """Gera sem fim as entradas de uma sessão que passa por todos os menus, com escolhas inválidas e cancelamentos."""
+    while True:
+        for numero, estado in enumerate(("aeronaves", "aeroportos", "empresas", "voos"), start=1):
+            yield str(numero)
+            # Deletar lista uma página de IDs, e ENTER cancela a ação.
+            yield "3"
+            yield ""
+            # Escolha inválida, seguida do ENTER de continuar.
+            yield "x"
+            yield ""
+            yield str(len(main.MENUS[estado][1]))
+        yield "0"
+        yield ""
+
+
+def _profundidade():
+    quadro, total = sys._getframe(1), 0
+    while quadro is not None:
+        total += 1
+        quadro = quadro.f_back
+    return total
+
+
+@pytest.fixture(scope="module")
+def banco(tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("navegacao") / "navegacao.db"
+    gerador.gerar(str(caminho), voos=2000)
+    return str(caminho)
+
+
+def navegar(banco, monkeypatch, passos):
+    """Executa passos navegações roteirizadas do menu e retorna as amostras de conexões, pilha e memória."""
+    monkeypatch.setattr(conexoes, "pool", conexoes.PoolConexoes(banco))
+    entradas = roteiro()
+    profundidades = []
+
+    def responder(mensagem=""):
+        profundidades.append(_profundidade())
+        return next(entradas)
+
+    monkeypatch.setattr(builtins, "input", responder)
+    estado, tabelas, amostras = "principal", {}, []
+    tracemalloc.start()
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+            for numero in range(1, passos + 1):
+                estado = main.passo(estado, tabelas)
+                if numero >= AQUECIMENTO and numero % max(1, passos // AMOSTRAS) == 0:
+                    amostras.append({
+                        "passo": numero,
+                        "conexoes": conexoes.pool.estatisticas()["abertas"],
+                        "memoria": tracemalloc.get_traced_memory()[0],
+                        "pilha": max(profundidades),
+                    })
+                    profundidades.clear()
+    finally:
+        tracemalloc.stop()
+        for tabela in tabelas.values():
+            tabela.fechar()
+        conexoes.pool.fechar()
+    return amostras
+
+
+def conferir(amostras):
+    base = amostras[0]
+    for amostra in amostras:
+        assert amostra["conexoes"] == base["conexoes"] == 1
+        assert amostra["pilha"] <= base["pilha"]
+        assert amostra["memoria"] - base["memoria"] <= LIMITE_MEMORIA
+
+
+def test_navegacao(banco, monkeypatch):
+    conferir(navegar(banco, monkeypatch, int(os.environ.get("NAVEGACAO_PASSOS", 5000))))
+
+
+@pytest.mark.skipif(not os.environ.get("NAVEGACAO_LONGA"), reason="defina NAVEGACAO_LONGA=1 para 100 mil passos")
+def test_navegacao_longa(banco, monkeypatch):
+    conferir(navegar(banco, monkeypatch, 100000))
+
+
+@pytest.mark.parametrize("erro", [sql.OperationalError("database is locked"), esquema.EsquemaErro("coluna ausente")])
+def test_erro_do_banco_volta_ao_menu(erro, monkeypatch, capsys):
+    class Tabela:
+        def registrar(self):
+            raise erro
+
+    entradas = iter(["1", ""])
+    monkeypatch.setattr(builtins, "input", lambda mensagem="": next(entradas))
+    assert main.passo("aeronaves", {"aeronaves": Tabela()}) == "aeronaves"
+    assert str(erro) in capsys.readouterr().out
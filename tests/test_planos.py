@@ -0,0 +1,25 @@
+import pytest
+import conexoes
+import gerador
+import migracoes
+
+
+@pytest.fixture(scope="module")
+def pool(tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("planos") / "planos.db"
+    gerador.gerar(str(caminho), voos=2000)
+    pool = conexoes.PoolConexoes(str(caminho))
+    yield pool
+    pool.fechar()
+
+
+@pytest.mark.parametrize("nome", migracoes.CONSULTAS_VERIFICADAS)
+def test_consulta_usa_indice(pool, nome):
+    usa_indice, plano = migracoes.verificar_planos(pool, {nome: migracoes.CONSULTAS_VERIFICADAS[nome]})[nome]
+    assert usa_indice, plano
+
+
+@pytest.mark.parametrize("nome", ["relatorio_aeroporto", "relatorio_periodo"])
+def test_relatorio_nao_le_a_tabela_do_resumo(pool, nome):
+    _, plano = migracoes.verificar_planos(pool, {nome: migracoes.CONSULTAS_VERIFICADAS[nome]})[nome]
+    assert any("COVERING INDEX" in passo for passo in plano), plano